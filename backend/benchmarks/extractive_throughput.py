@@ -0,0 +1,58 @@
+"""Throughput of the extractive (TextRank) summarizer, with a floor.
+
+Summarizes synthetic items of several lengths (feed teasers to long articles)
+and prints items per second for each. Exits non-zero when any size falls below
+``--min-rate``. The summarizer runs on the parse pool for every preview and
+no-key run, so a slowdown here delays the whole summarize step.
+
+    cd backend && uv run python benchmarks/extractive_throughput.py [--items 500] [--min-rate 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from signal_app.pipeline.extractive import extractive_summaries
+
+VOCABULARY = """
+model release open source training inference benchmark latency agent tool framework browser compiler database
+kernel cluster security vulnerability patch research paper dataset language vision robot chip startup funding
+pricing api developer community performance memory cache network protocol standard
+"""
+WORDS = VOCABULARY.split()
+SIZES = {"teaser": 2, "post": 12, "article": 60, "long": 300}  # Sentences per item
+
+
+def synthetic_text(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 25))).capitalize() + "." for _ in range(sentences)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--min-rate", type=float, default=200.0, help="items per second, per size")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    failed = False
+    print(f"{'size':>8}  {'chars':>7}  {'items/s':>9}  {'ms/item':>8}")
+    for name, sentences in SIZES.items():
+        texts = [synthetic_text(rng, sentences) for _ in range(args.items)]
+        started = time.perf_counter()
+        extractive_summaries(texts)
+        elapsed = time.perf_counter() - started
+        rate = args.items / elapsed
+        chars = sum(map(len, texts)) // len(texts)
+        print(f"{name:>8}  {chars:7d}  {rate:9.0f}  {1000 / rate:8.2f}")
+        failed |= rate < args.min_rate
+
+    if failed:
+        print(f"\nFAIL: below {args.min_rate:.0f} items/s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
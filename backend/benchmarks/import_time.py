@@ -0,0 +1,66 @@
+"""Cold-start import time of the API, with a budget.
+
+Imports ``signal_app.main`` (or ``--module``) in fresh interpreters under
+``python -X importtime``, prints the best total and the slowest modules by self
+time, and exits non-zero when the total exceeds ``--budget-ms`` or a module
+listed in ``HEAVY_MODULES`` is imported. Those are only needed once the
+pipeline runs, so loading them at startup means an eager import crept back in.
+
+    cd backend && uv run python benchmarks/import_time.py [--budget-ms 1000] [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("openai", "feedparser", "numpy", "signal_app.fetchers.rss", "signal_app.pipeline.orchestrator")
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """``{module: (self_us, cumulative_us)}`` for one cold import of ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="signal_app.main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Best of N: the minimum is the least noisy estimate of the real cost
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    best = min(profiles, key=lambda p: p[args.module][1])
+    total_ms = best[args.module][1] / 1000
+
+    print(f"{args.module}: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)\n")
+    print(f"{'self ms':>8}  {'cum ms':>8}  module")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda kv: -kv[1][0])[: args.top]:
+        print(f"{self_us / 1000:8.1f}  {cumulative_us / 1000:8.1f}  {name}")
+
+    failed = False
+    heavy = [name for name in HEAVY_MODULES if name in best]
+    if heavy:
+        print(f"\nFAIL: imported at startup: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\nFAIL: {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""API latency while feeds are parsed: inline on the event loop vs. the parse pool.
+
+Serves a trivial FastAPI endpoint in-process (httpx ``ASGITransport``, so
+requests share the event loop with the pipeline) and probes it every few
+milliseconds while a batch of large feeds is parsed. Prints p50/p99/max probe
+latency for each mode.
+
+    cd backend && uv run python benchmarks/parse_latency.py [--feeds 8] [--entries 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+from fastapi import FastAPI
+
+from signal_app.config import get_settings
+from signal_app.fetchers import parsing
+from signal_app.fetchers.rss import _parse_feed
+
+PROBE_INTERVAL = 0.005
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping() -> dict[str, bool]:
+    return {"ok": True}
+
+
+def make_feed(entries: int) -> str:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://example.com/{i}</link>"
+        f"<guid>https://example.com/{i}</guid>"
+        f"<pubDate>{format_datetime(start + timedelta(minutes=i))}</pubDate>"
+        f"<description>{'Lorem ipsum dolor sit amet. ' * 60}</description></item>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>{items}</channel></rss>'
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    """Request /ping every PROBE_INTERVAL; latency counts from when the request was due,
+    so time spent waiting for a blocked event loop is included."""
+    due = time.perf_counter()
+    while True:
+        await client.get("/ping")
+        latencies.append((time.perf_counter() - due) * 1000)
+        if stop.is_set():
+            break
+        due = max(due + PROBE_INTERVAL, time.perf_counter())
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def run(mode: str, feed: str, feeds: int) -> None:
+    latencies: list[float] = []
+    stop = asyncio.Event()
+
+    async def parse_one(index: int) -> None:
+        await asyncio.sleep(0.05 * index)  # downloads finish at different times
+        if mode == "inline":
+            _parse_feed(feed)
+        else:
+            await parsing.run_parser(_parse_feed, feed)
+
+    if mode != "inline":
+        settings = get_settings()
+        settings.parse_executor = mode
+        parsing.shutdown_parse_executor()
+        await parsing.run_parser(len, "warm-up")  # start workers before measuring
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        prober = asyncio.create_task(probe(client, stop, latencies))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        await asyncio.gather(*(parse_one(i) for i in range(feeds)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+
+    parsing.shutdown_parse_executor()
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"{mode:>8}: parse {elapsed:6.2f}s | probes {len(latencies):5d} | "
+        f"p50 {quantiles[49]:7.1f}ms  p99 {quantiles[98]:7.1f}ms  max {max(latencies):7.1f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=8, help="feeds parsed concurrently")
+    parser.add_argument("--entries", type=int, default=2000, help="entries per feed")
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"])
+    args = parser.parse_args()
+
+    feed = make_feed(args.entries)
+    print(f"{args.feeds} feeds x {args.entries} entries ({len(feed) / 1e6:.1f} MB each)")
+    for mode in args.modes:
+        await run(mode, feed, args.feeds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
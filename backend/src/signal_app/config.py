@@ -8,9 +8,30 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = ""
     openai_model: str = "gpt-4.1-nano"
+    # Summary engine: "auto" (LLM with a key, extractive without), "llm" or "extractive";
+    # with the LLM, new items first get an extractive preview summary
+    summary_engine: str = "auto"
+    summary_preview: bool = True
+    # Summarizer batches: prompt and completion token budgets per request, content tokens per
+    # item, and the request latency (seconds) above which batches shrink
+    summarize_prompt_tokens: int = 12000
+    summarize_completion_tokens: int = 4000
+    summarize_item_tokens: int = 300
+    summarize_target_latency: float = 30.0
+    # Backlogs of at least this many items go through the Batch API (0 = only on request),
+    # and how often a requested batch job is polled (seconds)
+    summarize_offline_threshold: int = 0
+    summary_batch_poll_interval: float = 300.0
+    # Local category classifier, trained on past categorizations: items it categorizes with
+    # at least this confidence are not categorized by the LLM
+    classifier: bool = True
+    classifier_threshold: float = 0.7
+    # LLM requests in flight at once when re-categorizing all items after a category change
+    recategorize_concurrency: int = 4
 
     # YouTube Data API v3
     google_api_key: str = ""
+    youtube_daily_quota: int = 10000
 
     # GitHub (optional, for higher rate limits)
     github_token: str = ""
@@ -18,6 +39,21 @@ class Settings(BaseSettings):
     # Pipeline schedule (cron expression: 6 AM and 6 PM daily)
     pipeline_cron: str = "0 6,18 * * *"
 
+    # Feed parsing pool: "thread" or "process"
+    parse_executor: str = "thread"
+    parse_workers: int = 2
+    # Default download cap per feed (sources can override with "max_bytes")
+    feed_max_bytes: int = 5_000_000
+
+    # OPML import: feeds probed at once, and the timeout per probe (seconds)
+    opml_probe_concurrency: int = 20
+    opml_probe_timeout: float = 15.0
+
+    # Article extraction before summarizing items with little feed text
+    article_extraction: bool = False
+    extract_concurrency: int = 8
+    article_max_bytes: int = 2_000_000
+
     # CORS
     allowed_origins: str = "http://localhost:3000"
 
@@ -1,5 +1,7 @@
 import asyncio
+import json
 import logging
+from typing import Any
 
 import asyncpg
 
@@ -34,3 +36,25 @@ def get_pool() -> asyncpg.Pool:
     if _pool is None:
         raise RuntimeError("Database pool not initialized. Call init_pool() first.")
     return _pool
+
+
+async def get_app_setting(key: str, default: Any = None) -> Any:
+    """Read a JSON value from the app_settings key-value table."""
+    async with get_pool().acquire() as conn:
+        row = await conn.fetchrow("SELECT value FROM app_settings WHERE key = $1", key)
+    if not row:
+        return default
+    value = row["value"]
+    return json.loads(value) if isinstance(value, str) else value
+
+
+async def set_app_setting(key: str, value: Any) -> None:
+    """Upsert a JSON value into the app_settings key-value table."""
+    async with get_pool().acquire() as conn:
+        await conn.execute(
+            """INSERT INTO app_settings (key, value, updated_at)
+               VALUES ($1, $2::jsonb, now())
+               ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = now()""",
+            key,
+            json.dumps(value),
+        )
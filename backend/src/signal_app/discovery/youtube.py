@@ -1,7 +1,14 @@
 import json
 import logging
 
+import asyncpg
+import httpx
+
+from signal_app.config import get_settings
 from signal_app.db import get_pool
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.fetchers.youtube import YOUTUBE_API
+from signal_app.fetchers.youtube_quota import QuotaExceededError, get_ledger, persist_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -79,5 +86,58 @@ async def process_youtube_discoveries() -> int:
             )
             updated += 1
 
+        try:
+            await _enrich_suggestions(conn)
+        except httpx.HTTPError as e:
+            logger.warning("YouTube channel enrichment failed: %s", e)
+
     logger.info("YouTube discovery: processed %d channel suggestions", updated)
     return updated
+
+
+async def _enrich_suggestions(conn: asyncpg.Connection) -> int:
+    """Fill subscriber/video counts for pending suggestions from the channels endpoint.
+
+    Runs with the lowest quota priority (1 unit per 50 channels) and stops when
+    the daily budget is spent. Returns the number of suggestions enriched.
+    """
+    api_key = get_settings().google_api_key
+    if not api_key:
+        return 0
+
+    rows = await conn.fetch(
+        """SELECT channel_id FROM youtube_channel_suggestions
+           WHERE status = 'pending' AND subscriber_count IS NULL
+           ORDER BY appearance_count DESC
+           LIMIT 500"""
+    )
+    channel_ids = [r["channel_id"] for r in rows]
+    ledger = get_ledger()
+    enriched = 0
+
+    async with http_client(timeout=30) as client:
+        for i in range(0, len(channel_ids), 50):
+            try:
+                ledger.charge("channels.list")
+            except QuotaExceededError as e:
+                logger.info("Deferring channel enrichment: %s", e)
+                break
+            resp = await client.get(
+                f"{YOUTUBE_API}/channels",
+                params={"part": "statistics", "id": ",".join(channel_ids[i : i + 50]), "key": api_key},
+            )
+            resp.raise_for_status()
+            for channel in resp.json().get("items", []):
+                stats = channel.get("statistics", {})
+                await conn.execute(
+                    """UPDATE youtube_channel_suggestions
+                       SET subscriber_count = $1, video_count = $2, updated_at = now()
+                       WHERE channel_id = $3""",
+                    int(stats.get("subscriberCount", 0)),
+                    int(stats.get("videoCount", 0)),
+                    channel["id"],
+                )
+                enriched += 1
+
+    await persist_ledger()
+    return enriched
@@ -1,33 +1,86 @@
-from signal_app.fetchers.arxiv import ArxivFetcher
-from signal_app.fetchers.base import BaseFetcher, RawItem
-from signal_app.fetchers.bluesky import BlueskyFetcher
-from signal_app.fetchers.github import GitHubReleasesFetcher
-from signal_app.fetchers.hackernews import HackerNewsFetcher
-from signal_app.fetchers.reddit import RedditFetcher
-from signal_app.fetchers.rss import RSSFetcher
-from signal_app.fetchers.twitter import TwitterFetcher
-from signal_app.fetchers.youtube import YouTubeChannelFetcher, YouTubeSearchFetcher
-
-FETCHER_REGISTRY: dict[str, type[BaseFetcher]] = {
-    "rss": RSSFetcher,
-    "atom": RSSFetcher,
-    "hackernews": HackerNewsFetcher,
-    "reddit": RedditFetcher,
-    "arxiv": ArxivFetcher,
-    "github_releases": GitHubReleasesFetcher,
-    "youtube_channel": YouTubeChannelFetcher,
-    "youtube_search": YouTubeSearchFetcher,
-    "bluesky": BlueskyFetcher,
-    "twitter": TwitterFetcher,
+"""Fetcher registry.
+
+Fetcher modules pull in feedparser, dateutil and HTTP/LLM clients, so nothing
+is imported here eagerly: ``FETCHER_REGISTRY`` maps source types to dotted
+paths and imports a fetcher module the first time its class is looked up.
+Importing a submodule such as ``signal_app.fetchers.youtube_quota`` therefore
+stays cheap. The fetcher classes are still importable from this package.
+"""
+
+import importlib
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from signal_app.fetchers.base import BaseFetcher
+
+FETCHER_PATHS: dict[str, str] = {
+    "rss": "signal_app.fetchers.rss:RSSFetcher",
+    "atom": "signal_app.fetchers.rss:RSSFetcher",
+    "hackernews": "signal_app.fetchers.hackernews:HackerNewsFetcher",
+    "reddit": "signal_app.fetchers.reddit:RedditFetcher",
+    "arxiv": "signal_app.fetchers.arxiv:ArxivFetcher",
+    "github_releases": "signal_app.fetchers.github:GitHubReleasesFetcher",
+    "youtube_channel": "signal_app.fetchers.youtube:YouTubeChannelFetcher",
+    "youtube_search": "signal_app.fetchers.youtube:YouTubeSearchFetcher",
+    "bluesky": "signal_app.fetchers.bluesky:BlueskyFetcher",
+    "twitter": "signal_app.fetchers.twitter:TwitterFetcher",
 }
 
+# Public names re-exported from submodules, resolved on first access
+_EXPORTS: dict[str, str] = {
+    "BaseFetcher": "signal_app.fetchers.base",
+    "RawItem": "signal_app.fetchers.base",
+    **{path.split(":")[1]: path.split(":")[0] for path in FETCHER_PATHS.values()},
+}
+
+
+def _resolve(path: str) -> Any:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class LazyRegistry(Mapping[str, "type[BaseFetcher]"]):
+    """Read-only mapping of source type to fetcher class, importing each class on first lookup."""
 
-def get_fetcher(source_type: str, source_id: str, config: dict) -> BaseFetcher | None:  # type: ignore[type-arg]
+    def __init__(self, paths: dict[str, str]) -> None:
+        self._paths = paths
+        self._classes: dict[str, type[BaseFetcher]] = {}
+
+    def __getitem__(self, source_type: str) -> "type[BaseFetcher]":
+        cls = self._classes.get(source_type)
+        if cls is None:
+            cls = self._classes[source_type] = _resolve(self._paths[source_type])
+        return cls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+FETCHER_REGISTRY = LazyRegistry(FETCHER_PATHS)
+
+
+def get_fetcher(
+    source_type: str,
+    source_id: str,
+    config: dict,  # type: ignore[type-arg]
+    state: dict | None = None,  # type: ignore[type-arg]
+) -> "BaseFetcher | None":
     """Instantiate the right fetcher for a source type."""
     cls = FETCHER_REGISTRY.get(source_type)
     if cls is None:
         return None
-    return cls(source_id=source_id, config=config)
+    return cls(source_id=source_id, config=config, state=state)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
 
 
 __all__ = [
@@ -1,11 +1,13 @@
 import logging
-from datetime import UTC
-from urllib.parse import urlencode
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
 
 import feedparser
-import httpx
 
-from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.base import BaseFetcher, RawItem, parse_timestamp
+from signal_app.fetchers.parsing import run_parser
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.fetchers.streaming import download_feed
 
 logger = logging.getLogger(__name__)
 
@@ -13,71 +15,147 @@ ARXIV_API = "https://export.arxiv.org/api/query"
 
 
 class ArxivFetcher(BaseFetcher):
+    """Fetches the newest papers for a set of arXiv categories.
+
+    With ``"harvest": true`` the fetcher remembers the newest ``submittedDate``
+    seen and, on later runs, pages through a ``submittedDate`` window from that
+    watermark to now, so busy days are covered completely without re-reading
+    papers from earlier runs. The watermark only moves once paging has reached
+    it. Until then ``harvest_pending`` holds the window and the offset of the
+    next page, and the following run continues from there. Running out of
+    ``max_pages``, or the consumer stopping early, never skips papers.
+    """
+
+    uses_watermark = True
+
+    def watermark_enabled(self) -> bool:
+        # Harvest keeps its own cursor; the generic watermark would hide every page after the first
+        return super().watermark_enabled() and not self.config.get("harvest")
+
     async def fetch(self) -> list[RawItem]:
+        return [item async for page in self.aiter_items() for item in page]
+
+    async def aiter_items(self) -> AsyncGenerator[list[RawItem], None]:
         categories = self.config.get("categories", ["cs.AI"])
         max_results = self.config.get("max_results", 20)
+        harvest = bool(self.config.get("harvest"))
+        watermark = parse_timestamp(self.state.get("last_submitted")) if harvest else None
 
         cat_query = " OR ".join(f"cat:{cat}" for cat in categories)
-        params = {
-            "search_query": cat_query,
-            "start": 0,
-            "max_results": max_results,
-            "sortBy": "submittedDate",
-            "sortOrder": "descending",
-        }
-
-        url = f"{ARXIV_API}?{urlencode(params)}"
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-        feed = feedparser.parse(response.text)
-        items: list[RawItem] = []
-
-        for entry in feed.entries[:max_results]:
-            published = None
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                from datetime import datetime
-
-                published = datetime(*entry.published_parsed[:6], tzinfo=UTC)
-
-            # Extract authors
-            authors = []
-            if hasattr(entry, "authors"):
-                authors = [a.get("name", "") for a in entry.authors]
-            author_str = ", ".join(authors[:5])
-            if len(authors) > 5:
-                author_str += f" et al. ({len(authors)} authors)"
-
-            # Extract arxiv ID from the entry id URL
-            arxiv_id = entry.get("id", "").split("/abs/")[-1]
-
-            # Get PDF link
-            pdf_url = ""
-            for link in entry.get("links", []):
-                if link.get("type") == "application/pdf":
-                    pdf_url = link.get("href", "")
-                    break
-
-            summary = entry.get("summary", "")
-            # Clean up arxiv summaries (they have lots of whitespace)
-            summary = " ".join(summary.split())
-
-            items.append(
-                RawItem(
-                    external_id=arxiv_id,
-                    title=entry.get("title", "Untitled").replace("\n", " "),
-                    url=entry.get("id", ""),
-                    author=author_str or None,
-                    content_raw=summary[:2000],
-                    published_at=published,
-                    extra={
-                        "arxiv_id": arxiv_id,
-                        "pdf_url": pdf_url,
-                        "categories": [tag.get("term", "") for tag in entry.get("tags", [])],
-                    },
-                )
+        offset = 0
+        newest: datetime | None = None
+        if watermark is not None:
+            page_size = self.config.get("page_size", 100)
+            max_pages = self.config.get("max_pages", 10)
+            pending = self.state.get("harvest_pending") or {}
+            window_end = parse_timestamp(pending.get("window_end")) or datetime.now(tz=UTC)
+            if pending:
+                offset = int(pending.get("offset", 0))
+                newest = parse_timestamp(pending.get("newest"))
+            cat_query = (
+                f"({cat_query}) AND submittedDate:"
+                f"[{watermark.strftime('%Y%m%d%H%M')} TO {window_end.strftime('%Y%m%d%H%M')}]"
             )
+        else:
+            # Plain mode, or the first harvest run: just the newest page
+            page_size = max_results
+            max_pages = 1
+
+        async with http_client(timeout=30) as client:
+            for _page in range(max_pages):
+                params = {
+                    "search_query": cat_query,
+                    "start": offset,
+                    "max_results": page_size,
+                    "sortBy": "submittedDate",
+                    "sortOrder": "descending",
+                }
+                content, headers = await download_feed(
+                    client, ARXIV_API, params=params, max_entries=page_size, max_bytes=self.config.get("max_bytes")
+                )
 
-        return items
+                page_items = await run_parser(_parse_entries, content, headers)
+                items: list[RawItem] = []
+                reached_watermark = False
+                for item in page_items:
+                    # The window is minute-granular, so drop what the previous run already saw
+                    if watermark is not None and item.published_at is not None and item.published_at <= watermark:
+                        reached_watermark = True
+                        break
+                    items.append(item)
+                offset += len(page_items)
+                newest = max((t for t in (newest, *(i.published_at for i in items)) if t), default=None)
+                done = reached_watermark or len(page_items) < page_size
+
+                # Update the harvest cursor before handing the page over; iteration may stop here
+                if harvest:
+                    if watermark is None or done:
+                        self._finish_harvest(newest)
+                    else:
+                        self.state["harvest_pending"] = {
+                            "window_end": window_end.isoformat(),
+                            "offset": offset,
+                            "newest": newest.isoformat() if newest else None,
+                        }
+                if items:
+                    yield items
+                if done:
+                    break
+            else:
+                if max_pages > 1:
+                    logger.info(
+                        "arXiv harvest for %s paused after %d pages, continuing next run", categories, max_pages
+                    )
+
+    def _finish_harvest(self, newest: datetime | None) -> None:
+        """The window is covered: move the watermark to the newest paper in it."""
+        self.state.pop("harvest_pending", None)
+        current = parse_timestamp(self.state.get("last_submitted"))
+        if newest is not None and (current is None or newest > current):
+            self.state["last_submitted"] = newest.isoformat()
+
+
+def _parse_entries(content: bytes | str, headers: dict[str, str] | None = None) -> list[RawItem]:
+    return [_entry_to_item(entry) for entry in feedparser.parse(content, response_headers=headers).entries]
+
+
+def _entry_to_item(entry: feedparser.FeedParserDict) -> RawItem:
+    published = None
+    if hasattr(entry, "published_parsed") and entry.published_parsed:
+        published = datetime(*entry.published_parsed[:6], tzinfo=UTC)
+
+    # Extract authors
+    authors = []
+    if hasattr(entry, "authors"):
+        authors = [a.get("name", "") for a in entry.authors]
+    author_str = ", ".join(authors[:5])
+    if len(authors) > 5:
+        author_str += f" et al. ({len(authors)} authors)"
+
+    # Extract arxiv ID from the entry id URL
+    arxiv_id = entry.get("id", "").split("/abs/")[-1]
+
+    # Get PDF link
+    pdf_url = ""
+    for link in entry.get("links", []):
+        if link.get("type") == "application/pdf":
+            pdf_url = link.get("href", "")
+            break
+
+    summary = entry.get("summary", "")
+    # Clean up arxiv summaries (they have lots of whitespace)
+    summary = " ".join(summary.split())
+
+    return RawItem(
+        external_id=arxiv_id,
+        title=entry.get("title", "Untitled").replace("\n", " "),
+        url=entry.get("id", ""),
+        author=author_str or None,
+        content_raw=summary[:2000],
+        published_at=published,
+        extra={
+            "arxiv_id": arxiv_id,
+            "pdf_url": pdf_url,
+            "categories": [tag.get("term", "") for tag in entry.get("tags", [])],
+        },
+    )
@@ -1,10 +1,19 @@
+import asyncio
+import contextlib
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from datetime import datetime
+from collections.abc import AsyncGenerator, Hashable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import ClassVar, Self
 
+from dateutil.parser import parse as parse_date
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RawItem:
+    """One fetched entry. Immutable and slotted, so large backfills stay compact;
+    ``extra`` is only allocated for sources that have extra metadata."""
+
     external_id: str | None
     title: str
     url: str
@@ -12,13 +21,85 @@ class RawItem:
     content_raw: str | None = None
     thumbnail_url: str | None = None
     published_at: datetime | None = None
-    extra: dict | None = field(default_factory=dict)  # type: ignore[type-arg]
+    extra: dict | None = None  # type: ignore[type-arg]
 
 
 class BaseFetcher(ABC):
-    def __init__(self, source_id: str, config: dict) -> None:  # type: ignore[type-arg]
+    # Drop entries at or below the source's high-water mark before dedup. Only for
+    # sources whose entries appear in publication order (not e.g. HN top stories).
+    uses_watermark: ClassVar[bool] = False
+
+    def __init__(self, source_id: str, config: dict, state: dict | None = None) -> None:  # type: ignore[type-arg]
         self.source_id = source_id
         self.config = config
+        # Per-source fetch state (cursors, cached lookups); persisted after a successful fetch
+        self.state: dict = dict(state or {})  # type: ignore[type-arg]
 
     @abstractmethod
     async def fetch(self) -> list[RawItem]: ...
+
+    async def aiter_items(self) -> AsyncGenerator[list[RawItem], None]:
+        """Yield items page by page, newest first.
+
+        The orchestrator dedups and stores each page as it arrives and stops
+        iterating once a page contains nothing new, so paging fetchers should
+        override this (and implement ``fetch`` by collecting it). Fetch state
+        must be up to date whenever a page is yielded, since iteration may end
+        there. The default yields ``fetch()`` as a single page.
+        """
+        yield await self.fetch()
+
+    def batch_key(self) -> Hashable | None:
+        """Sources of the same class returning equal keys are fetched together via ``fetch_batch``."""
+        return None
+
+    @classmethod
+    async def fetch_batch(cls, fetchers: Sequence[Self]) -> list[list[RawItem] | BaseException]:
+        """Fetch several sources in one go. Results (or per-source errors) line up with ``fetchers``."""
+        return await asyncio.gather(*(f.fetch() for f in fetchers), return_exceptions=True)
+
+    def watermark_enabled(self) -> bool:
+        return self.uses_watermark and self.config.get("watermark", True) is not False
+
+    def is_seen(self, item: RawItem) -> bool:
+        """Whether ``item`` is at or below the watermark stored in ``state["watermark"]``."""
+        watermark = self.state.get("watermark") or {}
+        seen_at = parse_timestamp(watermark.get("published_at"))
+        if seen_at is None or item.published_at is None:
+            return False
+        published = _as_utc(item.published_at)
+        return published < seen_at or (published == seen_at and item.external_id in watermark.get("ids", []))
+
+    def filter_seen(self, items: list[RawItem]) -> list[RawItem]:
+        """Drop items already covered by the watermark and advance it past the rest."""
+        if not self.watermark_enabled():
+            return items
+        fresh = [item for item in items if not self.is_seen(item)]
+
+        # Ignore bogus future dates, which would otherwise hide every real entry
+        horizon = datetime.now(tz=UTC) + timedelta(days=1)
+        dated = [(_as_utc(i.published_at), i.external_id) for i in fresh if i.published_at]
+        dated = [(published, external_id) for published, external_id in dated if published <= horizon]
+        if not dated:
+            return fresh
+
+        newest = max(published for published, _ in dated)
+        ids = {external_id for published, external_id in dated if published == newest and external_id}
+        watermark = self.state.get("watermark") or {}
+        if parse_timestamp(watermark.get("published_at")) == newest:
+            ids.update(watermark.get("ids", []))
+        self.state["watermark"] = {"published_at": newest.isoformat(), "ids": sorted(ids)}
+        return fresh
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def parse_timestamp(value: object) -> datetime | None:
+    """Parse a stored ISO timestamp (e.g. a cursor in fetch state) as an aware datetime."""
+    if not isinstance(value, str) or not value:
+        return None
+    with contextlib.suppress(ValueError, TypeError):
+        return _as_utc(parse_date(value))
+    return None
@@ -1,97 +1,188 @@
 import contextlib
 import logging
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
 
 import httpx
 from dateutil.parser import parse as parse_date
 
-from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.base import BaseFetcher, RawItem, parse_timestamp
+from signal_app.fetchers.ratelimit import http_client
 
 logger = logging.getLogger(__name__)
 
 BSKY_PUBLIC_API = "https://public.api.bsky.app/xrpc"
 
+# Handles rarely move to a new DID, so resolved DIDs are reused for a week
+DID_CACHE_TTL = timedelta(days=7)
+
 
 class BlueskyFetcher(BaseFetcher):
-    """Fetches recent posts from a Bluesky account using the public API."""
+    """Fetches recent posts from a Bluesky account using the public API.
+
+    The resolved DID and the newest feed position seen are kept in the source's
+    fetch state, so a typical run is a single ``getAuthorFeed`` call that stops
+    as soon as it reaches posts from the previous run. The watermark only moves
+    once paging has reached it. Until then ``pending`` holds the cursor of the
+    next page and the newest position seen, and the following run continues
+    from there, so running out of ``max_pages`` or stopping early loses nothing.
+    """
 
     async def fetch(self) -> list[RawItem]:
+        return [item async for page in self.aiter_items() for item in page]
+
+    async def aiter_items(self) -> AsyncGenerator[list[RawItem], None]:
         handle = self.config.get("handle", "")
         if not handle:
-            return []
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            # Resolve handle to DID
-            resp = await client.get(
-                f"{BSKY_PUBLIC_API}/com.atproto.identity.resolveHandle",
-                params={"handle": handle},
-            )
-            resp.raise_for_status()
-            did = resp.json().get("did", "")
-
+            return
+
+        limit = min(self.config.get("limit", 30), 100)
+        max_pages = self.config.get("max_pages", 3)
+        last_indexed_at = parse_timestamp(self.state.get("last_indexed_at"))
+        last_uri = self.state.get("last_uri")
+
+        newest: tuple[datetime, str] | None = None
+        params: dict[str, str | int] = {"limit": limit, "filter": "posts_no_replies"}
+        pending = (self.state.get("pending") or {}) if last_indexed_at is not None else {}
+        pending_at = parse_timestamp(pending.get("indexed_at"))
+        if pending.get("cursor"):
+            params["cursor"] = pending["cursor"]
+            if pending_at is not None and pending.get("uri"):
+                newest = (pending_at, pending["uri"])
+
+        async with http_client(timeout=30) as client:
+            did = await self._resolve_did(client, handle)
             if not did:
                 logger.warning("Could not resolve Bluesky handle: %s", handle)
-                return []
-
-            # Get author feed
-            resp = await client.get(
-                f"{BSKY_PUBLIC_API}/app.bsky.feed.getAuthorFeed",
-                params={"actor": did, "limit": 30, "filter": "posts_no_replies"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-        items: list[RawItem] = []
-
-        for feed_item in data.get("feed", []):
-            post = feed_item.get("post", {})
-            record = post.get("record", {})
-            author_info = post.get("author", {})
-
-            text = record.get("text", "")
-            if not text:
-                continue
-
-            published = None
-            if record.get("createdAt"):
-                with contextlib.suppress(ValueError, TypeError):
-                    published = parse_date(record["createdAt"])
-
-            # Build the post URL
-            uri = post.get("uri", "")
-            rkey = uri.split("/")[-1] if uri else ""
-            post_url = f"https://bsky.app/profile/{handle}/post/{rkey}" if rkey else ""
-
-            # Extract any embedded links
-            embed = post.get("embed", {})
-            external_url = ""
-            if embed.get("$type") == "app.bsky.embed.external#view":
-                external = embed.get("external", {})
-                external_url = external.get("uri", "")
-
-            # Extract images
-            thumbnail = None
-            if embed.get("$type") == "app.bsky.embed.images#view":
-                images = embed.get("images", [])
-                if images:
-                    thumbnail = images[0].get("thumb")
-
-            items.append(
-                RawItem(
-                    external_id=uri,
-                    title=text[:120] + ("..." if len(text) > 120 else ""),
-                    url=external_url or post_url,
-                    author=author_info.get("displayName") or author_info.get("handle"),
-                    content_raw=text[:2000],
-                    thumbnail_url=thumbnail,
-                    published_at=published,
-                    extra={
-                        "bsky_url": post_url,
-                        "like_count": post.get("likeCount", 0),
-                        "repost_count": post.get("repostCount", 0),
-                        "reply_count": post.get("replyCount", 0),
-                        "handle": handle,
-                    },
-                )
-            )
-
-        return items
+                return
+
+            params["actor"] = did
+            for _ in range(max_pages):
+                resp = await client.get(f"{BSKY_PUBLIC_API}/app.bsky.feed.getAuthorFeed", params=params)
+                resp.raise_for_status()
+                data = resp.json()
+
+                items: list[RawItem] = []
+                reached_watermark = False
+                for feed_item in data.get("feed", []):
+                    position = _feed_position(feed_item)
+                    if position is not None:
+                        if newest is None or position > newest:
+                            newest = position
+                        if last_indexed_at is not None and (
+                            position[0] < last_indexed_at
+                            or (position[0] == last_indexed_at and position[1] == last_uri)
+                        ):
+                            reached_watermark = True
+                            break
+                    item = _post_to_item(feed_item, handle)
+                    if item is not None:
+                        items.append(item)
+
+                # Without a watermark (first run) a single page is enough
+                cursor = data.get("cursor")
+                done = reached_watermark or last_indexed_at is None or not cursor
+
+                # Update the cursors before handing the page over; iteration may stop here
+                if done:
+                    self.state.pop("pending", None)
+                    if newest is not None:
+                        self.state["last_indexed_at"] = newest[0].isoformat()
+                        self.state["last_uri"] = newest[1]
+                else:
+                    self.state["pending"] = {
+                        "cursor": cursor,
+                        "indexed_at": newest[0].isoformat() if newest else None,
+                        "uri": newest[1] if newest else None,
+                    }
+                if items:
+                    yield items
+
+                if done:
+                    break
+                params["cursor"] = cursor
+
+    async def _resolve_did(self, client: httpx.AsyncClient, handle: str) -> str:
+        """Return the handle's DID, from the fetch state cache while it is fresh."""
+        cached_at = parse_timestamp(self.state.get("did_resolved_at"))
+        if (
+            self.state.get("did")
+            and self.state.get("handle") == handle
+            and cached_at is not None
+            and datetime.now(tz=UTC) - cached_at < DID_CACHE_TTL
+        ):
+            return str(self.state["did"])
+
+        resp = await client.get(
+            f"{BSKY_PUBLIC_API}/com.atproto.identity.resolveHandle",
+            params={"handle": handle},
+        )
+        resp.raise_for_status()
+        did = str(resp.json().get("did", ""))
+        if did:
+            self.state.update(handle=handle, did=did, did_resolved_at=datetime.now(tz=UTC).isoformat())
+        return did
+
+
+def _post_to_item(feed_item: dict, handle: str) -> RawItem | None:  # type: ignore[type-arg]
+    post = feed_item.get("post", {})
+    record = post.get("record", {})
+    author_info = post.get("author", {})
+
+    text = record.get("text", "")
+    if not text:
+        return None
+
+    published = None
+    if record.get("createdAt"):
+        with contextlib.suppress(ValueError, TypeError):
+            published = parse_date(record["createdAt"])
+
+    # Build the post URL
+    uri = post.get("uri", "")
+    rkey = uri.split("/")[-1] if uri else ""
+    post_url = f"https://bsky.app/profile/{handle}/post/{rkey}" if rkey else ""
+
+    # Extract any embedded links
+    embed = post.get("embed", {})
+    external_url = ""
+    if embed.get("$type") == "app.bsky.embed.external#view":
+        external = embed.get("external", {})
+        external_url = external.get("uri", "")
+
+    # Extract images
+    thumbnail = None
+    if embed.get("$type") == "app.bsky.embed.images#view":
+        images = embed.get("images", [])
+        if images:
+            thumbnail = images[0].get("thumb")
+
+    return RawItem(
+        external_id=uri,
+        title=text[:120] + ("..." if len(text) > 120 else ""),
+        url=external_url or post_url,
+        author=author_info.get("displayName") or author_info.get("handle"),
+        content_raw=text[:2000],
+        thumbnail_url=thumbnail,
+        published_at=published,
+        extra={
+            "bsky_url": post_url,
+            "like_count": post.get("likeCount", 0),
+            "repost_count": post.get("repostCount", 0),
+            "reply_count": post.get("replyCount", 0),
+            "handle": handle,
+        },
+    )
+
+
+def _feed_position(feed_item: dict) -> tuple[datetime, str] | None:  # type: ignore[type-arg]
+    """Sort key of a feed entry: when it entered the author's feed, plus the post URI.
+
+    Reposts are ordered by the repost time rather than the original post's.
+    """
+    post = feed_item.get("post", {})
+    reason = feed_item.get("reason") or {}
+    indexed_at = parse_timestamp(reason.get("indexedAt") or post.get("indexedAt"))
+    if indexed_at is None:
+        return None
+    return indexed_at, post.get("uri", "")
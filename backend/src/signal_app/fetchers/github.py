@@ -1,16 +1,43 @@
 import contextlib
 import logging
+from collections.abc import Hashable, Sequence
+from typing import Any, Self
 
 import httpx
 from dateutil.parser import parse as parse_date
 
 from signal_app.config import get_settings
 from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.ratelimit import http_client
 
 logger = logging.getLogger(__name__)
 
+GITHUB_API = "https://api.github.com"
+GITHUB_GRAPHQL = f"{GITHUB_API}/graphql"
+
+RELEASES_PER_REPO = 20
+# Repositories per aliased GraphQL query
+REPOS_PER_QUERY = 50
+
+RELEASE_FIELDS = """
+      nodes {
+        databaseId name tagName url publishedAt createdAt description isPrerelease isDraft
+        author { login }
+      }"""
+
 
 class GitHubReleasesFetcher(BaseFetcher):
+    """Fetches the most recent releases of a repository.
+
+    Without a token each source makes its own REST call. With ``GITHUB_TOKEN``
+    set, all release sources are batched into aliased GraphQL queries of up to
+    ``REPOS_PER_QUERY`` repositories each and the releases are mapped back to
+    their sources. If a query fails as a whole (an HTTP error, or a response
+    without data), its repositories are fetched one by one over REST instead.
+    """
+
+    uses_watermark = True
+
     async def fetch(self) -> list[RawItem]:
         owner = self.config.get("owner", "")
         repo = self.config.get("repo", "")
@@ -18,43 +45,161 @@ class GitHubReleasesFetcher(BaseFetcher):
         if not owner or not repo:
             return []
 
-        url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-        headers: dict[str, str] = {"Accept": "application/vnd.github+json"}
-
-        settings = get_settings()
-        if settings.github_token:
-            headers["Authorization"] = f"Bearer {settings.github_token}"
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=headers, params={"per_page": 20})
-            response.raise_for_status()
-
-        releases = response.json()
-        items: list[RawItem] = []
-
-        for release in releases[:20]:
-            published = None
-            date_str = release.get("published_at") or release.get("created_at")
-            if date_str:
-                with contextlib.suppress(ValueError, TypeError):
-                    published = parse_date(date_str)
-
-            body = release.get("body", "") or ""
-
-            items.append(
-                RawItem(
-                    external_id=str(release.get("id", "")),
-                    title=f"{owner}/{repo}: {release.get('name') or release.get('tag_name', 'Unknown')}",
-                    url=release.get("html_url", ""),
-                    author=release.get("author", {}).get("login"),
-                    content_raw=body[:2000],
-                    published_at=published,
-                    extra={
-                        "tag_name": release.get("tag_name"),
-                        "prerelease": release.get("prerelease", False),
-                        "draft": release.get("draft", False),
-                    },
-                )
-            )
-
-        return items
+        if self.batch_key() is not None:
+            result = (await self.fetch_batch([self]))[0]
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
+        async with http_client(timeout=30) as client:
+            releases = await _rest_releases(client, owner, repo)
+        return [_release_to_item(owner, repo, release) for release in releases]
+
+    def batch_key(self) -> Hashable | None:
+        if not get_settings().github_token or not self.config.get("owner") or not self.config.get("repo"):
+            return None
+        return "graphql"
+
+    @classmethod
+    async def fetch_batch(cls, fetchers: Sequence[Self]) -> list[list[RawItem] | BaseException]:
+        results: list[list[RawItem] | BaseException] = [[] for _ in fetchers]
+
+        by_repo: dict[tuple[str, str], list[int]] = {}
+        for idx, fetcher in enumerate(fetchers):
+            owner = fetcher.config.get("owner", "")
+            repo = fetcher.config.get("repo", "")
+            if owner and repo:
+                by_repo.setdefault((owner.lower(), repo.lower()), []).append(idx)
+
+        repos = list(by_repo)
+        async with http_client(timeout=30) as client:
+            for i in range(0, len(repos), REPOS_PER_QUERY):
+                chunk = repos[i : i + REPOS_PER_QUERY]
+                try:
+                    data, errors = await _query_releases(client, chunk)
+                except Exception as e:
+                    logger.warning("GitHub GraphQL query for %d repositories failed, using REST: %s", len(chunk), e)
+                    for key in chunk:
+                        try:
+                            releases = await _rest_releases(client, *key)
+                        except Exception as rest_error:
+                            for idx in by_repo[key]:
+                                results[idx] = rest_error
+                            continue
+                        for idx in by_repo[key]:
+                            owner, repo = fetchers[idx].config["owner"], fetchers[idx].config["repo"]
+                            results[idx] = [_release_to_item(owner, repo, release) for release in releases]
+                    continue
+
+                for n, key in enumerate(chunk):
+                    alias = f"r{n}"
+                    repository = data.get(alias)
+                    for idx in by_repo[key]:
+                        fetcher = fetchers[idx]
+                        owner, repo = fetcher.config["owner"], fetcher.config["repo"]
+                        if repository is None:
+                            message = errors.get(alias, "repository not found")
+                            results[idx] = RuntimeError(f"GitHub GraphQL error for {owner}/{repo}: {message}")
+                            continue
+                        nodes = (repository.get("releases") or {}).get("nodes") or []
+                        results[idx] = [_release_to_item(owner, repo, _node_to_release(node)) for node in nodes]
+
+        return results
+
+
+def _headers() -> dict[str, str]:
+    headers: dict[str, str] = {"Accept": "application/vnd.github+json"}
+    settings = get_settings()
+    if settings.github_token:
+        headers["Authorization"] = f"Bearer {settings.github_token}"
+    return headers
+
+
+async def _rest_releases(client: httpx.AsyncClient, owner: str, repo: str) -> list[dict[str, Any]]:
+    response = await client.get(
+        f"{GITHUB_API}/repos/{owner}/{repo}/releases", headers=_headers(), params={"per_page": RELEASES_PER_REPO}
+    )
+    response.raise_for_status()
+    releases: list[dict[str, Any]] = response.json()
+    return releases[:RELEASES_PER_REPO]
+
+
+async def _query_releases(
+    client: httpx.AsyncClient,
+    repos: list[tuple[str, str]],
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Run one aliased query (``r0``, ``r1``, …) for ``repos``.
+
+    Returns the ``data`` object and the error messages keyed by alias.
+    """
+    params = ", ".join(f"$o{n}: String!, $n{n}: String!" for n in range(len(repos)))
+    fields = "\n".join(
+        f"  r{n}: repository(owner: $o{n}, name: $n{n}) {{\n"
+        f"    releases(first: {RELEASES_PER_REPO}, orderBy: {{field: CREATED_AT, direction: DESC}}) {{"
+        f"{RELEASE_FIELDS}\n    }}\n  }}"
+        for n in range(len(repos))
+    )
+    variables: dict[str, str] = {}
+    for n, (owner, repo) in enumerate(repos):
+        variables[f"o{n}"] = owner
+        variables[f"n{n}"] = repo
+
+    response = await client.post(
+        GITHUB_GRAPHQL,
+        headers=_headers(),
+        json={"query": f"query({params}) {{\n{fields}\n}}", "variables": variables},
+    )
+    response.raise_for_status()
+    payload = response.json()
+
+    data = payload.get("data")
+    if data is None:
+        messages = "; ".join(e.get("message", "") for e in payload.get("errors", []))
+        raise RuntimeError(f"GitHub GraphQL query failed: {messages or 'no data'}")
+
+    errors: dict[str, str] = {}
+    for error in payload.get("errors", []):
+        path = error.get("path") or []
+        if path:
+            errors[str(path[0])] = error.get("message", "")
+    return data, errors
+
+
+def _node_to_release(node: dict[str, Any]) -> dict[str, Any]:
+    """Reshape a GraphQL release node like a REST release, so both paths build identical items."""
+    return {
+        "id": node.get("databaseId", ""),
+        "name": node.get("name"),
+        "tag_name": node.get("tagName"),
+        "html_url": node.get("url", ""),
+        "published_at": node.get("publishedAt"),
+        "created_at": node.get("createdAt"),
+        "body": node.get("description"),
+        "prerelease": node.get("isPrerelease", False),
+        "draft": node.get("isDraft", False),
+        "author": node.get("author") or {},
+    }
+
+
+def _release_to_item(owner: str, repo: str, release: dict[str, Any]) -> RawItem:
+    published = None
+    date_str = release.get("published_at") or release.get("created_at")
+    if date_str:
+        with contextlib.suppress(ValueError, TypeError):
+            published = parse_date(date_str)
+
+    body = release.get("body", "") or ""
+
+    return RawItem(
+        external_id=str(release.get("id", "")),
+        title=f"{owner}/{repo}: {release.get('name') or release.get('tag_name', 'Unknown')}",
+        url=release.get("html_url", ""),
+        author=(release.get("author") or {}).get("login"),
+        content_raw=body[:2000],
+        published_at=published,
+        extra={
+            "tag_name": release.get("tag_name"),
+            "prerelease": release.get("prerelease", False),
+            "draft": release.get("draft", False),
+        },
+    )
@@ -3,12 +3,10 @@ import json
 import logging
 from datetime import UTC, datetime
 
-import httpx
-from openai import AsyncOpenAI
-
 from signal_app.config import get_settings
-from signal_app.db import get_pool
 from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.llm import get_categories, get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,24 +14,22 @@ HN_TOP_STORIES = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{id}.json"
 HN_DISCUSSION_URL = "https://news.ycombinator.com/item?id={id}"
 
-FILTER_SYSTEM_PROMPT = (
-    "You are a content relevance filter for a news intelligence tool. "
-    "Given news story titles and a set of user categories, identify which "
-    "stories are relevant to at least one category. "
-    "Respond with valid JSON only."
-)
-
-FILTER_USER_TEMPLATE = """Here are the stories:
-{stories}
-
-Here are the categories:
-{categories}
+# Instructions and categories go in the system prompt, which only changes with the
+# categories, so its prefix can be served from the provider's prompt cache
+FILTER_SYSTEM_TEMPLATE = """You are a content relevance filter for a news intelligence tool.
+Given news story titles and a set of user categories, identify which stories are relevant to at least one category.
 
 For each story that is relevant to at least one category, include it in the response.
-Respond with JSON in this exact format:
+Respond with valid JSON only, in this exact format:
 {{"relevant": [{{"index": 0, "categories": ["slug1"]}}]}}
 
-If no stories are relevant, respond with: {{"relevant": []}}"""
+If no stories are relevant, respond with: {{"relevant": []}}
+
+Here are the categories:
+{categories}"""
+
+FILTER_USER_TEMPLATE = """Here are the stories:
+{stories}"""
 
 
 class HackerNewsFetcher(BaseFetcher):
@@ -41,7 +37,7 @@ class HackerNewsFetcher(BaseFetcher):
         min_score = self.config.get("min_score", 0)
 
         # 1. Fetch top 30 story IDs
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_client(timeout=30) as client:
             resp = await client.get(HN_TOP_STORIES)
             resp.raise_for_status()
             story_ids = resp.json()[:30]
@@ -91,7 +87,7 @@ class HackerNewsFetcher(BaseFetcher):
 
     async def _fetch_stories(self, story_ids: list[int]) -> list[dict]:
         """Fetch story details in parallel."""
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_client(timeout=30) as client:
 
             async def _get(sid: int) -> dict | None:
                 try:
@@ -107,15 +103,10 @@ class HackerNewsFetcher(BaseFetcher):
 
     async def _filter_with_llm(self, stories: list[dict]) -> list[int]:
         """Use LLM to filter stories by user categories. Returns list of indices."""
-        # Load categories from DB
-        pool = get_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT name, slug FROM categories ORDER BY sort_order"
-            )
+        categories = await get_categories()
 
         # If no categories configured, return all stories
-        if not rows:
+        if not categories:
             return list(range(len(stories)))
 
         settings = get_settings()
@@ -127,18 +118,16 @@ class HackerNewsFetcher(BaseFetcher):
         story_lines = "\n".join(
             f"{i}. {s.get('title', 'Untitled')}" for i, s in enumerate(stories)
         )
-        cat_lines = "\n".join(f"  - {row['slug']}: {row['name']}" for row in rows)
-
-        user_message = FILTER_USER_TEMPLATE.format(
-            stories=story_lines, categories=cat_lines
-        )
+        cat_lines = "\n".join(f"  - {category.slug}: {category.name}" for category in categories)
+        system_prompt = FILTER_SYSTEM_TEMPLATE.format(categories=cat_lines)
+        user_message = FILTER_USER_TEMPLATE.format(stories=story_lines)
 
         try:
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            client = get_llm_client()
             response = await client.chat.completions.create(
                 model=settings.openai_model,
                 messages=[
-                    {"role": "system", "content": FILTER_SYSTEM_PROMPT},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message},
                 ],
                 temperature=0.2,
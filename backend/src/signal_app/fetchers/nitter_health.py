@@ -0,0 +1,76 @@
+"""Shared health scores for Nitter instances.
+
+Every Nitter request made by the Twitter fetcher records whether the instance
+answered with a usable feed and how long it took. The scores are moving
+averages, so an instance that recovers (or dies) is re-ranked within a few
+runs, and they are kept in app_settings so a restart doesn't forget which
+instances are dead.
+"""
+
+from typing import Any
+
+from signal_app.db import get_app_setting, set_app_setting
+
+SETTINGS_KEY = "nitter_health"
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.3
+# Latency (seconds) at which an always-successful instance scores 0.5
+LATENCY_SCALE = 5.0
+
+
+class NitterHealth:
+    def __init__(self) -> None:
+        # instance URL -> {"success": 0..1, "latency": seconds}
+        self.stats: dict[str, dict[str, float]] = {}
+
+    def record(self, instance: str, *, ok: bool | None, latency: float) -> None:
+        """Record one request. ``ok=None`` (no answer either way, e.g. cancelled) only counts the latency."""
+        stats = self.stats.get(instance)
+        if stats is None:
+            self.stats[instance] = {"success": 0.0 if ok is False else 1.0, "latency": latency}
+            return
+        if ok is not None:
+            stats["success"] += EWMA_ALPHA * ((1.0 if ok else 0.0) - stats["success"])
+        stats["latency"] += EWMA_ALPHA * (latency - stats["latency"])
+
+    def score(self, instance: str) -> float:
+        """Higher is better. Instances never tried score 1 so they get a chance."""
+        stats = self.stats.get(instance)
+        if stats is None:
+            return 1.0
+        return stats["success"] / (1 + stats["latency"] / LATENCY_SCALE)
+
+    def ranked(self, instances: list[str]) -> list[str]:
+        """``instances`` ordered best first; ties keep the configured order."""
+        return sorted(instances, key=self.score, reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {instance: dict(stats) for instance, stats in self.stats.items()}
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.stats = {
+            instance: {"success": float(stats.get("success", 0)), "latency": float(stats.get("latency", 0))}
+            for instance, stats in data.items()
+            if isinstance(stats, dict)
+        }
+
+
+_health: NitterHealth | None = None
+
+
+def get_nitter_health() -> NitterHealth:
+    global _health
+    if _health is None:
+        _health = NitterHealth()
+    return _health
+
+
+async def restore_nitter_health() -> None:
+    data = await get_app_setting(SETTINGS_KEY)
+    if isinstance(data, dict):
+        get_nitter_health().load(data)
+
+
+async def persist_nitter_health() -> None:
+    await set_app_setting(SETTINGS_KEY, get_nitter_health().to_dict())
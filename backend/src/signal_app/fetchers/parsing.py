@@ -0,0 +1,47 @@
+"""Worker pool for CPU-bound feed parsing.
+
+``feedparser`` and ``dateutil`` are pure Python and can take tens of
+milliseconds on a large feed. Run inline, that time blocks the event loop that
+also serves the API. Fetchers therefore hand the downloaded body to a
+module-level parse function through ``run_parser``, which executes it on a
+thread or process pool (``PARSE_EXECUTOR`` / ``PARSE_WORKERS``).
+
+Parse functions must be module-level and take and return picklable values
+(strings, ``RawItem`` lists) so they also work on the process pool.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from signal_app.config import get_settings
+
+_executor: Executor | None = None
+
+
+def get_parse_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        workers = max(1, settings.parse_workers)
+        if settings.parse_executor == "process":
+            # spawn: forking a process that already runs an event loop and threads is unsafe
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-parse")
+    return _executor
+
+
+async def run_parser[**P, T](func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run ``func(*args, **kwargs)`` on the parse pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_parse_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,278 @@
+"""Per-host politeness shared by every fetcher in the process.
+
+Each domain gets a token bucket: up to ``burst`` requests at once, refilled
+at ``rate`` requests per second. Hosts match the most specific configured
+domain suffix, so ``foo.substack.com`` and ``bar.substack.com`` share the
+``substack.com`` bucket; unlisted hosts get a bucket of their own with the
+default limit.
+
+Servers can push back: ``Retry-After`` on a 429/503, or an exhausted
+``X-RateLimit-Remaining`` with ``X-RateLimit-Reset``, pauses the host's bucket
+until then. ``RateLimitedTransport`` applies all of this to every request made
+through ``http_client()`` and retries throttled requests after the advertised
+delay instead of failing the source.
+
+Waiting for a token is deferred work, not a slow source: inside
+``fetch_timeout()`` the clock stops while a request queues for its host, so
+sources lined up behind a shared bucket don't time out.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    rate: float  # requests per second
+    burst: int = 1
+
+
+UNLIMITED = HostLimit(rate=math.inf)
+
+HOST_LIMITS: dict[str, HostLimit] = {
+    # https://info.arxiv.org/help/api/tou.html — no more than one request every three seconds
+    "export.arxiv.org": HostLimit(rate=1 / 3),
+    # Unauthenticated JSON listings are throttled hard; listings are batched (r/a+b+c) so this is plenty
+    "reddit.com": HostLimit(rate=10 / 60, burst=5),
+    "substack.com": HostLimit(rate=1.0, burst=3),
+    "googleapis.com": HostLimit(rate=5.0, burst=10),
+    "youtube.com": HostLimit(rate=2.0, burst=5),
+    "api.github.com": HostLimit(rate=2.0, burst=5),
+    "bsky.app": HostLimit(rate=5.0, burst=10),
+    # Firebase serves the HN API without a published limit; a run fetches ~30 stories at once
+    "hacker-news.firebaseio.com": UNLIMITED,
+}
+DEFAULT_LIMIT = HostLimit(rate=2.0, burst=4)
+
+THROTTLED_STATUSES = frozenset({429, 503})
+
+
+class HostPausedError(httpx.TransportError):
+    """The host asked us to back off for longer than a fetch can wait."""
+
+
+class _FetchClock:
+    """Drives an ``asyncio.Timeout`` so that only time outside host queues counts."""
+
+    def __init__(self, timeout: asyncio.Timeout, seconds: float) -> None:
+        self._timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self._remaining = seconds
+        self._queued = 0  # Requests of this fetch waiting for a token right now
+
+    @contextlib.contextmanager
+    def queued(self) -> Iterator[None]:
+        self._queued += 1
+        if self._queued == 1:
+            deadline = self._timeout.when()
+            if deadline is not None:
+                self._remaining = max(0.0, deadline - self._loop.time())
+            self._timeout.reschedule(None)
+        try:
+            yield
+        finally:
+            self._queued -= 1
+            if self._queued == 0:
+                self._timeout.reschedule(self._loop.time() + self._remaining)
+
+
+_fetch_clock: ContextVar[_FetchClock | None] = ContextVar("fetch_clock", default=None)
+
+
+@contextlib.asynccontextmanager
+async def fetch_timeout(seconds: float) -> AsyncIterator[None]:
+    """Like ``asyncio.timeout(seconds)``, except time spent waiting for host tokens doesn't count."""
+    async with asyncio.timeout(seconds) as timeout:
+        token = _fetch_clock.set(_FetchClock(timeout, seconds))
+        try:
+            yield
+        finally:
+            _fetch_clock.reset(token)
+
+
+class _Bucket:
+    def __init__(self, limit: HostLimit) -> None:
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if math.isinf(self.limit.rate):
+                    return
+                self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.limit.rate)
+
+
+class HostLimiter:
+    def __init__(self, limits: dict[str, HostLimit], default: HostLimit = DEFAULT_LIMIT) -> None:
+        self.limits = limits
+        self.default = default
+        self._buckets: dict[str, _Bucket] = {}
+
+    def _bucket(self, url: str) -> _Bucket:
+        host = (urlsplit(url).hostname or "").lower()
+        key, limit = host, self.default
+        matched = ""
+        for domain, domain_limit in self.limits.items():
+            if (host == domain or host.endswith(f".{domain}")) and len(domain) > len(matched):
+                matched = domain
+                key, limit = domain, domain_limit
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(limit)
+        return bucket
+
+    async def wait(self, url: str) -> None:
+        """Wait for a token in ``url``'s host bucket (and for any server-requested pause)."""
+        await self._bucket(url).acquire()
+
+    def paused_for(self, url: str) -> float:
+        """Seconds until ``url``'s host accepts requests again after a server-requested pause."""
+        return max(0.0, self._bucket(url).paused_until - time.monotonic())
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Pause every request to ``url``'s host for ``seconds``."""
+        bucket = self._bucket(url)
+        bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+
+    def observe(self, url: str, response: httpx.Response) -> float | None:
+        """Apply a response's rate-limit headers to its host.
+
+        Returns the ``Retry-After`` delay for a throttled (429/503) response, if it sent one.
+        """
+        headers = response.headers
+        if response.status_code in THROTTLED_STATUSES:
+            delay = _parse_retry_after(headers.get("Retry-After"))
+            if delay is not None:
+                self.defer(url, delay)
+            return delay
+
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        reset = _parse_float(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and remaining < 1 and reset is not None:
+            # GitHub sends an epoch timestamp, Reddit the seconds left in the window
+            delay = reset - time.time() if reset > 1_000_000_000 else reset
+            if delay > 0:
+                logger.info("Rate limit exhausted for %s, pausing for %.0fs", urlsplit(url).hostname, delay)
+                self.defer(url, delay)
+        return None
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if value is None:
+        return None
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(tz=UTC)).total_seconds())
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that waits for the host's bucket and retries throttled requests.
+
+    A 429/503 is retried after its ``Retry-After`` delay (or a short exponential
+    backoff for a 429 without one) up to ``max_retries`` times; after that the
+    response is returned as is and the fetcher fails as before. A delay longer
+    than ``max_retry_wait`` seconds raises ``HostPausedError``, and so does every
+    request to the host while that pause lasts, so the orchestrator defers all of
+    its sources alike.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limiter: HostLimiter | None = None,
+        max_retries: int = 2,
+        max_retry_wait: float = 30.0,
+    ) -> None:
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._limiter = limiter
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._limiter or get_host_limiter()
+        url = str(request.url)
+        attempt = 0
+        while True:
+            paused = limiter.paused_for(url)
+            if paused > self.max_retry_wait:
+                raise HostPausedError(f"{request.url.host} asked to back off for {paused:.0f}s", request=request)
+            clock = _fetch_clock.get()
+            with clock.queued() if clock is not None else contextlib.nullcontext():
+                await limiter.wait(url)
+            response = await self._transport.handle_async_request(request)
+            delay = limiter.observe(url, response)
+            if response.status_code not in THROTTLED_STATUSES:
+                return response
+            if delay is None and response.status_code == 429:
+                delay = 2.0**attempt
+                limiter.defer(url, delay)
+            if delay is not None and delay > self.max_retry_wait:
+                await response.aclose()
+                raise HostPausedError(f"{request.url.host} asked to back off for {delay:.0f}s", request=request)
+            if delay is None or attempt >= self.max_retries:
+                return response
+
+            attempt += 1
+            logger.info("%s throttled (HTTP %d), retrying in %.1fs", request.url.host, response.status_code, delay)
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """An ``httpx.AsyncClient`` whose requests go through the shared per-host limiter."""
+    return httpx.AsyncClient(transport=RateLimitedTransport(), **kwargs)
+
+
+_limiter: HostLimiter | None = None
+
+
+def get_host_limiter() -> HostLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = HostLimiter(HOST_LIMITS)
+    return _limiter
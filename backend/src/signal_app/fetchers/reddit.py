@@ -1,63 +1,236 @@
 import logging
+from collections.abc import Hashable, Sequence
 from datetime import UTC, datetime
+from typing import Self
 
 import httpx
 
 from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.ratelimit import http_client
 
 logger = logging.getLogger(__name__)
 
+REDDIT_URL = "https://old.reddit.com/r/{subreddits}/{sort}.json"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; Signal/1.0; +https://github.com/glaforge/signal)",
+}
+
+# Subreddits per combined listing request (r/a+b+c) and listing pages per request group
+SUBREDDITS_PER_REQUEST = 10
+MAX_PAGES = 3
+
 
 class RedditFetcher(BaseFetcher):
+    """Fetches posts from a subreddit.
+
+    All reddit sources sharing a sort mode are batched into combined listings
+    (``r/a+b+c``) and the posts are routed back to each source by subreddit.
+    A source that is itself a combined subreddit (``"a+b"``) gets a listing of
+    its own and every post from its parts. Busy subreddits can fill a combined
+    listing before a quiet one shows up, so a subreddit left short when paging
+    ran out is fetched again on its own, and so is every subreddit of a
+    combined listing that failed. For ``new`` listings each source keeps
+    a cursor (newest ``created_utc`` and ``name`` seen) so only newer posts are
+    returned and paging stops early.
+    """
+
     async def fetch(self) -> list[RawItem]:
+        result = (await self.fetch_batch([self]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def batch_key(self) -> Hashable | None:
+        if not self.config.get("subreddit"):
+            return None
+        sort: str = self.config.get("sort", "hot")
+        return sort.lower()
+
+    @property
+    def subreddits(self) -> list[str]:
+        """The lowercased subreddits this source reads (several for ``"a+b"``)."""
+        return [sub for sub in self.config.get("subreddit", "").lower().split("+") if sub]
+
+    @classmethod
+    async def fetch_batch(cls, fetchers: Sequence[Self]) -> list[list[RawItem] | BaseException]:
+        results: list[list[RawItem] | BaseException] = [[] for _ in fetchers]
+
+        # Plain subreddits share combined listings; "a+b" sources keep their own
+        by_subreddit: dict[str, list[int]] = {}
+        groups: list[tuple[list[str], list[int], bool]] = []  # (subreddits, sources, shared listing)
+        for idx, fetcher in enumerate(fetchers):
+            subreddits = fetcher.subreddits
+            if len(subreddits) == 1:
+                by_subreddit.setdefault(subreddits[0], []).append(idx)
+            elif subreddits:
+                groups.append((subreddits, [idx], False))
+
+        subreddits = list(by_subreddit)
+        for i in range(0, len(subreddits), SUBREDDITS_PER_REQUEST):
+            chunk = subreddits[i : i + SUBREDDITS_PER_REQUEST]
+            groups.append((chunk, [idx for sub in chunk for idx in by_subreddit[sub]], True))
+
+        if not groups:
+            return results
+
+        sort = fetchers[0].config.get("sort", "hot").lower()
+
+        async with http_client(timeout=30, follow_redirects=True) as client:
+            for chunk, members, shared in groups:
+                try:
+                    posts, short = await _fetch_listing(client, chunk, sort, [fetchers[idx] for idx in members])
+                except Exception as e:
+                    if not shared or len(chunk) == 1:
+                        for idx in members:
+                            results[idx] = e
+                        continue
+                    # One bad request must not fail every source in it: fetch the subreddits one by one
+                    logger.warning("Combined listing of %d subreddits failed, fetching each: %s", len(chunk), e)
+                    for sub in chunk:
+                        own_members = by_subreddit[sub]
+                        try:
+                            own, _ = await _fetch_listing(client, [sub], sort, [fetchers[i] for i in own_members])
+                        except Exception as own_error:
+                            for idx in own_members:
+                                results[idx] = own_error
+                            continue
+                        for idx in own_members:
+                            results[idx] = fetchers[idx]._route(own, sort)
+                    continue
+
+                if shared and len(chunk) > 1:
+                    posts = await _refetch_short(client, posts, short, sort, fetchers, by_subreddit)
+
+                for idx in members:
+                    results[idx] = fetchers[idx]._route(posts, sort)
+
+        return results
+
+    def _route(self, posts: list[dict], sort: str) -> list[RawItem]:  # type: ignore[type-arg]
+        """Pick this source's posts out of a combined listing and advance its cursor."""
         subreddit = self.config.get("subreddit", "")
-        sort = self.config.get("sort", "hot")
+        subreddits = set(self.subreddits)
         limit = self.config.get("limit", 25)
+        last_created = self.state.get("last_created_utc")
+        last_name = self.state.get("last_name")
 
-        if not subreddit:
-            return []
+        mine = [post for post in posts if post.get("subreddit", "").lower() in subreddits]
+        items: list[RawItem] = []
+        for post in mine:
+            if sort == "new" and last_created is not None and _is_seen(post, last_created, last_name):
+                continue
+            label = subreddit if len(subreddits) == 1 else post.get("subreddit", subreddit)
+            items.append(_post_to_item(post, label))
+            if len(items) >= limit:
+                break
+
+        newest = max((p for p in mine if p.get("created_utc")), key=lambda p: p["created_utc"], default=None)
+        if newest is not None and (last_created is None or newest["created_utc"] >= last_created):
+            self.state["last_created_utc"] = newest["created_utc"]
+            self.state["last_name"] = newest.get("name")
 
-        url = f"https://old.reddit.com/r/{subreddit}/{sort}.json"
-        params = {"limit": min(limit, 100)}
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; Signal/1.0; +https://github.com/glaforge/signal)",
-        }
+        return items
 
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
 
-        data = response.json()
-        items: list[RawItem] = []
+async def _fetch_listing(
+    client: httpx.AsyncClient,
+    subreddits: list[str],
+    sort: str,
+    fetchers: list[RedditFetcher],
+) -> tuple[list[dict], list[str]]:  # type: ignore[type-arg]
+    """Page through a combined listing until every source has enough posts (or has caught up).
 
-        for child in data.get("data", {}).get("children", []):
-            post = child.get("data", {})
+    Returns the posts and the subreddits still short of posts when ``MAX_PAGES`` ran out.
+    """
+    url = REDDIT_URL.format(subreddits="+".join(subreddits), sort=sort)
+    wanted = dict.fromkeys(subreddits, 0)
+    for fetcher in fetchers:
+        for sub in fetcher.subreddits:
+            if sub in wanted:
+                wanted[sub] = max(wanted[sub], min(fetcher.config.get("limit", 25), 100))
+    # For "new" listings, stop once every source's cursor has been passed
+    watermarks: list[float] = [
+        f.state["last_created_utc"] for f in fetchers if f.state.get("last_created_utc") is not None
+    ]
+    oldest_watermark = None if sort != "new" or len(watermarks) < len(fetchers) else min(watermarks)
+
+    posts: list[dict] = []  # type: ignore[type-arg]
+    counts = dict.fromkeys(subreddits, 0)
+    params: dict[str, str | int] = {"limit": 100}
+
+    for _ in range(MAX_PAGES):
+        response = await client.get(url, params=params, headers=HEADERS)
+        response.raise_for_status()
+        data = response.json().get("data", {})
+
+        page = [child.get("data", {}) for child in data.get("children", [])]
+        for post in page:
             if not post:
                 continue
+            posts.append(post)
+            sub = post.get("subreddit", "").lower()
+            if sub in counts:
+                counts[sub] += 1
 
-            published = None
-            if post.get("created_utc"):
-                published = datetime.fromtimestamp(post["created_utc"], tz=UTC)
-
-            post_url = post.get("url") or f"https://reddit.com{post.get('permalink', '')}"
-            content = post.get("selftext", "") or post.get("title", "")
-
-            items.append(
-                RawItem(
-                    external_id=post.get("id"),
-                    title=post.get("title", "Untitled"),
-                    url=post_url,
-                    author=post.get("author"),
-                    content_raw=content[:2000],
-                    thumbnail_url=post.get("thumbnail") if post.get("thumbnail", "").startswith("http") else None,
-                    published_at=published,
-                    extra={
-                        "score": post.get("score"),
-                        "num_comments": post.get("num_comments"),
-                        "subreddit": subreddit,
-                        "reddit_url": f"https://reddit.com{post.get('permalink', '')}",
-                    },
-                )
-            )
+        after = data.get("after")
+        if not after or not page:
+            break
+        if all(counts[sub] >= wanted[sub] for sub in subreddits):
+            break
+        if oldest_watermark is not None and (page[-1].get("created_utc") or 0) <= oldest_watermark:
+            break
+        params["after"] = after
+    else:
+        return posts, [sub for sub in subreddits if counts[sub] < wanted[sub]]
 
-        return items
+    return posts, []
+
+
+async def _refetch_short(
+    client: httpx.AsyncClient,
+    posts: list[dict],  # type: ignore[type-arg]
+    short: list[str],
+    sort: str,
+    fetchers: Sequence[RedditFetcher],
+    by_subreddit: dict[str, list[int]],
+) -> list[dict]:  # type: ignore[type-arg]
+    """Replace the posts of subreddits crowded out of a combined listing with their own listing."""
+    for sub in short:
+        try:
+            own, _ = await _fetch_listing(client, [sub], sort, [fetchers[idx] for idx in by_subreddit[sub]])
+        except Exception as e:
+            # Keep what the combined listing had
+            logger.warning("Fetching r/%s on its own failed: %s", sub, e)
+            continue
+        posts = [post for post in posts if post.get("subreddit", "").lower() != sub] + own
+    return posts
+
+
+def _is_seen(post: dict, last_created: float, last_name: str | None) -> bool:  # type: ignore[type-arg]
+    created = post.get("created_utc") or 0
+    return bool(created < last_created or (created == last_created and post.get("name") == last_name))
+
+
+def _post_to_item(post: dict, subreddit: str) -> RawItem:  # type: ignore[type-arg]
+    published = None
+    if post.get("created_utc"):
+        published = datetime.fromtimestamp(post["created_utc"], tz=UTC)
+
+    post_url = post.get("url") or f"https://reddit.com{post.get('permalink', '')}"
+    content = post.get("selftext", "") or post.get("title", "")
+
+    return RawItem(
+        external_id=post.get("id"),
+        title=post.get("title", "Untitled"),
+        url=post_url,
+        author=post.get("author"),
+        content_raw=content[:2000],
+        thumbnail_url=post.get("thumbnail") if post.get("thumbnail", "").startswith("http") else None,
+        published_at=published,
+        extra={
+            "score": post.get("score"),
+            "num_comments": post.get("num_comments"),
+            "subreddit": subreddit,
+            "reddit_url": f"https://reddit.com{post.get('permalink', '')}",
+        },
+    )
@@ -1,10 +1,16 @@
+import asyncio
 import logging
-from datetime import UTC
+import time
+from datetime import UTC, datetime
 
 import feedparser
 import httpx
 
 from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.nitter_health import NitterHealth, get_nitter_health
+from signal_app.fetchers.parsing import run_parser
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.fetchers.streaming import download_feed
 
 logger = logging.getLogger(__name__)
 
@@ -16,66 +22,132 @@ NITTER_INSTANCES = [
     "https://nitter.1d4.us",
 ]
 
+MAX_TWEETS = 30
+
+# Seconds to wait on an instance before hedging with the next-best one
+HEDGE_DELAY = 2.0
+
 
 class TwitterFetcher(BaseFetcher):
-    """Fetches tweets via Nitter RSS fallback. Fragile — instances shut down regularly."""
+    """Fetches tweets via Nitter RSS fallback. Fragile — instances shut down regularly.
+
+    Instances are tried best-first by their shared health score. If the current
+    instance hasn't answered within ``hedge_delay`` seconds (or fails), the next
+    one is started alongside it; the first usable feed wins and the other
+    requests are cancelled. A cancelled request still records how long it had
+    been waiting, so slow instances sink in the ranking.
+    """
+
+    uses_watermark = True
 
     async def fetch(self) -> list[RawItem]:
         username = self.config.get("username", "")
         if not username:
             return []
 
-        rss_content = None
-        last_error = None
-
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-            for instance in NITTER_INSTANCES:
-                try:
-                    url = f"{instance}/{username}/rss"
-                    response = await client.get(url)
-                    if response.status_code == 200 and len(response.text) > 100:
-                        rss_content = response.text
-                        break
-                except httpx.HTTPError as e:
-                    last_error = str(e)
-                    continue
-
-        if not rss_content:
+        health = get_nitter_health()
+        hedge_delay = self.config.get("hedge_delay", HEDGE_DELAY)
+
+        async with http_client(timeout=15, follow_redirects=True) as client:
+            feed, last_error = await _fetch_hedged(client, username, health, hedge_delay, self.config.get("max_bytes"))
+
+        if feed is None:
             logger.warning("All Nitter instances failed for @%s: %s", username, last_error)
             return []
 
-        feed = feedparser.parse(rss_content)
-        items: list[RawItem] = []
-
-        for entry in feed.entries[:30]:
-            published = None
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                from datetime import datetime
-
-                published = datetime(*entry.published_parsed[:6], tzinfo=UTC)
-
-            # Nitter entries use the tweet URL as the link
-            tweet_url = entry.get("link", "")
-            # Convert nitter URL to twitter URL
-            for instance in NITTER_INSTANCES:
-                if tweet_url.startswith(instance):
-                    tweet_url = tweet_url.replace(instance, "https://twitter.com")
-                    break
-
-            title = entry.get("title", "")
-            if not title:
-                title = (entry.get("summary", "") or "")[:120]
-
-            items.append(
-                RawItem(
-                    external_id=tweet_url,
-                    title=title[:200] if title else f"Tweet by @{username}",
-                    url=tweet_url,
-                    author=f"@{username}",
-                    content_raw=(entry.get("summary") or entry.get("description", ""))[:2000],
-                    published_at=published,
-                    extra={"username": username, "method": "nitter"},
-                )
+        return await run_parser(_parse_tweets, *feed, username)
+
+
+def _parse_tweets(content: bytes | str, headers: dict[str, str] | None, username: str) -> list[RawItem]:
+    feed = feedparser.parse(content, response_headers=headers)
+    items: list[RawItem] = []
+
+    for entry in feed.entries[:MAX_TWEETS]:
+        published = None
+        if hasattr(entry, "published_parsed") and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6], tzinfo=UTC)
+
+        # Nitter entries use the tweet URL as the link
+        tweet_url = entry.get("link", "")
+        # Convert nitter URL to twitter URL
+        for instance in NITTER_INSTANCES:
+            if tweet_url.startswith(instance):
+                tweet_url = tweet_url.replace(instance, "https://twitter.com")
+                break
+
+        title = entry.get("title", "")
+        if not title:
+            title = (entry.get("summary", "") or "")[:120]
+
+        items.append(
+            RawItem(
+                external_id=tweet_url,
+                title=title[:200] if title else f"Tweet by @{username}",
+                url=tweet_url,
+                author=f"@{username}",
+                content_raw=(entry.get("summary") or entry.get("description", ""))[:2000],
+                published_at=published,
+                extra={"username": username, "method": "nitter"},
             )
-
-        return items
+        )
+
+    return items
+
+
+async def _fetch_hedged(
+    client: httpx.AsyncClient,
+    username: str,
+    health: NitterHealth,
+    hedge_delay: float,
+    max_bytes: int | None = None,
+) -> tuple[tuple[bytes, dict[str, str]] | None, str | None]:
+    """Return the first usable RSS feed (body and headers) from the ranked instances, plus the last error seen."""
+    instances = health.ranked(NITTER_INSTANCES)
+    errors: list[str] = []
+
+    async def attempt(instance: str) -> tuple[bytes, dict[str, str]] | None:
+        started = time.monotonic()
+        try:
+            body, headers = await download_feed(
+                client, f"{instance}/{username}/rss", max_entries=MAX_TWEETS, max_bytes=max_bytes
+            )
+        except httpx.HTTPError as e:
+            health.record(instance, ok=False, latency=time.monotonic() - started)
+            errors.append(f"{instance}: {e}")
+            return None
+        except asyncio.CancelledError:
+            # Lost the race: not a failure, but it was at least this slow
+            health.record(instance, ok=None, latency=time.monotonic() - started)
+            raise
+        ok = len(body) > 100
+        health.record(instance, ok=ok, latency=time.monotonic() - started)
+        if not ok:
+            errors.append(f"{instance}: empty feed")
+            return None
+        return body, headers
+
+    pending: set[asyncio.Task[tuple[bytes, dict[str, str]] | None]] = set()
+    remaining = iter(instances)
+    try:
+        while True:
+            # Start the next instance: on entry, after a failure, or once the hedge delay passes
+            instance = next(remaining, None)
+            if instance is not None:
+                pending.add(asyncio.create_task(attempt(instance)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if instance is not None else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                feed = task.result()
+                if feed is not None:
+                    return feed, None
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return None, errors[-1] if errors else None
@@ -1,13 +1,20 @@
+import asyncio
 import contextlib
 import logging
 import re
-from datetime import UTC, datetime
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
 
+import feedparser
 import httpx
 from dateutil.parser import parse as parse_date
 
 from signal_app.config import get_settings
-from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.base import BaseFetcher, RawItem, parse_timestamp
+from signal_app.fetchers.parsing import run_parser
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.fetchers.streaming import download_feed
+from signal_app.fetchers.youtube_quota import UNIT_COSTS, QuotaExceededError, get_ledger
 
 # Matches titles containing CJK, Arabic, Cyrillic, Thai, or Devanagari characters
 _NON_LATIN_RE = re.compile(
@@ -23,12 +30,111 @@ _NON_LATIN_RE = re.compile(
 logger = logging.getLogger(__name__)
 
 YOUTUBE_API = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+
+# A handle can be given up and claimed by another channel, so resolved IDs are checked again monthly
+CHANNEL_ID_CACHE_TTL = timedelta(days=30)
 
 
 class YouTubeChannelFetcher(BaseFetcher):
-    """Fetches latest videos from a specific YouTube channel."""
+    """Fetches latest videos from a specific YouTube channel.
+
+    The default ``feed`` method reads the channel's public Atom feed and costs no
+    Data API quota. ``"method": "api"`` keeps the uploads-playlist path. A
+    ``channel_handle`` is resolved once and the channel ID kept in the source's
+    fetch state, so later runs skip the lookup.
+    """
+
+    uses_watermark = True
 
     async def fetch(self) -> list[RawItem]:
+        try:
+            if self.config.get("method", "feed") == "api":
+                return await self._fetch_api()
+            return await self._fetch_feed()
+        except QuotaExceededError as e:
+            logger.warning("Skipping YouTube channel %s: %s", self.source_id, e)
+            return []
+
+    def quota_estimate(self) -> int:
+        """Data API units one fetch of this channel is expected to spend."""
+        known = self.config.get("channel_id") or self._cached_channel_id(self.config.get("channel_handle"))
+        units = 0 if known else UNIT_COSTS["channels.list"]
+        if self.config.get("method", "feed") == "api":
+            units += UNIT_COSTS["playlistItems.list"]
+            if not self.config.get("playlist_id"):
+                units += UNIT_COSTS["channels.list"]
+        elif self.config.get("enrich_views"):
+            units += UNIT_COSTS["videos.list"]
+        return units
+
+    def _cached_channel_id(self, handle: str | None) -> str | None:
+        """The channel ID ``handle`` resolved to, from the fetch state cache while it is fresh."""
+        cached_at = parse_timestamp(self.state.get("channel_id_resolved_at"))
+        if (
+            handle
+            and self.state.get("channel_id")
+            and self.state.get("channel_handle") == handle
+            and cached_at is not None
+            and datetime.now(tz=UTC) - cached_at < CHANNEL_ID_CACHE_TTL
+        ):
+            return str(self.state["channel_id"])
+        return None
+
+    async def _resolve_channel_id(self, client: httpx.AsyncClient, handle: str, api_key: str) -> str | None:
+        channel_id = await _resolve_handle(client, handle, api_key)
+        if channel_id:
+            self.state.update(
+                channel_handle=handle, channel_id=channel_id, channel_id_resolved_at=datetime.now(tz=UTC).isoformat()
+            )
+        return channel_id
+
+    async def _fetch_feed(self) -> list[RawItem]:
+        channel_id = self.config.get("channel_id")
+        channel_handle: str = self.config.get("channel_handle", "")
+        max_results = self.config.get("max_results", 15)
+
+        if not channel_id and not channel_handle:
+            return []
+
+        api_key = get_settings().google_api_key
+
+        async with http_client(timeout=30) as client:
+            if not channel_id:
+                # The feed only accepts channel IDs, so a new handle still needs one API lookup
+                channel_id = self._cached_channel_id(channel_handle)
+                if not channel_id and not api_key:
+                    logger.warning("No Google API key configured, cannot resolve YouTube handle: %s", channel_handle)
+                    return []
+                channel_id = channel_id or await self._resolve_channel_id(client, channel_handle, api_key)
+                if not channel_id:
+                    return []
+
+            content, headers = await download_feed(
+                client,
+                YOUTUBE_FEED_URL,
+                params={"channel_id": channel_id},
+                max_entries=max_results,
+                max_bytes=self.config.get("max_bytes"),
+            )
+
+        items = await run_parser(_parse_channel_feed, content, channel_id, max_results, headers)
+
+        # Optional enrichment: fresher view counts from the Data API (1 unit per 50 videos)
+        if self.config.get("enrich_views") and api_key and items:
+            view_counts = await _fetch_view_counts(
+                [item.external_id for item in items if item.external_id], api_key, priority=True
+            )
+            items = [
+                replace(item, extra={**(item.extra or {}), "view_count": view_counts[item.external_id]})
+                if item.external_id in view_counts
+                else item
+                for item in items
+            ]
+
+        return items
+
+    async def _fetch_api(self) -> list[RawItem]:
         settings = get_settings()
         api_key = settings.google_api_key
         if not api_key:
@@ -41,24 +147,18 @@ class YouTubeChannelFetcher(BaseFetcher):
         if not channel_id and not channel_handle:
             return []
 
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_client(timeout=30) as client:
             # Resolve handle to channel ID if needed
             if not channel_id and channel_handle:
-                handle = channel_handle.lstrip("@")
-                resp = await client.get(
-                    f"{YOUTUBE_API}/channels",
-                    params={"part": "id,contentDetails", "forHandle": handle, "key": api_key},
+                channel_id = self._cached_channel_id(channel_handle) or await self._resolve_channel_id(
+                    client, channel_handle, api_key
                 )
-                resp.raise_for_status()
-                data = resp.json()
-                channels = data.get("items", [])
-                if not channels:
-                    logger.warning("Could not resolve YouTube handle: %s", channel_handle)
+                if not channel_id:
                     return []
-                channel_id = channels[0]["id"]
 
             # Get uploads playlist
             if not self.config.get("playlist_id"):
+                get_ledger().charge("channels.list", priority=True)
                 resp = await client.get(
                     f"{YOUTUBE_API}/channels",
                     params={"part": "contentDetails", "id": channel_id, "key": api_key},
@@ -73,6 +173,7 @@ class YouTubeChannelFetcher(BaseFetcher):
                 playlist_id = self.config["playlist_id"]
 
             # Get playlist items
+            get_ledger().charge("playlistItems.list", priority=True)
             resp = await client.get(
                 f"{YOUTUBE_API}/playlistItems",
                 params={
@@ -139,104 +240,226 @@ class YouTubeSearchFetcher(BaseFetcher):
         if not keywords:
             return []
 
-        all_items: list[RawItem] = []
-        seen_ids: set[str] = set()
+        # Spend only what channel fetches haven't reserved, rotating through keywords across runs
+        ledger = get_ledger()
+        per_keyword = UNIT_COSTS["search.list"] + (UNIT_COSTS["videos.list"] if min_views else 0)
+        selected = ledger.next_keywords(self.source_id, keywords, ledger.available() // per_keyword)
+        if len(selected) < len(keywords):
+            logger.info("YouTube quota allows %d of %d keywords this run", len(selected), len(keywords))
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            for keyword in keywords:
-                resp = await client.get(
-                    f"{YOUTUBE_API}/search",
-                    params={
-                        "part": "snippet",
-                        "q": keyword,
-                        "type": "video",
-                        "order": "date",
-                        "maxResults": max_results,
-                        "publishedAfter": _recent_date(),
-                        "videoDuration": "medium",
-                        "relevanceLanguage": "en",
-                        "key": api_key,
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
+        concurrency = max(1, self.config.get("search_concurrency", 5))
+        semaphore = asyncio.Semaphore(concurrency)
+        seen_ids: set[str] = set()
 
-                for item in data.get("items", []):
-                    video_id = item.get("id", {}).get("videoId", "")
-                    if not video_id or video_id in seen_ids:
-                        continue
-                    seen_ids.add(video_id)
-
-                    snippet = item.get("snippet", {})
-                    published = None
-                    if snippet.get("publishedAt"):
-                        with contextlib.suppress(ValueError, TypeError):
-                            published = parse_date(snippet["publishedAt"])
-
-                    thumbnails = snippet.get("thumbnails", {})
-                    thumbnail = (
-                        thumbnails.get("high", {}).get("url")
-                        or thumbnails.get("medium", {}).get("url")
-                        or thumbnails.get("default", {}).get("url")
+        async with http_client(timeout=30) as client:
+
+            async def _run(keyword: str) -> list[RawItem] | None:
+                async with semaphore:
+                    try:
+                        ledger.charge("search.list")
+                    except QuotaExceededError as e:
+                        logger.warning("Skipping YouTube keyword %r: %s", keyword, e)
+                        return None
+                    items = await _search_keyword(client, keyword, max_results, api_key, seen_ids)
+
+                # Filter non-Latin titles, then look up this page's view counts right away
+                # while the remaining searches are still in flight
+                items = [item for item in items if not _NON_LATIN_RE.search(item.title)]
+                if min_views and items:
+                    view_counts = await _fetch_view_counts(
+                        [item.external_id for item in items if item.external_id], api_key, client=client
                     )
+                    items = [item for item in items if view_counts.get(item.external_id or "", 0) >= min_views]
+                return items
 
-                    all_items.append(
-                        RawItem(
-                            external_id=video_id,
-                            title=snippet.get("title", "Untitled"),
-                            url=f"https://www.youtube.com/watch?v={video_id}",
-                            author=snippet.get("channelTitle"),
-                            content_raw=(snippet.get("description") or "")[:2000],
-                            thumbnail_url=thumbnail,
-                            published_at=published,
-                            extra={
-                                "channel_id": snippet.get("channelId"),
-                                "channel_title": snippet.get("channelTitle"),
-                                "video_id": video_id,
-                                "search_keyword": keyword,
-                            },
-                        )
-                    )
+            results = await asyncio.gather(*(_run(keyword) for keyword in selected), return_exceptions=True)
 
-        # Filter non-Latin titles
-        all_items = [item for item in all_items if not _NON_LATIN_RE.search(item.title)]
+        ledger.advance_keywords(self.source_id, keywords, sum(1 for r in results if r is not None))
 
-        # Filter by minimum view count
-        if min_views and all_items:
-            view_counts = await _fetch_view_counts(
-                [item.external_id for item in all_items], api_key
-            )
-            all_items = [
-                item
-                for item in all_items
-                if view_counts.get(item.external_id, 0) >= min_views
-            ]
+        all_items: list[RawItem] = []
+        failures: list[BaseException] = []
+        for keyword, result in zip(selected, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning("YouTube search failed for keyword %r: %s", keyword, result)
+                failures.append(result)
+            elif result:
+                all_items.extend(result)
+
+        # Only fail the source when no keyword could be searched at all
+        if failures and len(failures) == len(selected):
+            raise failures[0]
 
         return all_items
 
 
-async def _fetch_view_counts(video_ids: list[str], api_key: str) -> dict[str, int]:
-    """Batch-fetch view counts from the YouTube videos endpoint (max 50 per call)."""
-    counts: dict[str, int] = {}
-    async with httpx.AsyncClient(timeout=30) as client:
-        for i in range(0, len(video_ids), 50):
-            batch = video_ids[i : i + 50]
-            resp = await client.get(
-                f"{YOUTUBE_API}/videos",
-                params={
-                    "part": "statistics",
-                    "id": ",".join(batch),
-                    "key": api_key,
+async def _search_keyword(
+    client: httpx.AsyncClient, keyword: str, max_results: int, api_key: str, seen_ids: set[str]
+) -> list[RawItem]:
+    """Run one search.list call and build items for videos not seen yet."""
+    resp = await client.get(
+        f"{YOUTUBE_API}/search",
+        params={
+            "part": "snippet",
+            "q": keyword,
+            "type": "video",
+            "order": "date",
+            "maxResults": max_results,
+            "publishedAfter": _recent_date(),
+            "videoDuration": "medium",
+            "relevanceLanguage": "en",
+            "key": api_key,
+        },
+    )
+    resp.raise_for_status()
+    data = resp.json()
+
+    items: list[RawItem] = []
+    for item in data.get("items", []):
+        video_id = item.get("id", {}).get("videoId", "")
+        if not video_id or video_id in seen_ids:
+            continue
+        seen_ids.add(video_id)
+
+        snippet = item.get("snippet", {})
+        published = None
+        if snippet.get("publishedAt"):
+            with contextlib.suppress(ValueError, TypeError):
+                published = parse_date(snippet["publishedAt"])
+
+        thumbnails = snippet.get("thumbnails", {})
+        thumbnail = (
+            thumbnails.get("high", {}).get("url")
+            or thumbnails.get("medium", {}).get("url")
+            or thumbnails.get("default", {}).get("url")
+        )
+
+        items.append(
+            RawItem(
+                external_id=video_id,
+                title=snippet.get("title", "Untitled"),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+                author=snippet.get("channelTitle"),
+                content_raw=(snippet.get("description") or "")[:2000],
+                thumbnail_url=thumbnail,
+                published_at=published,
+                extra={
+                    "channel_id": snippet.get("channelId"),
+                    "channel_title": snippet.get("channelTitle"),
+                    "video_id": video_id,
+                    "search_keyword": keyword,
                 },
             )
-            resp.raise_for_status()
-            for item in resp.json().get("items", []):
-                vid = item["id"]
-                views = int(item.get("statistics", {}).get("viewCount", 0))
-                counts[vid] = views
+        )
+
+    return items
+
+
+async def _resolve_handle(client: httpx.AsyncClient, channel_handle: str, api_key: str) -> str | None:
+    """Resolve an ``@handle`` to a channel ID via the channels endpoint."""
+    get_ledger().charge("channels.list", priority=True)
+    resp = await client.get(
+        f"{YOUTUBE_API}/channels",
+        params={"part": "id", "forHandle": channel_handle.lstrip("@"), "key": api_key},
+    )
+    resp.raise_for_status()
+    channels = resp.json().get("items", [])
+    if not channels:
+        logger.warning("Could not resolve YouTube handle: %s", channel_handle)
+        return None
+    return str(channels[0]["id"])
+
+
+async def _fetch_view_counts(
+    video_ids: list[str],
+    api_key: str,
+    *,
+    priority: bool = False,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, int]:
+    """Batch-fetch view counts from the YouTube videos endpoint (max 50 per call).
+
+    Stops early, returning the counts gathered so far, once the quota runs out.
+    """
+    if client is None:
+        async with http_client(timeout=30) as own_client:
+            return await _fetch_view_counts(video_ids, api_key, priority=priority, client=own_client)
+
+    counts: dict[str, int] = {}
+    ledger = get_ledger()
+    for i in range(0, len(video_ids), 50):
+        batch = video_ids[i : i + 50]
+        try:
+            ledger.charge("videos.list", priority=priority)
+        except QuotaExceededError as e:
+            logger.warning("Skipping remaining view count lookups: %s", e)
+            break
+        resp = await client.get(
+            f"{YOUTUBE_API}/videos",
+            params={
+                "part": "statistics",
+                "id": ",".join(batch),
+                "key": api_key,
+            },
+        )
+        resp.raise_for_status()
+        for item in resp.json().get("items", []):
+            vid = item["id"]
+            views = int(item.get("statistics", {}).get("viewCount", 0))
+            counts[vid] = views
     return counts
 
 
+def _parse_channel_feed(
+    content: bytes | str, channel_id: str, max_results: int, headers: dict[str, str] | None = None
+) -> list[RawItem]:
+    feed = feedparser.parse(content, response_headers=headers)
+    channel_title = feed.feed.get("title")
+    items: list[RawItem] = []
+
+    for entry in feed.entries[:max_results]:
+        video_id = entry.get("yt_videoid", "")
+        if not video_id:
+            continue
+
+        published = None
+        if entry.get("published"):
+            with contextlib.suppress(ValueError, TypeError):
+                published = parse_date(entry["published"])
+
+        thumbnails = entry.get("media_thumbnail") or []
+        views = entry.get("media_statistics", {}).get("views")
+
+        extra: dict[str, object] = {
+            "channel_id": entry.get("yt_channelid") or channel_id,
+            "channel_title": entry.get("author") or channel_title,
+            "video_id": video_id,
+        }
+        if views is not None:
+            with contextlib.suppress(ValueError, TypeError):
+                extra["view_count"] = int(views)
+
+        items.append(
+            RawItem(
+                external_id=video_id,
+                title=entry.get("title", "Untitled"),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+                author=entry.get("author") or channel_title,
+                content_raw=(entry.get("summary") or "")[:2000],
+                thumbnail_url=thumbnails[0].get("url") if thumbnails else None,
+                published_at=published,
+                extra=extra,
+            )
+        )
+
+    return items
+
+
+def reserve_channel_quota(fetchers: list[BaseFetcher]) -> None:
+    """Reserve today's quota for channel fetches so keyword searches can't starve them."""
+    units = sum(f.quota_estimate() for f in fetchers if isinstance(f, YouTubeChannelFetcher))
+    get_ledger().reserve(units)
+
+
 def _recent_date() -> str:
     """Return ISO date for 7 days ago (YouTube search filter)."""
     from datetime import timedelta
@@ -0,0 +1,152 @@
+"""Shared accounting for the daily YouTube Data API quota.
+
+Every Data API call made by the YouTube fetchers and the discovery engine is
+charged against one in-process ledger. Channel fetches charge with
+``priority=True`` and may draw on units reserved for them at the start of a
+pipeline run; everything else (keyword searches, discovery enrichment) only
+spends what is left after the reservation.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from dateutil import tz
+
+from signal_app.config import get_settings
+from signal_app.db import get_app_setting, set_app_setting
+
+logger = logging.getLogger(__name__)
+
+# Units per call — https://developers.google.com/youtube/v3/determine_quota_cost
+UNIT_COSTS: dict[str, int] = {
+    "search.list": 100,
+    "videos.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+}
+
+SETTINGS_KEY = "youtube_quota"
+
+# Google resets the daily quota at midnight Pacific time
+_QUOTA_TZ = tz.gettz("America/Los_Angeles")
+
+
+class QuotaExceededError(Exception):
+    """Raised when a Data API call would exceed the daily budget."""
+
+
+def _quota_day() -> date:
+    return datetime.now(tz=_QUOTA_TZ).date()
+
+
+class QuotaLedger:
+    def __init__(self, daily_budget: int) -> None:
+        self.daily_budget = daily_budget
+        self.day = _quota_day()
+        self.used = 0
+        self.reserved = 0
+        self.calls: dict[str, int] = {}
+        self.keyword_cursors: dict[str, int] = {}
+
+    def _roll_over(self) -> None:
+        today = _quota_day()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+            self.reserved = 0
+            self.calls = {}
+
+    @property
+    def remaining(self) -> int:
+        self._roll_over()
+        return max(0, self.daily_budget - self.used)
+
+    def available(self, *, priority: bool = False) -> int:
+        """Units that a caller of the given priority may still spend today."""
+        if priority:
+            return self.remaining
+        return max(0, self.remaining - self.reserved)
+
+    def can_afford(self, method: str, count: int = 1, *, priority: bool = False) -> bool:
+        return UNIT_COSTS[method] * count <= self.available(priority=priority)
+
+    def charge(self, method: str, count: int = 1, *, priority: bool = False) -> None:
+        """Record ``count`` calls to ``method``, or raise if they don't fit the budget."""
+        units = UNIT_COSTS[method] * count
+        if units > self.available(priority=priority):
+            raise QuotaExceededError(
+                f"YouTube quota exhausted: {method} needs {units} units, {self.available(priority=priority)} available"
+            )
+        self.used += units
+        self.calls[method] = self.calls.get(method, 0) + count
+        if priority:
+            self.reserved = max(0, self.reserved - units)
+
+    def reserve(self, units: int) -> None:
+        """Hold back units for priority callers (channel fetches) for the current run."""
+        self._roll_over()
+        self.reserved = min(units, self.remaining)
+
+    def release(self) -> None:
+        self.reserved = 0
+
+    def next_keywords(self, source_id: str, keywords: list[str], limit: int) -> list[str]:
+        """Pick up to ``limit`` keywords, continuing round-robin from the last run."""
+        if not keywords or limit <= 0:
+            return []
+        start = self.keyword_cursors.get(source_id, 0) % len(keywords)
+        rotated = keywords[start:] + keywords[:start]
+        return rotated[:limit]
+
+    def advance_keywords(self, source_id: str, keywords: list[str], count: int) -> None:
+        if keywords:
+            self.keyword_cursors[source_id] = (self.keyword_cursors.get(source_id, 0) + count) % len(keywords)
+
+    def snapshot(self) -> dict[str, Any]:
+        self._roll_over()
+        return {
+            "day": self.day.isoformat(),
+            "daily_budget": self.daily_budget,
+            "used": self.used,
+            "remaining": self.remaining,
+            "reserved": self.reserved,
+            "calls": dict(self.calls),
+            "unit_costs": dict(UNIT_COSTS),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "day": self.day.isoformat(),
+            "used": self.used,
+            "calls": self.calls,
+            "keyword_cursors": self.keyword_cursors,
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.keyword_cursors = {k: int(v) for k, v in (data.get("keyword_cursors") or {}).items()}
+        if data.get("day") == _quota_day().isoformat():
+            self.day = _quota_day()
+            self.used = int(data.get("used", 0))
+            self.calls = {k: int(v) for k, v in (data.get("calls") or {}).items()}
+
+
+_ledger: QuotaLedger | None = None
+
+
+def get_ledger() -> QuotaLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = QuotaLedger(get_settings().youtube_daily_quota)
+    return _ledger
+
+
+async def restore_ledger() -> None:
+    """Load today's spend from app_settings so restarts don't reset the count."""
+    data = await get_app_setting(SETTINGS_KEY)
+    if isinstance(data, dict):
+        get_ledger().load(data)
+
+
+async def persist_ledger() -> None:
+    await set_app_setting(SETTINGS_KEY, get_ledger().to_dict())
@@ -0,0 +1,198 @@
+"""Bulk import of RSS/Atom sources from an OPML subscription list.
+
+The upload is parsed incrementally (``XMLPullParser`` fed chunk by chunk), and
+each outline is cleared and detached from its parent once it has been read, so
+a multi-thousand-feed export is never held as a whole document or tree. Each feed
+is then probed: downloaded (up to its first entry) and checked for an ``<rss>``,
+RSS 1.0 ``<rdf:RDF>`` or Atom ``<feed>`` root. Probes run concurrently, at most
+``OPML_PROBE_CONCURRENCY`` at a time and subject to the usual per-host limits.
+Feeds that pass are inserted with one multi-row statement at the end.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+
+from signal_app.config import get_settings
+from signal_app.db import get_pool
+from signal_app.fetchers.ratelimit import http_client
+from signal_app.fetchers.streaming import download_feed
+
+logger = logging.getLogger(__name__)
+
+# Enough for the root element and a first entry; the rest of the feed is not needed to validate it
+PROBE_MAX_BYTES = 256_000
+FEED_ROOTS = {"rss": "rss", "RDF": "rss", "feed": "atom"}
+
+
+class OpmlError(ValueError):
+    """The upload is not a readable OPML document."""
+
+
+@dataclass(frozen=True, slots=True)
+class OpmlFeed:
+    url: str
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    feed: OpmlFeed
+    source_type: str | None = None  # "rss" or "atom" when the feed is valid
+    error: str | None = None
+
+
+async def parse_opml(chunks: AsyncIterable[bytes]) -> list[OpmlFeed]:
+    """Collect the feed outlines (``xmlUrl``) of an OPML document, in order and without duplicates."""
+    parser: XMLPullParser[Element] = XMLPullParser(events=("start", "end"))
+    open_elements: list[Element] = []
+    feeds: list[OpmlFeed] = []
+    seen: set[str] = set()
+
+    def drain() -> None:
+        for event in parser.read_events():
+            element = event[-1]
+            if not isinstance(element, Element):
+                continue
+            if event[0] == "end":
+                # Its attributes were read at the start; drop it so the parsed tree stays small
+                open_elements.pop()
+                if element.tag == "outline" and open_elements:
+                    element.clear()
+                    open_elements[-1].remove(element)
+                continue
+            open_elements.append(element)
+            if element.tag != "outline":
+                continue
+            url = (element.get("xmlUrl") or "").strip()
+            if not url.startswith(("http://", "https://")) or url in seen:
+                continue
+            seen.add(url)
+            title = (element.get("title") or element.get("text") or "").strip()
+            feeds.append(OpmlFeed(url=url, title=title or urlsplit(url).netloc))
+
+    try:
+        async for chunk in chunks:
+            parser.feed(chunk)
+            drain()
+        parser.close()
+        drain()
+    except ParseError as exc:
+        raise OpmlError(f"Invalid OPML: {exc}") from exc
+    return feeds
+
+
+def detect_feed_type(content: bytes) -> str | None:
+    """``rss`` or ``atom`` from the document's root element, None if it isn't a feed."""
+    parser: XMLPullParser[Element] = XMLPullParser(events=("start",))
+    try:
+        parser.feed(content)
+        for *_, element in parser.read_events():
+            if isinstance(element, Element):
+                return FEED_ROOTS.get(element.tag.rsplit("}", 1)[-1])
+    except ParseError:
+        return None
+    return None
+
+
+async def probe_feed(client: httpx.AsyncClient, feed: OpmlFeed) -> ProbeResult:
+    try:
+        content, _ = await download_feed(client, feed.url, max_entries=1, max_bytes=PROBE_MAX_BYTES)
+    except httpx.HTTPStatusError as exc:
+        return ProbeResult(feed, error=f"HTTP {exc.response.status_code}")
+    except httpx.HTTPError as exc:
+        return ProbeResult(feed, error=f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__)
+    source_type = detect_feed_type(content)
+    if source_type is None:
+        return ProbeResult(feed, error="Not an RSS or Atom feed")
+    return ProbeResult(feed, source_type=source_type)
+
+
+async def probe_feeds(feeds: list[OpmlFeed], concurrency: int | None = None) -> AsyncIterator[ProbeResult]:
+    """Probe ``feeds`` concurrently, yielding results as they complete."""
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.opml_probe_concurrency))
+
+    async def probe(client: httpx.AsyncClient, feed: OpmlFeed) -> ProbeResult:
+        async with semaphore:
+            return await probe_feed(client, feed)
+
+    async with http_client(timeout=settings.opml_probe_timeout, follow_redirects=True) as client:
+        tasks = [asyncio.create_task(probe(client, feed)) for feed in feeds]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def existing_feed_urls() -> set[str]:
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT config->>'feed_url' AS feed_url FROM sources WHERE source_type IN ('rss', 'atom')"
+        )
+    return {row["feed_url"] for row in rows if row["feed_url"]}
+
+
+async def insert_sources(accepted: list[ProbeResult], fetch_interval: str, enabled: bool = True) -> int:
+    """Insert one source per accepted feed in a single statement. Returns the number inserted."""
+    if not accepted:
+        return 0
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """INSERT INTO sources (name, source_type, config, enabled, fetch_interval)
+               SELECT name, source_type, config::jsonb, $4, $5::text::interval
+               FROM unnest($1::text[], $2::text[], $3::text[]) AS s(name, source_type, config)
+               RETURNING id""",
+            [result.feed.title for result in accepted],
+            [result.source_type for result in accepted],
+            [json.dumps({"feed_url": result.feed.url}) for result in accepted],
+            enabled,
+            fetch_interval,
+        )
+    return len(rows)
+
+
+async def import_feeds(
+    feeds: list[OpmlFeed], fetch_interval: str, enabled: bool = True
+) -> AsyncIterator[dict[str, Any]]:
+    """Probe and import ``feeds``, yielding a progress event per feed and a final summary.
+
+    Feeds already present as rss/atom sources are skipped without a probe.
+    """
+    known = await existing_feed_urls()
+    pending = [feed for feed in feeds if feed.url not in known]
+    duplicates = len(feeds) - len(pending)
+    yield {"event": "start", "total": len(feeds), "duplicates": duplicates, "to_probe": len(pending)}
+
+    accepted: list[ProbeResult] = []
+    invalid = 0
+    async for result in probe_feeds(pending):
+        if result.source_type:
+            accepted.append(result)
+        else:
+            invalid += 1
+        yield {
+            "event": "probe",
+            "url": result.feed.url,
+            "title": result.feed.title,
+            "source_type": result.source_type,
+            "error": result.error,
+            "done": len(accepted) + invalid,
+            "to_probe": len(pending),
+        }
+
+    imported = await insert_sources(accepted, fetch_interval, enabled)
+    logger.info("OPML import: %d imported, %d invalid, %d already present", imported, invalid, duplicates)
+    yield {"event": "done", "imported": imported, "invalid": invalid, "duplicates": duplicates}
@@ -0,0 +1,77 @@
+"""Shared LLM client and the category list the prompts are built from.
+
+One ``AsyncOpenAI`` client is created per process and reused by the
+summarizer, the Hacker News filter and the weekly review, so every call goes
+through the same pooled, keep-alive HTTP connections instead of a fresh TLS
+handshake per batch. ``openai`` is imported the first time the client is needed.
+
+Categories change rarely but every summarizer batch needs them. They are
+cached here and reloaded after ``invalidate_categories()`` (called by the
+category routes) or after ``CATEGORIES_TTL`` for edits made directly in SQL.
+Prompts put their fixed instructions first and the category list after, so
+the prefix stays byte-identical between calls and provider-side prompt caching
+can reuse it.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from signal_app.config import get_settings
+from signal_app.db import get_pool
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+CATEGORIES_TTL = 600.0
+MAX_CONNECTIONS = 20
+
+_client: "AsyncOpenAI | None" = None
+
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    slug: str
+    name: str
+
+
+_categories: tuple[Category, ...] | None = None
+_categories_loaded_at = 0.0
+
+
+def get_llm_client() -> "AsyncOpenAI":
+    global _client
+    if _client is None:
+        from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient
+
+        # The SDK's own ``Limits`` class: newer releases build on a fork of httpx
+        limits = type(DEFAULT_CONNECTION_LIMITS)(
+            max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS
+        )
+        _client = AsyncOpenAI(api_key=get_settings().openai_api_key, http_client=DefaultAsyncHttpxClient(limits=limits))
+    return _client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+async def get_categories() -> tuple[Category, ...]:
+    """Categories in display order, from the cache when it is fresh."""
+    global _categories, _categories_loaded_at
+    if _categories is None or time.monotonic() - _categories_loaded_at > CATEGORIES_TTL:
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("SELECT name, slug FROM categories ORDER BY sort_order, slug")
+        _categories = tuple(Category(slug=row["slug"], name=row["name"]) for row in rows)
+        _categories_loaded_at = time.monotonic()
+    return _categories
+
+
+def invalidate_categories() -> None:
+    """Drop the cached categories (and the prompts built from them)."""
+    global _categories
+    _categories = None
@@ -14,12 +14,31 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     s = get_settings()
     await db.init_pool(s.database_url)
 
+    from signal_app.fetchers.nitter_health import restore_nitter_health
+    from signal_app.fetchers.youtube_quota import restore_ledger
+
+    await restore_ledger()
+    await restore_nitter_health()
+
     # Start pipeline scheduler
     from signal_app.pipeline.scheduler import start_scheduler, stop_scheduler
 
     await start_scheduler(s.pipeline_cron)
+
+    from signal_app.pipeline.recategorize import resume_recategorization, stop_recategorization
+
+    await resume_recategorization(db.get_pool())
     yield
+    await stop_recategorization()
     await stop_scheduler()
+
+    from signal_app.fetchers.parsing import shutdown_parse_executor
+
+    shutdown_parse_executor()
+
+    from signal_app.llm import close_llm_client
+
+    await close_llm_client()
     await db.close_pool()
 
 
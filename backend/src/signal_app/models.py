@@ -28,8 +28,10 @@ class SourceOut(BaseModel):
     last_fetched_at: str | None = None
     last_error: str | None = None
     error_count: int
+    next_retry_at: str | None = None
     items_today: int = 0
     total_items: int = 0
+    # healthy | warning | error | stale | paused (circuit open) | probing (retry due)
     health: str = "healthy"
 
 
@@ -58,6 +60,8 @@ class ItemOut(BaseModel):
     url: str
     author: str | None = None
     summary: str | None = None
+    # "llm", or "extractive" (a local preview until summarized_at is set, or the no-key fallback)
+    summary_engine: str | None = None
     thumbnail_url: str | None = None
     published_at: str | None = None
     fetched_at: str
@@ -111,6 +115,37 @@ class PipelineRunOut(BaseModel):
     trigger: str
 
 
+class SummaryBatchOut(BaseModel):
+    id: str
+    batch_id: str
+    status: str
+    item_count: int
+    items_summarized: int
+    error: str | None = None
+    created_at: str
+    applied_at: str | None = None
+
+
+class RecategorizeStatus(BaseModel):
+    status: str  # idle, running, completed or failed
+    processed: int = 0
+    categorized: int = 0
+    total: int = 0
+    started_at: str | None = None
+    finished_at: str | None = None
+    error: str | None = None
+
+
+class YouTubeQuotaOut(BaseModel):
+    day: str
+    daily_budget: int
+    used: int
+    remaining: int
+    reserved: int
+    calls: dict[str, int]
+    unit_costs: dict[str, int]
+
+
 class PipelineStatus(BaseModel):
     is_running: bool
     last_run_at: str | None = None
@@ -1,3 +1,13 @@
-from signal_app.pipeline.orchestrator import run_pipeline
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # Lazy so that importing a light submodule (e.g. pipeline.breaker) doesn't load every fetcher
+    if name == "run_pipeline":
+        from signal_app.pipeline.orchestrator import run_pipeline
+
+        return run_pipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["run_pipeline"]
@@ -0,0 +1,218 @@
+"""Summarizing large backlogs through the OpenAI Batch API.
+
+Backfills and catch-up runs don't need summaries within the run. Batch jobs
+cost half as much as chat completions and don't count against the rate
+limits. ``submit_summary_batch`` packs the pending items into requests with
+the same token budgets and prompt as the live summarizer. It writes them to a
+JSONL file, uploads it and creates a job, and records the job in
+``summary_batches``. That row lists which items each request covers, so they
+are not sent again while the job runs.
+
+``poll_summary_batches`` (run at the start of every summarize step, and
+repeatedly after a manual submission) checks unapplied jobs. Finished output
+goes through the normal write path and summary cache. Each job is applied
+once: the row is claimed in the same transaction as the writes. Items missing
+from the output (failed requests, expired or cancelled jobs) become
+unsummarized again and are picked up by the next run.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Sequence
+from typing import Literal
+
+import asyncpg
+
+from signal_app.config import get_settings
+from signal_app.llm import get_llm_client
+from signal_app.pipeline.batching import TokenBatcher, count_tokens
+from signal_app.pipeline.summaries import PendingSummary, apply_results, load_category_ids
+from signal_app.pipeline.summarizer import parse_results, request_params
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT: Literal["/v1/chat/completions"] = "/v1/chat/completions"
+FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def build_requests(
+    pending: Sequence[PendingSummary], system_prompt: str
+) -> tuple[list[str], dict[str, list[PendingSummary]]]:
+    """JSONL lines for the batch input file, and the items each request (by ``custom_id``) covers."""
+    settings = get_settings()
+    batcher = TokenBatcher(
+        system_tokens=count_tokens(system_prompt),
+        prompt_budget=settings.summarize_prompt_tokens,
+        completion_budget=settings.summarize_completion_tokens,
+        target_latency=settings.summarize_target_latency,
+    )
+    lines: list[str] = []
+    requests: dict[str, list[PendingSummary]] = {}
+    sizes = [batcher.item_tokens(group.title, group.content) for group in pending]
+    for n, indices in enumerate(batcher.batches(sizes)):
+        batch = [pending[i] for i in indices]
+        items = [group.as_item(idx) for idx, group in enumerate(batch)]
+        custom_id = f"summaries-{n}"
+        requests[custom_id] = batch
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": ENDPOINT,
+                    "body": request_params(system_prompt, items),
+                }
+            )
+        )
+    return lines, requests
+
+
+async def submit_summary_batch(
+    pool: asyncpg.Pool,
+    pending: Sequence[PendingSummary],
+    system_prompt: str,
+    version: str,
+) -> str | None:
+    """Submit ``pending`` as one Batch API job. Returns the job id, or None if nothing was submitted."""
+    if not get_settings().openai_api_key:
+        logger.warning("No OpenAI API key configured, skipping batch summarization")
+        return None
+
+    lines, requests = build_requests(pending, system_prompt)
+    client = get_llm_client()
+    try:
+        upload = await client.files.create(
+            file=("summaries.jsonl", "\n".join(lines).encode(), "application/jsonl"), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint=ENDPOINT,
+            completion_window="24h",
+            metadata={"source": "signal-summaries"},
+        )
+    except Exception:
+        logger.exception("Submitting summary batch failed")
+        return None
+
+    item_ids = [item_id for group in pending for item_id in group.item_ids]
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """INSERT INTO summary_batches
+                   (batch_id, input_file_id, status, prompt_version, requests, item_ids, item_count)
+               VALUES ($1, $2, $3, $4, $5::jsonb, $6::uuid[], $7)""",
+            batch.id,
+            upload.id,
+            batch.status,
+            version,
+            json.dumps(
+                {
+                    custom_id: [
+                        [group.content_hash, list(group.item_ids), list(group.local_categories)]
+                        for group in batch_groups
+                    ]
+                    for custom_id, batch_groups in requests.items()
+                }
+            ),
+            item_ids,
+            len(item_ids),
+        )
+    logger.info("Submitted summary batch %s: %d items in %d requests", batch.id, len(item_ids), len(requests))
+    return batch.id
+
+
+def _output_results(output: str) -> dict[str, list[dict]]:  # type: ignore[type-arg]
+    """Results by ``custom_id`` from a batch output file; failed or unparseable requests are left out."""
+    results: dict[str, list[dict]] = {}  # type: ignore[type-arg]
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            choice = response["body"]["choices"][0]
+            results[record["custom_id"]] = parse_results(choice["message"]["content"])
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+            logger.warning("Skipping unreadable batch output line: %.200s", line)
+    return results
+
+
+async def _apply_batch(
+    pool: asyncpg.Pool,
+    row: asyncpg.Record,
+    status: str,
+    output: str | None,
+    error: str | None,
+) -> int:
+    requests = row["requests"] if isinstance(row["requests"], dict) else json.loads(row["requests"])
+    results = _output_results(output) if output else {}
+
+    summarized = 0
+    async with pool.acquire() as conn, conn.transaction():
+        claimed = await conn.fetchval(
+            """UPDATE summary_batches SET status = $2, error = $3, applied_at = now()
+               WHERE id = $1 AND applied_at IS NULL RETURNING id""",
+            row["id"],
+            status,
+            error,
+        )
+        if claimed is None:  # Applied by a concurrent poll
+            return 0
+        category_ids = await load_category_ids(conn)
+        for custom_id, groups in requests.items():
+            if custom_id not in results:
+                continue
+            # Jobs submitted before local categorization have no third element
+            batch = [
+                PendingSummary(key, tuple(item_ids), "", "", tuple(tuple(pair) for pair in (local[0] if local else ())))
+                for key, item_ids, *local in groups
+            ]
+            summarized += await apply_results(conn, batch, results[custom_id], category_ids, row["prompt_version"])
+        await conn.execute("UPDATE summary_batches SET items_summarized = $2 WHERE id = $1", row["id"], summarized)
+    return summarized
+
+
+async def poll_summary_batches(pool: asyncpg.Pool) -> int:
+    """Apply every finished, unapplied job. Returns the number of items summarized."""
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT id, batch_id, prompt_version, requests FROM summary_batches WHERE applied_at IS NULL"
+        )
+    if not rows:
+        return 0
+
+    client = get_llm_client()
+    summarized = 0
+    for row in rows:
+        try:
+            batch = await client.batches.retrieve(row["batch_id"])
+            if batch.status not in FINAL_STATUSES:
+                async with pool.acquire() as conn:
+                    await conn.execute("UPDATE summary_batches SET status = $2 WHERE id = $1", row["id"], batch.status)
+                continue
+
+            # Expired and cancelled jobs still have output for the requests that finished
+            output = (await client.files.content(batch.output_file_id)).text if batch.output_file_id else None
+            errors = batch.errors.data if batch.errors and batch.errors.data else []
+            error = "; ".join(e.message or e.code or "" for e in errors) or None
+            count = await _apply_batch(pool, row, batch.status, output, error)
+        except Exception:
+            logger.exception("Polling summary batch %s failed", row["batch_id"])
+            continue
+        logger.info("Summary batch %s %s: %d items summarized", row["batch_id"], batch.status, count)
+        summarized += count
+    return summarized
+
+
+async def wait_for_summary_batches(pool: asyncpg.Pool, interval: float) -> int:
+    """Poll every ``interval`` seconds until no job is left unapplied. Returns the items summarized."""
+    summarized = 0
+    while True:
+        summarized += await poll_summary_batches(pool)
+        async with pool.acquire() as conn:
+            waiting = await conn.fetchval("SELECT count(*) FROM summary_batches WHERE applied_at IS NULL")
+        if not waiting:
+            return summarized
+        await asyncio.sleep(interval)
@@ -0,0 +1,130 @@
+"""Token-aware batching of items for the summarizer.
+
+A fixed number of items per request either wastes the context on short items
+or, with long titles and many categories, overflows it. ``TokenBatcher`` packs
+items until the prompt reaches ``SUMMARIZE_PROMPT_TOKENS``. It also reserves
+room in ``SUMMARIZE_COMPLETION_TOKENS`` for the JSON each item produces, so the
+response is not cut off mid-object.
+
+Two observations tune later batches of the same run. The expected output per
+item follows the completion tokens actually used. A truncated or unparseable
+response halves the batch size, and calls slower than the target latency
+shrink it. Fast, clean calls let it grow back by one item at a time.
+
+Tokens are counted with tiktoken's encoding for the configured model. If the
+encoding can't be loaded (it is downloaded once, and may be missing offline),
+a conservative characters-per-token estimate is used instead.
+"""
+
+import asyncio
+import functools
+import logging
+import math
+from collections.abc import Callable, Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from signal_app.config import get_settings
+
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 3.5  # Underestimates English (~4), so the fallback errs towards smaller batches
+ITEM_OVERHEAD_TOKENS = 12  # "[Item n]", "Title:", "Content:" and the separator
+MAX_BATCH_ITEMS = 50
+OUTPUT_TOKENS_PER_ITEM = 120  # Starting guess: 2-3 sentences plus the JSON around them
+OUTPUT_MARGIN = 1.25
+
+
+@functools.cache
+def _encoding(model: str) -> "tiktoken.Encoding | None":
+    import tiktoken
+
+    try:
+        name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        name = "o200k_base"  # Unknown (newer) model: the encoding of current OpenAI models
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as exc:
+        logger.warning("Tokenizer for %s unavailable (%s), estimating tokens from length", model, exc)
+        return None
+
+
+async def load_tokenizer() -> None:
+    """Load the tokenizer off the event loop (the first load may download the encoding)."""
+    await asyncio.to_thread(_encoding, get_settings().openai_model)
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding(get_settings().openai_model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """``text`` cut to at most ``max_tokens`` tokens."""
+    encoding = _encoding(get_settings().openai_model)
+    if encoding is None:
+        return text[: int(max_tokens * CHARS_PER_TOKEN)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+class TokenBatcher:
+    def __init__(
+        self,
+        system_tokens: int,
+        prompt_budget: int,
+        completion_budget: int,
+        target_latency: float,
+        count: Callable[[str], int] = count_tokens,
+    ) -> None:
+        self.system_tokens = system_tokens
+        self.prompt_budget = prompt_budget
+        self.completion_budget = completion_budget
+        self.target_latency = target_latency
+        self.count = count
+        self.output_per_item = float(OUTPUT_TOKENS_PER_ITEM)
+        self.max_items = MAX_BATCH_ITEMS
+
+    def item_tokens(self, title: str, content: str) -> int:
+        return self.count(title) + self.count(content) + ITEM_OVERHEAD_TOKENS
+
+    def capacity(self) -> int:
+        """Items whose output fits the completion budget, within the current size limit."""
+        by_output = int(self.completion_budget / (self.output_per_item * OUTPUT_MARGIN))
+        return max(1, min(self.max_items, by_output))
+
+    def batches(self, sizes: Sequence[int]) -> Iterator[list[int]]:
+        """Group item indices (with token ``sizes``) into batches, in order.
+
+        Lazy: each batch is sized with whatever ``observe`` has learned from the previous ones.
+        An item too large for the prompt budget on its own still gets a batch of its own.
+        """
+        start = 0
+        while start < len(sizes):
+            limit = self.capacity()
+            tokens = self.system_tokens + sizes[start]
+            end = start + 1
+            while end < len(sizes) and end - start < limit and tokens + sizes[end] <= self.prompt_budget:
+                tokens += sizes[end]
+                end += 1
+            yield list(range(start, end))
+            start = end
+
+    def observe(self, items: int, latency: float, completion_tokens: int | None, truncated: bool) -> None:
+        """Adjust later batches to how a request of ``items`` items went."""
+        if completion_tokens and items and not truncated:
+            # Moving average, so one terse batch doesn't shrink the reservation much
+            self.output_per_item = 0.7 * self.output_per_item + 0.3 * (completion_tokens / items)
+        if truncated:
+            self.max_items = max(1, min(self.max_items, items) // 2)
+            logger.info("Summarizer response truncated, batches now at most %d items", self.max_items)
+        elif latency > self.target_latency:
+            self.max_items = max(1, int(min(self.max_items, items) * 0.75))
+            logger.info("Summarizer took %.1fs, batches now at most %d items", latency, self.max_items)
+        elif latency < self.target_latency / 2 and items >= self.max_items:
+            self.max_items = min(MAX_BATCH_ITEMS, self.max_items + 1)
@@ -0,0 +1,38 @@
+"""Circuit breaker for persistently failing sources.
+
+``sources.error_count`` counts consecutive failures. Once it reaches
+``FAILURE_THRESHOLD`` the circuit opens: the source is skipped until
+``sources.next_retry_at``, which backs off exponentially (with jitter, so
+sources that broke together don't all come back in the same run). When the
+retry time passes the circuit is half-open and the next run fetches the source
+once as a probe: success closes the circuit, failure re-opens it with a longer
+delay.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = timedelta(hours=1)
+MAX_BACKOFF = timedelta(days=7)
+
+
+def next_retry_at(error_count: int, now: datetime) -> datetime | None:
+    """When a source with ``error_count`` consecutive failures may be fetched again.
+
+    None while the circuit is closed (below the threshold).
+    """
+    if error_count < FAILURE_THRESHOLD:
+        return None
+    # Cap the exponent: a long-dead source would otherwise overflow timedelta
+    doublings = min(error_count - FAILURE_THRESHOLD, 16)
+    backoff: timedelta = min(BASE_BACKOFF * 2**doublings, MAX_BACKOFF)
+    # Equal jitter: at least half the backoff, at most all of it
+    return now + backoff * random.uniform(0.5, 1.0)
+
+
+def circuit_state(error_count: int, retry_at: datetime | None, now: datetime) -> str:
+    """``closed``, ``open`` (skipped until ``retry_at``) or ``half_open`` (next fetch is a probe)."""
+    if error_count < FAILURE_THRESHOLD or retry_at is None:
+        return "closed"
+    return "open" if retry_at > now else "half_open"
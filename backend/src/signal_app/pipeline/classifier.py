@@ -0,0 +1,277 @@
+"""Local category classifier, trained on past ``item_categories``.
+
+Each item is a hashed TF-IDF vector of its title and text: words and word
+pairs hashed into ``DIMENSIONS`` buckets, with no vocabulary to maintain. Each
+category is the centroid of its examples, and an item scores each category by
+cosine similarity. A softmax over those scores gives the confidence. Above
+``CLASSIFIER_THRESHOLD`` the item gets the classifier's categories and the LLM
+is told not to categorize it. Below it, the LLM categorizes as before.
+
+Training is incremental. The model keeps running sums per category and
+document frequencies, so new labels are added without revisiting old ones.
+The LLM's labels teach it. Manual corrections (``is_auto = false``) count
+``MANUAL_WEIGHT`` times, and the classifier's own labels are never used. The
+model is stored in ``classifier_state`` with a keyset watermark over
+``item_categories``. Each run adds the labels written since; once a week it is
+rebuilt from scratch, dropping labels that were since removed, and right
+after a re-categorization job rewrote them. A small,
+deterministic sample of confident items still goes to the LLM, so new
+categories and drift keep producing training labels.
+"""
+
+import asyncio
+import io
+import itertools
+import json
+import logging
+import re
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+import numpy as np
+
+from signal_app.pipeline.extractive import STOPWORDS, plain_text
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = 2**16
+MANUAL_WEIGHT = 3.0
+MIN_EXAMPLES = 20  # Categories with less example weight are never predicted
+MIN_SIMILARITY = 0.05
+TEMPERATURE = 0.05  # Softmax over cosine similarities; lower is more decisive
+SECONDARY_SHARE = 0.3  # Confidence a second or third category needs to be assigned too
+MAX_CATEGORIES = 3
+EXPLORE_PERCENT = 5  # Confident items still sent to the LLM for categorization
+TEXT_CHARS = 2000
+RETRAIN_AFTER = timedelta(days=7)
+TRAIN_CHUNK = 2000
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_START = {"labeled_at": "-infinity", "item_id": "00000000-0000-0000-0000-000000000000", "category_id": None}
+
+
+def features(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Hashed bucket indices and L2-normalized log term frequencies of ``text``."""
+    words = [w for w in _WORD_RE.findall(plain_text(text[:TEXT_CHARS]).lower()) if w not in STOPWORDS]
+    tokens = words + [f"{a} {b}" for a, b in itertools.pairwise(words)]
+    counts = Counter(zlib.crc32(token.encode()) % DIMENSIONS for token in tokens)
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    norm = np.linalg.norm(values)
+    return indices, values / norm if norm else values
+
+
+def sampled_for_llm(content_hash: str) -> bool:
+    """Whether a confident item is categorized by the LLM anyway (stable per content)."""
+    return int(content_hash[:8], 16) % 100 < EXPLORE_PERCENT
+
+
+@dataclass(frozen=True, slots=True)
+class Prediction:
+    categories: tuple[tuple[str, float], ...] = ()  # (category_id, confidence), best first
+    confident: bool = False
+
+
+class CentroidClassifier:
+    def __init__(self) -> None:
+        self.category_ids: list[str] = []
+        self.sums = np.zeros((0, DIMENSIONS), dtype=np.float32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.df = np.zeros(DIMENSIONS, dtype=np.float32)
+        self.documents = 0
+        self._centroids: tuple[np.ndarray, np.ndarray] | None = None
+
+    def _row(self, category_id: str) -> int:
+        if category_id not in self.category_ids:
+            self.category_ids.append(category_id)
+            self.sums = np.vstack([self.sums, np.zeros((1, DIMENSIONS), dtype=np.float32)])
+            self.weights = np.append(self.weights, np.float32(0))
+        return self.category_ids.index(category_id)
+
+    def learn(self, text: str, category_ids: Iterable[str], weight: float = 1.0) -> None:
+        indices, values = features(text)
+        self.documents += 1
+        self.df[indices] += 1
+        for category_id in category_ids:
+            row = self._row(category_id)
+            self.sums[row, indices] += weight * values
+            self.weights[row] += weight
+        self._centroids = None
+
+    def keep_categories(self, category_ids: Iterable[str]) -> None:
+        """Forget categories that no longer exist."""
+        keep = [i for i, category_id in enumerate(self.category_ids) if category_id in set(category_ids)]
+        if len(keep) < len(self.category_ids):
+            self.category_ids = [self.category_ids[i] for i in keep]
+            self.sums, self.weights = self.sums[keep], self.weights[keep]
+            self._centroids = None
+
+    def covers(self, category_ids: Iterable[str]) -> bool:
+        """Whether every one of ``category_ids`` has enough examples to be predicted."""
+        trained = {self.category_ids[i] for i in np.flatnonzero(self.weights >= MIN_EXAMPLES)}
+        return set(category_ids) <= trained
+
+    def _idf(self) -> np.ndarray:
+        return np.log((1 + self.documents) / (1 + self.df)) + 1
+
+    def predict(self, texts: Sequence[str], threshold: float) -> list[Prediction]:
+        """Categories for each text; ``confident`` when the best reaches ``threshold``."""
+        if self._centroids is None:
+            trained = np.flatnonzero(self.weights >= MIN_EXAMPLES)
+            centroids = self.sums[trained] * self._idf()
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            self._centroids = (trained, centroids / np.where(norms > 0, norms, 1.0))
+        trained, centroids = self._centroids
+        if len(trained) < 2:
+            return [Prediction() for _ in texts]
+
+        idf = self._idf()
+        predictions = []
+        for text in texts:
+            indices, values = features(text)
+            if not len(indices):
+                predictions.append(Prediction())
+                continue
+            vector = values * idf[indices]
+            similarities = centroids[:, indices] @ (vector / np.linalg.norm(vector))
+            scaled = np.exp((similarities - similarities.max()) / TEMPERATURE)
+            confidences = scaled / scaled.sum()
+            order = np.argsort(-confidences, kind="stable")[:MAX_CATEGORIES]
+            best = order[0]
+            predictions.append(
+                Prediction(
+                    categories=tuple(
+                        (self.category_ids[trained[i]], round(float(confidences[i]), 3))
+                        for i in order
+                        if i == best or confidences[i] >= SECONDARY_SHARE
+                    ),
+                    confident=bool(confidences[best] >= threshold and similarities[best] >= MIN_SIMILARITY),
+                )
+            )
+        return predictions
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            category_ids=np.array(self.category_ids, dtype=str),
+            sums=self.sums,
+            weights=self.weights,
+            df=self.df,
+            documents=np.array(self.documents),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CentroidClassifier":
+        arrays = np.load(io.BytesIO(data))
+        classifier = cls()
+        classifier.category_ids = [str(category_id) for category_id in arrays["category_ids"]]
+        classifier.sums = arrays["sums"].reshape(len(classifier.category_ids), DIMENSIONS)
+        classifier.weights, classifier.df = arrays["weights"], arrays["df"]
+        classifier.documents = int(arrays["documents"])
+        return classifier
+
+
+_classifier: CentroidClassifier | None = None
+
+
+def get_classifier() -> CentroidClassifier | None:
+    """The model trained by the last ``refresh_classifier``, if any."""
+    return _classifier
+
+
+async def reset_classifier(pool: asyncpg.Pool) -> None:
+    """Drop the model, so the next refresh rebuilds it from the labels as they are now.
+
+    Needed after labels were rewritten in bulk: incremental training would learn them a second time.
+    """
+    global _classifier
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM classifier_state")
+    _classifier = None
+
+
+def _learn_rows(classifier: CentroidClassifier, rows: Sequence[asyncpg.Record]) -> None:
+    # Rows are ordered by label time; an item's labels from one write arrive together
+    i = 0
+    while i < len(rows):
+        j = i
+        while j + 1 < len(rows) and (rows[j + 1]["item_id"], rows[j + 1]["is_auto"]) == (
+            rows[i]["item_id"],
+            rows[i]["is_auto"],
+        ):
+            j += 1
+        text = f"{rows[i]['title']}\n{rows[i]['content'] or ''}"
+        weight = 1.0 if rows[i]["is_auto"] else MANUAL_WEIGHT
+        classifier.learn(text, [str(row["category_id"]) for row in rows[i : j + 1]], weight)
+        i = j + 1
+
+
+async def refresh_classifier(pool: asyncpg.Pool) -> CentroidClassifier:
+    """Bring the model up to date with ``item_categories`` and store it. Returns the model."""
+    global _classifier
+    async with pool.acquire() as conn:
+        state = await conn.fetchrow("SELECT model, watermark, trained_at FROM classifier_state")
+        category_ids = [str(row["id"]) for row in await conn.fetch("SELECT id FROM categories")]
+
+    now = datetime.now(UTC)
+    if state is None or now - state["trained_at"] > RETRAIN_AFTER:
+        classifier, watermark, trained_at = CentroidClassifier(), dict(_START), now
+    else:
+        classifier = _classifier if _classifier is not None else CentroidClassifier.from_bytes(state["model"])
+        watermark = state["watermark"] if isinstance(state["watermark"], dict) else json.loads(state["watermark"])
+        trained_at = state["trained_at"]
+
+    learned = 0
+    while True:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """SELECT ic.item_id, ic.category_id, ic.is_auto, ic.labeled_at, i.title,
+                          left(i.content_raw, $5) AS content
+                   FROM item_categories ic JOIN items i ON i.id = ic.item_id
+                   WHERE ic.labeler <> 'classifier'
+                     AND (ic.labeled_at, ic.item_id, ic.category_id)
+                         > ($1::timestamptz, $2::uuid, coalesce($3::uuid, '00000000-0000-0000-0000-000000000000'))
+                   ORDER BY ic.labeled_at, ic.item_id, ic.category_id
+                   LIMIT $4""",
+                watermark["labeled_at"],
+                watermark["item_id"],
+                watermark["category_id"],
+                TRAIN_CHUNK,
+                TEXT_CHARS,
+            )
+        if not rows:
+            break
+        await asyncio.to_thread(_learn_rows, classifier, rows)
+        learned += len(rows)
+        last = rows[-1]
+        watermark = {
+            "labeled_at": last["labeled_at"].isoformat(),
+            "item_id": str(last["item_id"]),
+            "category_id": str(last["category_id"]),
+        }
+        if len(rows) < TRAIN_CHUNK:
+            break
+
+    classifier.keep_categories(category_ids)
+    if learned or state is None:
+        model = await asyncio.to_thread(classifier.to_bytes)
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """INSERT INTO classifier_state (id, model, watermark, trained_at, updated_at)
+                   VALUES (true, $1, $2::jsonb, $3, now())
+                   ON CONFLICT (id) DO UPDATE
+                   SET model = EXCLUDED.model, watermark = EXCLUDED.watermark,
+                       trained_at = EXCLUDED.trained_at, updated_at = now()""",
+                model,
+                json.dumps(watermark),
+                trained_at,
+            )
+        logger.info("Classifier learned %d labels (%d categories)", learned, len(classifier.category_ids))
+    _classifier = classifier
+    return classifier
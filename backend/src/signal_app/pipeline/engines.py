@@ -0,0 +1,86 @@
+"""Summarizer engines: what turns a batch of items into summaries.
+
+``LLMEngine`` is the OpenAI summarizer: summaries plus categories, seconds per
+batch. ``ExtractiveEngine`` picks each item's most central sentences with
+TextRank (``extractive.py``): no key, no categories, milliseconds per batch.
+
+``SUMMARY_ENGINE`` chooses the engine. With ``auto`` (the default) the LLM is
+used when an OpenAI key is configured, and the extractive engine otherwise, so
+items no longer stay unsummarized without a key. With the LLM engine,
+``SUMMARY_PREVIEW`` first gives new items an extractive summary. It shows until
+the LLM summary replaces it, which can be a day later in Batch API mode.
+"""
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from signal_app.config import get_settings
+from signal_app.fetchers.parsing import run_parser
+from signal_app.pipeline.extractive import extractive_summaries
+from signal_app.pipeline.summaries import prompt_version
+from signal_app.pipeline.summarizer import summarize_items
+
+if TYPE_CHECKING:
+    from signal_app.pipeline.batching import TokenBatcher
+
+EXTRACTIVE_VERSION = "textrank-1"
+
+
+class SummarizerEngine(ABC):
+    name: ClassVar[str]
+
+    @abstractmethod
+    def version(self, system_prompt: str) -> str:
+        """Version of this engine's output, for the summary cache."""
+
+    @abstractmethod
+    async def summarize(
+        self, items: list[dict[str, str | int]], batcher: "TokenBatcher | None" = None
+    ) -> list[dict[str, Any]]:
+        """Results for ``items`` (dicts with "index", "title" and "content"), as ``summarize_items`` returns them."""
+
+
+class LLMEngine(SummarizerEngine):
+    name = "llm"
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def version(self, system_prompt: str) -> str:
+        return prompt_version(self.model, system_prompt)
+
+    async def summarize(
+        self, items: list[dict[str, str | int]], batcher: "TokenBatcher | None" = None
+    ) -> list[dict[str, Any]]:
+        return await summarize_items(items, batcher)
+
+
+class ExtractiveEngine(SummarizerEngine):
+    name = "extractive"
+
+    def version(self, system_prompt: str) -> str:
+        # Categories are not assigned, so the prompt doesn't matter
+        return prompt_version(EXTRACTIVE_VERSION, "")
+
+    async def summarize(
+        self, items: list[dict[str, str | int]], batcher: "TokenBatcher | None" = None
+    ) -> list[dict[str, Any]]:
+        summaries = await run_parser(extractive_summaries, [str(item["content"]) for item in items])
+        return [
+            {"index": item["index"], "summary": summary, "categories": [], "confidence": []}
+            for item, summary in zip(items, summaries, strict=True)
+            if summary
+        ]
+
+
+def get_summary_engine(name: str | None = None) -> SummarizerEngine:
+    """The engine called ``name`` (default ``SUMMARY_ENGINE``); ``auto`` picks the LLM when a key is set."""
+    settings = get_settings()
+    name = name or settings.summary_engine
+    if name == "auto":
+        name = LLMEngine.name if settings.openai_api_key else ExtractiveEngine.name
+    if name == LLMEngine.name:
+        return LLMEngine(settings.openai_model)
+    if name == ExtractiveEngine.name:
+        return ExtractiveEngine()
+    raise ValueError(f"Unknown summary engine: {name!r}")
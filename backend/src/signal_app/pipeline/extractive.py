@@ -0,0 +1,104 @@
+"""Extractive summaries: the most central sentences of an item's text (TextRank).
+
+Sentences are nodes and the edge between two sentences is their word overlap,
+normalized by their lengths, as in the original TextRank. Centrality is
+PageRank over that graph. The whole graph is one NumPy matrix product, so a
+long article ranks in well under a millisecond. Only the lead of a text is
+cleaned and split (``MAX_INPUT_CHARS``): ranking stops at ``MAX_CANDIDATES``
+sentences anyway, and on long articles the regexes over the rest would cost
+more than the ranking. The top sentences are returned in their original order,
+up to ``MAX_SENTENCES`` and ``MAX_CHARS``.
+
+Everything here is pure and picklable, so it can run on the parse pool.
+"""
+
+import html
+import re
+
+import numpy as np
+
+MAX_SENTENCES = 2
+MAX_CHARS = 400
+MAX_CANDIDATES = 40  # Sentences ranked per text; the lead of an article carries its substance
+MAX_INPUT_CHARS = 12_000  # Raw characters read per text: MAX_CANDIDATES sentences with room for markup
+MIN_SENTENCE_WORDS = 4
+DAMPING = 0.85
+ITERATIONS = 50
+TOLERANCE = 1e-6
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+# A sentence ends at . ! or ? (and any closing quote) before the capital or digit starting the next
+_SENTENCE_RE = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"'\u201d\u2019)]))\s+(?=[\"'\u201c\u2018(]*[A-Z0-9])")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'-]+")
+
+# Common English function words: sharing them doesn't make two sentences related
+_STOPWORD_TEXT = """
+a about after all also an and any are as at be been but by can could did do does for from had has have he her his
+how i if in into is it its just more most new no not now of on one only or other our out over she so some than that
+the their them then there these they this to up was we were what when which who will with would you your
+"""
+STOPWORDS = frozenset(_STOPWORD_TEXT.split())
+
+
+def plain_text(text: str) -> str:
+    """``text`` without markup, entities or repeated whitespace."""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence.strip()]
+
+
+def rank_sentences(sentences: list[str]) -> np.ndarray:
+    """TextRank score of each sentence (summing to 1)."""
+    n = len(sentences)
+    words = [{w for w in _WORD_RE.findall(s.lower()) if w not in STOPWORDS} for s in sentences]
+    vocabulary = {w: i for i, w in enumerate(set().union(*words))}
+    if n < 2 or not vocabulary:
+        return np.full(n, 1.0 / max(n, 1))
+
+    # Binary sentence-term matrix; overlaps for every pair in one product
+    terms = np.zeros((n, len(vocabulary)), dtype=np.float32)
+    for row, sentence_words in enumerate(words):
+        terms[row, [vocabulary[w] for w in sentence_words]] = 1.0
+    overlap = terms @ terms.T
+    log_lengths = np.log(np.maximum(terms.sum(axis=1), 2.0))
+    weights = overlap / (log_lengths[:, None] + log_lengths[None, :])
+    np.fill_diagonal(weights, 0.0)
+
+    # Row-normalized transitions; a sentence sharing no words links to every sentence
+    out = weights.sum(axis=1, keepdims=True)
+    transitions = np.where(out > 0, weights / np.where(out > 0, out, 1.0), 1.0 / n)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(ITERATIONS):
+        updated: np.ndarray = (1 - DAMPING) / n + DAMPING * (transitions.T @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def extractive_summary(text: str) -> str:
+    """The highest-ranked sentences of ``text`` in reading order, or its start if it has few sentences."""
+    cut = len(text) > MAX_INPUT_CHARS
+    text = plain_text(text[:MAX_INPUT_CHARS])
+    sentences = split_sentences(text)
+    if cut and len(sentences) > 1:
+        sentences.pop()  # Ends mid-sentence
+    sentences = [s for s in sentences[:MAX_CANDIDATES] if len(s.split()) >= MIN_SENTENCE_WORDS]
+    if len(sentences) <= MAX_SENTENCES:
+        summary = " ".join(sentences) or text
+    else:
+        scores = rank_sentences(sentences)
+        # Stable sort: equal scores favour the earlier sentence
+        top = sorted(np.argsort(-scores, kind="stable")[:MAX_SENTENCES].tolist())
+        summary = " ".join(sentences[i] for i in top)
+    if len(summary) > MAX_CHARS:
+        summary = summary[:MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return summary
+
+
+def extractive_summaries(texts: list[str]) -> list[str]:
+    """``extractive_summary`` of each text; one call per batch keeps pool overhead low."""
+    return [extractive_summary(text) for text in texts]
@@ -0,0 +1,211 @@
+"""Full-article extraction for items whose feed gives little or no text.
+
+Many fetchers only have a title and a teaser (Hacker News has no content at
+all), so the summarizer would otherwise work from the headline. Before
+summarizing, the pipeline downloads the linked pages of such items, at most
+``EXTRACT_CONCURRENCY`` at a time and within the usual per-host limits. Their
+main text is extracted on the parse pool with a readability-style heuristic:
+the block with the most paragraph text and the fewest links wins.
+
+Results are cached in ``article_cache`` by canonical URL (tracking parameters
+and fragments stripped), so an article reached through several sources or runs
+is downloaded once. Failures are cached too and retried after ``RETRY_FAILED_AFTER``.
+"""
+
+import asyncio
+import logging
+import re
+from collections.abc import Sequence
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from bs4 import BeautifulSoup, Tag
+
+from signal_app.config import get_settings
+from signal_app.db import get_pool
+from signal_app.fetchers.parsing import run_parser
+from signal_app.fetchers.ratelimit import http_client
+
+logger = logging.getLogger(__name__)
+
+# Items with at least this much feed text are summarized from it as is
+MIN_CONTENT_CHARS = 500
+MAX_ARTICLE_CHARS = 20_000
+RETRY_FAILED_AFTER = timedelta(days=1)
+
+# Links to these hosts are discussions, videos or abstracts, not articles worth extracting
+SKIP_HOSTS = (
+    "news.ycombinator.com",
+    "reddit.com",
+    "redd.it",
+    "youtube.com",
+    "youtu.be",
+    "twitter.com",
+    "x.com",
+    "bsky.app",
+    "github.com",
+    "arxiv.org",
+)
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "source", "igshid"})
+
+_NOISE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg", "button"]
+_NOISE_HINT_RE = re.compile(r"comment|sidebar|footer|share|social|related|promo|newsletter|cookie|advert", re.I)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def canonical_url(url: str) -> str:
+    """``url`` with a lowercased host, no fragment, no tracking parameters and no trailing slash."""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def needs_extraction(url: str, content: str | None) -> bool:
+    if content and len(content) >= MIN_CONTENT_CHARS:
+        return False
+    host = (urlsplit(url).hostname or "").lower()
+    if not host or any(host == skip or host.endswith(f".{skip}") for skip in SKIP_HOSTS):
+        return False
+    return url.startswith(("http://", "https://"))
+
+
+def extract_main_text(html: bytes | str) -> str | None:
+    """Main text of an HTML page, or None if no block of prose was found.
+
+    Runs on the parse pool, so it must stay module-level and picklable.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(class_=_NOISE_HINT_RE):
+        if tag.name not in ("body", "html", "article", "main"):
+            tag.decompose()
+
+    # Score each paragraph's container by its prose, like readability: longer, comma-rich
+    # paragraphs count more, and the grandparent gets half so wrapper divs can win too
+    scores: dict[int, float] = {}
+    nodes: dict[int, Tag] = {}
+    for paragraph in soup.find_all(["p", "pre", "blockquote"]):
+        text = paragraph.get_text(" ", strip=True)
+        if len(text) < 40:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = paragraph.parent
+        grandparent = parent.parent if parent is not None else None
+        for node, weight in ((parent, 1.0), (grandparent, 0.5)):
+            if node is None:
+                continue
+            nodes[id(node)] = node
+            scores[id(node)] = scores.get(id(node), 0.0) + score * weight
+
+    best: Tag | None = None
+    best_score = 0.0
+    for key, score in scores.items():
+        node = nodes[key]
+        text_length = len(node.get_text(" ", strip=True)) or 1
+        link_length = sum(len(a.get_text(" ", strip=True)) for a in node.find_all("a"))
+        adjusted = score * (1 - link_length / text_length)
+        if adjusted > best_score:
+            best, best_score = node, adjusted
+    if best is None:
+        return None
+
+    paragraphs = [
+        _WHITESPACE_RE.sub(" ", block.get_text(" ", strip=True))
+        for block in best.find_all(["p", "pre", "blockquote", "li", "h2", "h3"])
+    ]
+    text = "\n\n".join(p for p in paragraphs if p)[:MAX_ARTICLE_CHARS]
+    return text or None
+
+
+async def _download_article(client: httpx.AsyncClient, url: str, max_bytes: int) -> bytes | None:
+    """The page body, capped at ``max_bytes``; None for non-HTML responses."""
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "text/html"):
+            return None
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+    return b"".join(chunks)[:max_bytes]
+
+
+async def _extract(client: httpx.AsyncClient, url: str, max_bytes: int) -> tuple[str | None, str | None]:
+    """``(text, error)`` for one article. Never raises: one bad page must not sink the others."""
+    try:
+        body = await _download_article(client, url, max_bytes)
+        if body is None:
+            return None, "Not an HTML page"
+        text = await run_parser(extract_main_text, body)
+    except httpx.HTTPStatusError as exc:
+        return None, f"HTTP {exc.response.status_code}"
+    except httpx.HTTPError as exc:
+        return None, type(exc).__name__
+    except Exception as exc:
+        logger.warning("Extracting %s failed: %r", url, exc)
+        return None, type(exc).__name__
+    return (text, None) if text else (None, "No article text found")
+
+
+async def extract_articles(items: Sequence[tuple[str, str, str | None]]) -> dict[str, str]:
+    """Article text for the items worth extracting, keyed by item id.
+
+    ``items`` are ``(id, url, content_raw)`` tuples. Cached articles are reused;
+    the rest are downloaded, extracted and cached.
+    """
+    settings = get_settings()
+    wanted = {item_id: canonical_url(url) for item_id, url, content in items if needs_extraction(url, content)}
+    if not wanted:
+        return {}
+
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """SELECT canonical_url, content FROM article_cache
+               WHERE canonical_url = ANY($1::text[])
+                 AND (content IS NOT NULL OR extracted_at > now() - $2::interval)""",
+            list(set(wanted.values())),
+            RETRY_FAILED_AFTER,
+        )
+    articles: dict[str, str | None] = {row["canonical_url"]: row["content"] for row in rows}
+    missing = sorted(set(wanted.values()) - articles.keys())
+
+    if missing:
+        semaphore = asyncio.Semaphore(max(1, settings.extract_concurrency))
+
+        async def extract(url: str) -> tuple[str, str | None, str | None]:
+            async with semaphore:
+                return url, *await _extract(client, url, settings.article_max_bytes)
+
+        async with http_client(timeout=20, follow_redirects=True) as client:
+            results = await asyncio.gather(*(extract(url) for url in missing))
+
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """INSERT INTO article_cache (canonical_url, content, error)
+                   SELECT * FROM unnest($1::text[], $2::text[], $3::text[])
+                   ON CONFLICT (canonical_url) DO UPDATE
+                   SET content = EXCLUDED.content, error = EXCLUDED.error, extracted_at = now()""",
+                [url for url, _, _ in results],
+                [text for _, text, _ in results],
+                [error for _, _, error in results],
+            )
+        articles.update((url, text) for url, text, _ in results)
+        logger.info(
+            "Extracted %d/%d articles (%d from cache)",
+            sum(1 for _, text, _ in results if text),
+            len(missing),
+            len(articles) - len(results),
+        )
+
+    return {item_id: text for item_id, url in wanted.items() if (text := articles.get(url))}
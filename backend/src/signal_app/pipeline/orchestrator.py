@@ -1,16 +1,53 @@
 import asyncio
+import contextlib
 import json
 import logging
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
+import asyncpg
+
+from signal_app.config import get_settings
 from signal_app.db import get_pool
 from signal_app.fetchers import get_fetcher
-from signal_app.fetchers.base import RawItem
+from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.nitter_health import persist_nitter_health
+from signal_app.fetchers.parsing import run_parser
+from signal_app.fetchers.ratelimit import HostPausedError, fetch_timeout
+from signal_app.fetchers.youtube import reserve_channel_quota
+from signal_app.fetchers.youtube_quota import get_ledger, persist_ledger
+from signal_app.llm import get_categories
+from signal_app.pipeline.batch_api import poll_summary_batches, submit_summary_batch
+from signal_app.pipeline.batching import TokenBatcher, count_tokens, load_tokenizer, truncate_tokens
+from signal_app.pipeline.breaker import circuit_state, next_retry_at
+from signal_app.pipeline.classifier import get_classifier, refresh_classifier, sampled_for_llm
 from signal_app.pipeline.dedup import deduplicate
-from signal_app.pipeline.summarizer import summarize_items
+from signal_app.pipeline.engines import LLMEngine, SummarizerEngine, get_summary_engine
+from signal_app.pipeline.extractive import extractive_summaries
+from signal_app.pipeline.extractor import extract_articles
+from signal_app.pipeline.summaries import (
+    PendingSummary,
+    apply_categories,
+    apply_results,
+    apply_summary,
+    content_hash,
+    load_category_ids,
+    lookup_cached,
+    store_previews,
+)
+from signal_app.pipeline.summarizer import build_system_prompt
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
 
 logger = logging.getLogger(__name__)
 
-SUMMARIZE_BATCH_SIZE = 10
+FETCH_TIMEOUT = 60
+# A batched fetch gets one FETCH_TIMEOUT per this many sources it covers
+BATCH_TIMEOUT_SOURCES = 10
 
 
 async def run_pipeline(trigger: str = "manual") -> str:
@@ -33,152 +70,106 @@ async def run_pipeline(trigger: str = "manual") -> str:
     errors: list[dict[str, str]] = []
 
     try:
-        # 2. Get all enabled sources
+        # 2. Get all enabled sources, minus those whose circuit breaker is open
         async with pool.acquire() as conn:
             sources = await conn.fetch("SELECT * FROM sources WHERE enabled = true")
 
-        # 3. Fetch from all sources in parallel
-        fetch_tasks = []
+        now = datetime.now(tz=UTC)
+        states = {str(s["id"]): circuit_state(s["error_count"], s["next_retry_at"], now) for s in sources}
+        skipped = sum(1 for state in states.values() if state == "open")
+        if skipped:
+            logger.info("Skipping %d failing sources until their next retry", skipped)
+
+        # 3. Build a fetcher per source
+        fetched_sources = []
+        fetchers = []
         for source in sources:
+            if states[str(source["id"])] == "open":
+                continue
             source_id = str(source["id"])
             source_type = source["source_type"]
             config = source["config"] if isinstance(source["config"], dict) else json.loads(source["config"])
+            state = source["fetch_state"]
+            if not isinstance(state, dict):
+                state = json.loads(state) if state else {}
 
-            fetcher = get_fetcher(source_type, source_id, config)
+            fetcher = get_fetcher(source_type, source_id, config, state)
             if fetcher is None:
                 logger.warning("No fetcher for source type: %s", source_type)
                 continue
 
-            fetch_tasks.append(_fetch_source(fetcher, source))
-
-        results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-
-        # 4. Process results
-        all_new_items: list[tuple[str, RawItem]] = []
+            fetched_sources.append(source)
+            fetchers.append(fetcher)
+
+        # Channels get first claim on today's YouTube quota; searches share the rest
+        ledger = get_ledger()
+        reserve_channel_quota(fetchers)
+
+        async def ingest(idx: int, items: list[RawItem]) -> bool:
+            """Dedup and store one page of a source's items; False once a page brings nothing new."""
+            nonlocal total_fetched, total_new
+            total_fetched += len(items)
+            # Entries at or below the source's watermark were handled on an earlier run
+            fresh = fetchers[idx].filter_seen(items)
+            if not fresh:
+                return False
+            async with pool.acquire() as conn:
+                new_items = await deduplicate(fresh, conn)
+                total_new += await _insert_items(conn, str(fetched_sources[idx]["id"]), new_items)
+            return bool(new_items)
 
-        for source, result in zip(sources, results, strict=False):
+        # 4. Fetch all sources in parallel; pages are deduplicated and persisted as they arrive
+        try:
+            fetch_errors = await _fetch_all(fetchers, fetched_sources, ingest)
+        finally:
+            ledger.release()
+            await persist_ledger()
+            await persist_nitter_health()
+
+        # 5. Record source health
+        for source, fetcher, error in zip(fetched_sources, fetchers, fetch_errors, strict=True):
             source_id = str(source["id"])
             source_name = source["name"]
 
-            if isinstance(result, Exception):
-                error_msg = f"{type(result).__name__}: {result}"
+            if isinstance(error, HostPausedError):
+                # The host asked us to back off: the source isn't failing, its fetch waits for the next run
+                logger.info("Deferred %s: %s", source_name, error)
+                continue
+
+            if error is not None:
+                error_msg = f"{type(error).__name__}: {error}"
                 logger.error("Fetch failed for %s: %s", source_name, error_msg)
                 errors.append({"source": source_name, "error": error_msg})
+                # Open (or re-open, with a longer delay) the circuit once failures pile up
+                error_count = source["error_count"] + 1
                 async with pool.acquire() as conn:
                     await conn.execute(
                         """UPDATE sources
-                           SET last_error = $1, error_count = error_count + 1, updated_at = now()
+                           SET last_error = $1, error_count = $3, next_retry_at = $4, updated_at = now()
                            WHERE id = $2::uuid""",
                         error_msg,
                         source_id,
+                        error_count,
+                        next_retry_at(error_count, now),
                     )
                 continue
 
-            raw_items: list[RawItem] = result
-            total_fetched += len(raw_items)
-
-            # Deduplicate
-            async with pool.acquire() as conn:
-                new_items = await deduplicate(raw_items, conn)
-
-            for item in new_items:
-                all_new_items.append((source_id, item))
+            if states[source_id] == "half_open":
+                logger.info("Source %s recovered after %d failures", source_name, source["error_count"])
 
-            # Update source health
+            # Update source health and save the fetcher's cursor state
             async with pool.acquire() as conn:
                 await conn.execute(
                     """UPDATE sources
-                       SET last_fetched_at = now(), last_error = NULL, error_count = 0, updated_at = now()
+                       SET last_fetched_at = now(), last_error = NULL, error_count = 0, next_retry_at = NULL,
+                           fetch_state = $2::jsonb, updated_at = now()
                        WHERE id = $1::uuid""",
                     source_id,
+                    json.dumps(fetcher.state),
                 )
 
-        # 5. Persist new items
-        async with pool.acquire() as conn:
-            for source_id, item in all_new_items:
-                try:
-                    await conn.execute(
-                        """INSERT INTO items (source_id, external_id, title, url, author,
-                                              content_raw, thumbnail_url, published_at, extra)
-                           VALUES ($1::uuid, $2, $3, $4, $5, $6, $7, $8, $9::jsonb)
-                           ON CONFLICT (url) DO NOTHING""",
-                        source_id,
-                        item.external_id,
-                        item.title,
-                        item.url,
-                        item.author,
-                        item.content_raw,
-                        item.thumbnail_url,
-                        item.published_at,
-                        json.dumps(item.extra or {}),
-                    )
-                    total_new += 1
-                except Exception as e:
-                    logger.warning("Failed to insert item '%s': %s", item.title[:50], e)
-
         # 6. Summarize unsummarized items
-        async with pool.acquire() as conn:
-            unsummarized = await conn.fetch(
-                """SELECT id, title, content_raw
-                   FROM items
-                   WHERE summarized_at IS NULL
-                   ORDER BY created_at DESC"""
-            )
-
-        # Process in batches
-        for i in range(0, len(unsummarized), SUMMARIZE_BATCH_SIZE):
-            batch = unsummarized[i : i + SUMMARIZE_BATCH_SIZE]
-            batch_input = [
-                {
-                    "index": idx,
-                    "title": row["title"],
-                    "content": (row["content_raw"] or "")[:1000],
-                }
-                for idx, row in enumerate(batch)
-            ]
-
-            results = await summarize_items(batch_input)
-
-            async with pool.acquire() as conn:
-                for result in results:
-                    idx = result.get("index", 0)
-                    if idx >= len(batch):
-                        continue
-
-                    item_id = str(batch[idx]["id"])
-                    summary = result.get("summary", "")
-                    categories = result.get("categories", [])
-                    raw_conf = result.get("confidence", [])
-                    # LLM may return a single float instead of a list
-                    if isinstance(raw_conf, (int, float)):
-                        confidences = [raw_conf]
-                    elif isinstance(raw_conf, list):
-                        confidences = raw_conf
-                    else:
-                        confidences = []
-
-                    if summary:
-                        await conn.execute(
-                            "UPDATE items SET summary = $1, summarized_at = now(),"
-                            " updated_at = now() WHERE id = $2::uuid",
-                            summary,
-                            item_id,
-                        )
-                        total_summarized += 1
-
-                    # Assign categories
-                    for cat_idx, cat_slug in enumerate(categories):
-                        cat_row = await conn.fetchrow("SELECT id FROM categories WHERE slug = $1", cat_slug)
-                        if cat_row:
-                            confidence = confidences[cat_idx] if cat_idx < len(confidences) else None
-                            await conn.execute(
-                                """INSERT INTO item_categories (item_id, category_id, is_auto, confidence)
-                                   VALUES ($1::uuid, $2::uuid, true, $3)
-                                   ON CONFLICT (item_id, category_id) DO NOTHING""",
-                                item_id,
-                                str(cat_row["id"]),
-                                confidence,
-                            )
+        total_summarized += await summarize_backlog(pool)
 
         # 7. YouTube channel discovery
         try:
@@ -227,9 +218,292 @@ async def run_pipeline(trigger: str = "manual") -> str:
     return str(run_id)
 
 
-async def _fetch_source(fetcher, source) -> list[RawItem]:  # type: ignore[no-untyped-def]
-    """Fetch items from a single source with timeout."""
+async def summarize_backlog(pool: asyncpg.Pool, offline: bool = False) -> int:
+    """Summarize every unsummarized item. Returns the number of items summarized.
+
+    Finished Batch API jobs are applied first. Items still waiting in a
+    submitted job are left to it. With the LLM engine, items without any
+    summary first get an extractive preview. The rest then go through the
+    Batch API when ``offline`` is set or they number at least
+    ``SUMMARIZE_OFFLINE_THRESHOLD``, and through chat completions otherwise.
+    The local category classifier first learns from the labels added since
+    the last run.
+    """
+    settings = get_settings()
+    engine = get_summary_engine()
+    summarized = 0
+    try:
+        summarized += await poll_summary_batches(pool)
+    except Exception:
+        logger.exception("Polling summary batches failed")
+
+    async with pool.acquire() as conn:
+        unsummarized = await conn.fetch(
+            """SELECT id, title, url, content_raw, summary
+               FROM items i
+               WHERE summarized_at IS NULL
+                 AND NOT EXISTS (
+                     SELECT 1 FROM summary_batches b WHERE b.applied_at IS NULL AND i.id = ANY(b.item_ids)
+                 )
+               ORDER BY created_at DESC"""
+        )
+
+    # Give items without much feed text their article's text to summarize from
+    articles: dict[str, str] = {}
+    if settings.article_extraction and unsummarized:
+        try:
+            articles = await extract_articles([(str(r["id"]), r["url"], r["content_raw"]) for r in unsummarized])
+        except Exception:
+            logger.exception("Article extraction failed, summarizing from feed content")
+
+    if isinstance(engine, LLMEngine) and settings.summary_preview:
+        try:
+            await _preview(pool, [row for row in unsummarized if row["summary"] is None], articles)
+        except Exception:
+            logger.exception("Preview summaries failed")
+
+    if settings.classifier and unsummarized:
+        try:
+            await refresh_classifier(pool)
+        except Exception:
+            logger.exception("Refreshing the category classifier failed")
+
+    threshold = settings.summarize_offline_threshold
+    offline = offline or 0 < threshold <= len(unsummarized)
+    return summarized + await _summarize(pool, unsummarized, articles, offline=offline, engine=engine)
+
+
+async def _preview(pool: asyncpg.Pool, rows: list, articles: dict[str, str]) -> None:  # type: ignore[type-arg]
+    """Give ``rows`` an extractive summary to show until the engine's summary arrives."""
+    if not rows:
+        return
+    ids = [str(row["id"]) for row in rows]
+    texts = [articles.get(item_id) or row["content_raw"] or "" for item_id, row in zip(ids, rows, strict=True)]
+    summaries = await run_parser(extractive_summaries, texts)
+    async with pool.acquire() as conn:
+        await store_previews(conn, dict(zip(ids, summaries, strict=True)))
+
+
+async def _summarize(
+    pool: asyncpg.Pool,
+    rows: list,  # type: ignore[type-arg]
+    articles: dict[str, str],
+    offline: bool = False,
+    engine: SummarizerEngine | None = None,
+) -> int:
+    """Summarize ``rows`` (items with id, title, content_raw), from the summary cache where possible.
+
+    Items whose normalized title and content were summarized before, under the
+    same model and prompt, get the cached result. Items sharing content are
+    sent once to ``engine`` (default ``SUMMARY_ENGINE``), in batches packed to
+    the token budgets, or submitted as one Batch API job when ``offline`` and
+    the engine is the LLM. Items the local classifier categorizes confidently
+    are sent without asking for categories. Returns the number of items
+    summarized now.
+    """
+    settings = get_settings()
+    engine = engine or get_summary_engine()
+    await load_tokenizer()
+    system_prompt = build_system_prompt(await get_categories())
+    version = engine.version(system_prompt)
+    contents = {
+        str(row["id"]): truncate_tokens(
+            articles.get(str(row["id"])) or row["content_raw"] or "", settings.summarize_item_tokens
+        )
+        for row in rows
+    }
+    hashes = {str(row["id"]): content_hash(row["title"], contents[str(row["id"])]) for row in rows}
+
+    summarized = 0
+    async with pool.acquire() as conn:
+        category_ids = await load_category_ids(conn)
+        cached = await lookup_cached(conn, hashes.values(), version)
+        for item_id, key in hashes.items():
+            if key in cached and await apply_summary(conn, item_id, cached[key], category_ids, engine.name):
+                summarized += 1
+    if cached:
+        logger.info("Summary cache: %d of %d items served without an LLM call", summarized, len(rows))
+
+    # One representative per distinct content; its result is applied to every item sharing it
+    pending: dict[str, PendingSummary] = {}
+    for row in rows:
+        item_id, key = str(row["id"]), hashes[str(row["id"])]
+        if key in pending:
+            pending[key] = replace(pending[key], item_ids=(*pending[key].item_ids, item_id))
+        elif key not in cached:
+            pending[key] = PendingSummary(key, (item_id,), row["title"], contents[item_id])
+    groups = list(pending.values())
     try:
-        return await asyncio.wait_for(fetcher.fetch(), timeout=60)
-    except TimeoutError as err:
-        raise TimeoutError(f"Fetch timed out for source: {source['name']}") from err
+        classified = await _classify(pool, groups, category_ids)
+    except Exception:
+        logger.exception("Local categorization failed, leaving categories to the engine")
+        classified = {}
+    groups = [
+        replace(group, local_categories=classified[group.content_hash]) if group.content_hash in classified else group
+        for group in groups
+    ]
+
+    # A failed submission falls back to summarizing now
+    if (
+        offline
+        and groups
+        and isinstance(engine, LLMEngine)
+        and await submit_summary_batch(pool, groups, system_prompt, version)
+    ):
+        return summarized
+
+    batcher = TokenBatcher(
+        system_tokens=count_tokens(system_prompt),
+        prompt_budget=settings.summarize_prompt_tokens,
+        completion_budget=settings.summarize_completion_tokens,
+        target_latency=settings.summarize_target_latency,
+    )
+    sizes = [batcher.item_tokens(group.title, group.content) for group in groups]
+    for indices in batcher.batches(sizes):
+        batch = [groups[i] for i in indices]
+        batch_input = [group.as_item(idx) for idx, group in enumerate(batch)]
+
+        results = await engine.summarize(batch_input, batcher)
+
+        async with pool.acquire() as conn:
+            summarized += await apply_results(conn, batch, results, category_ids, version, engine.name)
+
+    return summarized
+
+
+async def _classify(
+    pool: asyncpg.Pool,
+    groups: list[PendingSummary],
+    category_ids: dict[str, str],
+) -> dict[str, tuple[tuple[str, float], ...]]:
+    """Categorize ``groups`` with the local classifier where it is confident.
+
+    Returns the (slug, confidence) pairs assigned, by content hash. A small
+    sample of confident groups is left to the engine anyway, so the LLM keeps
+    labeling items for the classifier to learn from.
+    """
+    settings = get_settings()
+    classifier = get_classifier()
+    if not settings.classifier or classifier is None or not groups:
+        return {}
+    predictions = await asyncio.to_thread(
+        classifier.predict, [f"{group.title}\n{group.content}" for group in groups], settings.classifier_threshold
+    )
+    slugs = {category_id: slug for slug, category_id in category_ids.items()}
+    confident = [
+        (group, prediction)
+        for group, prediction in zip(groups, predictions, strict=True)
+        if prediction.confident
+        and not sampled_for_llm(group.content_hash)
+        and all(category_id in slugs for category_id, _ in prediction.categories)
+    ]
+    async with pool.acquire() as conn:
+        await apply_categories(
+            conn,
+            [
+                (item_id, category_id, confidence)
+                for group, prediction in confident
+                for item_id in group.item_ids
+                for category_id, confidence in prediction.categories
+            ],
+            "classifier",
+        )
+    if confident:
+        logger.info("Classifier: %d of %d contents categorized without the LLM", len(confident), len(groups))
+    return {
+        group.content_hash: tuple((slugs[category_id], confidence) for category_id, confidence in prediction.categories)
+        for group, prediction in confident
+    }
+
+
+async def _insert_items(conn: asyncpg.Connection, source_id: str, items: list[RawItem]) -> int:
+    inserted = 0
+    for item in items:
+        try:
+            await conn.execute(
+                """INSERT INTO items (source_id, external_id, title, url, author,
+                                      content_raw, thumbnail_url, published_at, extra)
+                   VALUES ($1::uuid, $2, $3, $4, $5, $6, $7, $8, $9::jsonb)
+                   ON CONFLICT (url) DO NOTHING""",
+                source_id,
+                item.external_id,
+                item.title,
+                item.url,
+                item.author,
+                item.content_raw,
+                item.thumbnail_url,
+                item.published_at,
+                json.dumps(item.extra or {}),
+            )
+            inserted += 1
+        except Exception as e:
+            logger.warning("Failed to insert item '%s': %s", item.title[:50], e)
+    return inserted
+
+
+async def _fetch_all(
+    fetchers: list[BaseFetcher],
+    sources: list,  # type: ignore[type-arg]
+    ingest: Callable[[int, list[RawItem]], Awaitable[bool]],
+) -> list[BaseException | None]:
+    """Fetch every source and hand each page of items to ``ingest(index, items)``.
+
+    Fetchers that share a batch key are fetched in one ``fetch_batch`` call;
+    the others are streamed through ``aiter_items`` and stop paging as soon as
+    ``ingest`` returns False. Time spent queued for a host's rate limit doesn't
+    count towards ``FETCH_TIMEOUT``. Returns the error (or None) per fetcher, in order.
+    """
+    errors: list[BaseException | None] = [None] * len(fetchers)
+    singles: list[int] = []
+    groups: dict[tuple[type[BaseFetcher], Hashable], list[int]] = {}
+    for idx, fetcher in enumerate(fetchers):
+        key = fetcher.batch_key()
+        if key is None:
+            singles.append(idx)
+        else:
+            groups.setdefault((type(fetcher), key), []).append(idx)
+
+    async def _run_single(idx: int) -> None:
+        try:
+            async with fetch_timeout(FETCH_TIMEOUT):
+                await _stream_source(fetchers[idx], idx, ingest)
+        except TimeoutError:
+            errors[idx] = TimeoutError(f"Fetch timed out for source: {sources[idx]['name']}")
+        except Exception as e:
+            errors[idx] = e
+
+    async def _run_group(cls: type[BaseFetcher], indices: list[int]) -> None:
+        timeout = FETCH_TIMEOUT * math.ceil(len(indices) / BATCH_TIMEOUT_SOURCES)
+        try:
+            async with fetch_timeout(timeout):
+                batch = await cls.fetch_batch([fetchers[i] for i in indices])
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                e = TimeoutError(f"Batched fetch timed out for {len(indices)} {cls.__name__} sources")
+            batch = [e] * len(indices)
+        for idx, result in zip(indices, batch, strict=True):
+            if isinstance(result, BaseException):
+                errors[idx] = result
+                continue
+            try:
+                await ingest(idx, result)
+            except Exception as e:
+                errors[idx] = e
+
+    await asyncio.gather(
+        *(_run_single(idx) for idx in singles),
+        *(_run_group(cls, indices) for (cls, _key), indices in groups.items()),
+    )
+    return errors
+
+
+async def _stream_source(
+    fetcher: BaseFetcher,
+    idx: int,
+    ingest: Callable[[int, list[RawItem]], Awaitable[bool]],
+) -> None:
+    # aclosing: stopping early must close the generator so the fetcher releases its client
+    async with contextlib.aclosing(fetcher.aiter_items()) as pages:
+        async for page in pages:
+            if not await ingest(idx, page):
+                break
@@ -0,0 +1,190 @@
+"""Re-categorizing every existing item after the category list changes.
+
+Adding a category gives it to new items only, and deleting one leaves the
+items that had it uncategorized. This job walks all items in chunks of
+``CHUNK_SIZE``, in ``id`` order (a keyset, so each chunk is an index range
+scan however large the table). Each chunk goes through the classification
+path. The local classifier comes first, but only when it has learned every
+current category: it cannot suggest a category it has never seen. The
+remaining titles go to the LLM, ``TITLES_PER_REQUEST`` per request, with at
+most ``RECATEGORIZE_CONCURRENCY`` requests at a time. For every item that got
+an answer, its automatic categories are replaced, with set-based statements in
+one transaction per chunk. Manual ones are kept.
+
+Progress is stored in ``app_settings`` (key ``recategorize``) after every
+chunk. A job interrupted by a restart is left "running" and resumes from the
+last chunk it finished. A new taxonomy change restarts the job from the start.
+A finished job drops the classifier's model, which is then rebuilt from the
+rewritten labels.
+"""
+
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+import asyncpg
+
+from signal_app.config import get_settings
+from signal_app.db import get_app_setting, set_app_setting
+from signal_app.pipeline.classifier import refresh_classifier, reset_classifier
+from signal_app.pipeline.summaries import apply_categories, load_category_ids, parse_result
+from signal_app.pipeline.summarizer import categorize_titles
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = "recategorize"
+CHUNK_SIZE = 2000
+TITLES_PER_REQUEST = 100
+
+_task: asyncio.Task[dict[str, Any]] | None = None
+
+
+async def get_recategorize_state() -> dict[str, Any]:
+    state: dict[str, Any] = await get_app_setting(STATE_KEY, {"status": "idle"})
+    return state
+
+
+async def _llm_categories(items: list[dict[str, str | int]], concurrency: int) -> list[dict[str, Any]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _batch(batch: list[dict[str, str | int]]) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await categorize_titles(batch)
+
+    batches = await asyncio.gather(
+        *(_batch(items[start : start + TITLES_PER_REQUEST]) for start in range(0, len(items), TITLES_PER_REQUEST))
+    )
+    return [result for batch in batches for result in batch]
+
+
+async def _write(
+    pool: asyncpg.Pool,
+    item_ids: list[str],
+    local: list[tuple[str, str, float]],
+    llm: list[tuple[str, str, float | None]],
+) -> None:
+    """Replace the automatic categories of ``item_ids`` with the new assignments, in one transaction."""
+    async with pool.acquire() as conn, conn.transaction():
+        await conn.execute(
+            "DELETE FROM item_categories WHERE item_id = ANY($1::uuid[]) AND is_auto",
+            item_ids,
+        )
+        await apply_categories(conn, local, "classifier")
+        await apply_categories(conn, llm, "llm")
+
+
+async def recategorize(pool: asyncpg.Pool, resume: bool = False) -> dict[str, Any]:
+    """Re-categorize every item, or the rest of an interrupted job when ``resume``. Returns the final state."""
+    settings = get_settings()
+    state = await get_recategorize_state() if resume else None
+    if not state or state.get("status") != "running":
+        async with pool.acquire() as conn:
+            total = await conn.fetchval("SELECT count(*) FROM items")
+        state = {
+            "status": "running",
+            "after": None,
+            "processed": 0,
+            "categorized": 0,
+            "total": total,
+            "started_at": datetime.now(UTC).isoformat(),
+            "finished_at": None,
+            "error": None,
+        }
+        await set_app_setting(STATE_KEY, state)
+
+    async def _finish(status: str, error: str | None = None) -> dict[str, Any]:
+        state.update(status=status, error=error, finished_at=datetime.now(UTC).isoformat())
+        await set_app_setting(STATE_KEY, state)
+        if state["processed"]:
+            # The rewritten labels look new to incremental training; learn them once, from scratch
+            await reset_classifier(pool)
+        return state
+
+    try:
+        async with pool.acquire() as conn:
+            category_ids = await load_category_ids(conn)
+        classifier = await refresh_classifier(pool) if settings.classifier else None
+        if classifier is not None and not classifier.covers(category_ids.values()):
+            classifier = None
+        if classifier is None and not settings.openai_api_key:
+            return await _finish("failed", "No OpenAI API key, and the classifier doesn't know every category yet")
+
+        while True:
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """SELECT id, title FROM items
+                       WHERE $1::uuid IS NULL OR id > $1::uuid
+                       ORDER BY id LIMIT $2""",
+                    state["after"],
+                    CHUNK_SIZE,
+                )
+            if not rows:
+                break
+
+            ids = [str(row["id"]) for row in rows]
+            local: list[tuple[str, str, float]] = []
+            answered: set[str] = set()
+            if classifier is not None:
+                predictions = await asyncio.to_thread(
+                    classifier.predict, [row["title"] for row in rows], settings.classifier_threshold
+                )
+                for item_id, prediction in zip(ids, predictions, strict=True):
+                    if prediction.confident:
+                        answered.add(item_id)
+                        local.extend(
+                            (item_id, category_id, confidence) for category_id, confidence in prediction.categories
+                        )
+
+            rest = [(item_id, row["title"]) for item_id, row in zip(ids, rows, strict=True) if item_id not in answered]
+            results = await _llm_categories(
+                [{"index": idx, "title": title} for idx, (_, title) in enumerate(rest)],
+                settings.recategorize_concurrency,
+            )
+            llm: list[tuple[str, str, float | None]] = []
+            for result in results:
+                item_id = rest[result["index"]][0]
+                answered.add(item_id)
+                parsed = parse_result(result)
+                llm.extend(
+                    (item_id, category_ids[slug], confidence)
+                    for slug, confidence in zip(parsed.categories, parsed.confidences, strict=True)
+                    if slug in category_ids
+                )
+
+            await _write(pool, [item_id for item_id in ids if item_id in answered], local, llm)
+            state.update(
+                after=ids[-1],
+                processed=state["processed"] + len(ids),
+                categorized=state["categorized"] + len(answered),
+            )
+            await set_app_setting(STATE_KEY, state)
+            logger.info("Re-categorized %d of %d items", state["processed"], state["total"])
+
+        return await _finish("completed")
+    except Exception as exc:
+        logger.exception("Re-categorization failed")
+        return await _finish("failed", str(exc))
+
+
+async def start_recategorization(pool: asyncpg.Pool, resume: bool = False) -> None:
+    """Run ``recategorize`` in the background, replacing a job already running."""
+    global _task
+    await stop_recategorization()
+    _task = asyncio.create_task(recategorize(pool, resume))
+
+
+async def resume_recategorization(pool: asyncpg.Pool) -> None:
+    """Resume a job interrupted by a restart, if there is one."""
+    if (await get_recategorize_state()).get("status") == "running":
+        await start_recategorization(pool, resume=True)
+
+
+async def stop_recategorization() -> None:
+    global _task
+    if _task is not None and not _task.done():
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
+    _task = None
@@ -0,0 +1,236 @@
+"""Writing LLM summaries to items, and the summary cache in front of the LLM.
+
+The same story often reaches us several times under different URLs (a press
+release via RSS, Reddit and HN), and re-adding a deleted source brings back
+items that were summarized before. ``summary_cache`` stores each summary under
+a hash of the normalized title and content that were sent, together with a
+version of the model and system prompt. An item whose hash is cached gets its
+summary and categories without an LLM call. Changing the model, the prompt or
+the categories changes the version, so stale summaries are never reused.
+"""
+
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+import asyncpg
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+@dataclass(frozen=True, slots=True)
+class SummaryResult:
+    summary: str
+    categories: tuple[str, ...] = ()
+    confidences: tuple[float | None, ...] = ()
+    labeler: str = "llm"  # Who assigned the categories: "llm", or "classifier" for local ones
+
+
+@dataclass(frozen=True, slots=True)
+class PendingSummary:
+    """One distinct content to summarize, and the items that share it."""
+
+    content_hash: str
+    item_ids: tuple[str, ...]
+    title: str
+    content: str
+    # (slug, confidence) the local classifier assigned; the LLM is then asked for a summary only
+    local_categories: tuple[tuple[str, float], ...] = ()
+
+    def as_item(self, index: int) -> dict[str, str | int]:
+        """This content as an item of a summarizer batch."""
+        item: dict[str, str | int] = {"index": index, "title": self.title, "content": self.content}
+        if self.local_categories:
+            item["categorize"] = False
+        return item
+
+
+def parse_result(result: Mapping[str, Any]) -> SummaryResult:
+    """A ``SummaryResult`` from one entry of the LLM's ``results`` list."""
+    categories = result.get("categories") or []
+    raw_conf = result.get("confidence", [])
+    # LLM may return a single float instead of a list
+    if isinstance(raw_conf, (int, float)):
+        confidences: list[Any] = [raw_conf]
+    elif isinstance(raw_conf, list):
+        confidences = raw_conf
+    else:
+        confidences = []
+    return SummaryResult(
+        summary=str(result.get("summary") or ""),
+        categories=tuple(str(slug) for slug in categories if isinstance(slug, str)),
+        confidences=tuple(
+            float(confidences[i]) if i < len(confidences) and isinstance(confidences[i], (int, float)) else None
+            for i in range(len(categories))
+        ),
+    )
+
+
+def content_hash(title: str, content: str) -> str:
+    """Hash of the title and content with markup, case, punctuation and spacing normalized away."""
+
+    def normalize(text: str) -> str:
+        return _NON_WORD_RE.sub(" ", _TAG_RE.sub(" ", text).lower()).strip()
+
+    return hashlib.sha256(f"{normalize(title)}\n{normalize(content)}".encode()).hexdigest()
+
+
+def prompt_version(model: str, system_prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{system_prompt}".encode()).hexdigest()[:16]
+
+
+async def lookup_cached(conn: asyncpg.Connection, hashes: Iterable[str], version: str) -> dict[str, SummaryResult]:
+    rows = await conn.fetch(
+        """SELECT content_hash, summary, categories FROM summary_cache
+           WHERE content_hash = ANY($1::text[]) AND prompt_version = $2""",
+        list(set(hashes)),
+        version,
+    )
+    cached: dict[str, SummaryResult] = {}
+    for row in rows:
+        categories = row["categories"] if isinstance(row["categories"], list) else json.loads(row["categories"])
+        # Entries cached before labelers were recorded are [slug, confidence] pairs from the LLM
+        cached[row["content_hash"]] = SummaryResult(
+            summary=row["summary"],
+            categories=tuple(entry[0] for entry in categories),
+            confidences=tuple(entry[1] for entry in categories),
+            labeler=categories[0][2] if categories and len(categories[0]) > 2 else "llm",
+        )
+    return cached
+
+
+async def store_cached(conn: asyncpg.Connection, results: Mapping[str, SummaryResult], version: str) -> None:
+    entries = {key: result for key, result in results.items() if result.summary}
+    if not entries:
+        return
+    await conn.execute(
+        """INSERT INTO summary_cache (content_hash, prompt_version, summary, categories)
+           SELECT h, $4, s, c::jsonb FROM unnest($1::text[], $2::text[], $3::text[]) AS e(h, s, c)
+           ON CONFLICT (content_hash, prompt_version) DO NOTHING""",
+        list(entries),
+        [result.summary for result in entries.values()],
+        [
+            json.dumps(
+                [
+                    [slug, confidence, result.labeler]
+                    for slug, confidence in zip(result.categories, result.confidences, strict=True)
+                ]
+            )
+            for result in entries.values()
+        ],
+        version,
+    )
+
+
+async def load_category_ids(conn: asyncpg.Connection) -> dict[str, str]:
+    rows = await conn.fetch("SELECT id, slug FROM categories")
+    return {row["slug"]: str(row["id"]) for row in rows}
+
+
+async def apply_summary(
+    conn: asyncpg.Connection,
+    item_id: str,
+    result: SummaryResult,
+    category_ids: Mapping[str, str],
+    engine: str = "llm",
+) -> bool:
+    """Write a summary and its categories to an item. Returns whether a summary was written.
+
+    The categories are labeled with ``result.labeler``. Unknown category slugs are
+    ignored; existing category assignments are kept.
+    """
+    if result.summary:
+        await conn.execute(
+            """UPDATE items SET summary = $1, summary_engine = $3, summarized_at = now(), updated_at = now()
+               WHERE id = $2::uuid""",
+            result.summary,
+            item_id,
+            engine,
+        )
+
+    assigned = [
+        (category_ids[slug], confidence)
+        for slug, confidence in zip(result.categories, result.confidences, strict=True)
+        if slug in category_ids
+    ]
+    if assigned:
+        await conn.execute(
+            """INSERT INTO item_categories (item_id, category_id, is_auto, confidence, labeler)
+               SELECT $1::uuid, c, true, conf, $4 FROM unnest($2::uuid[], $3::real[]) AS a(c, conf)
+               ON CONFLICT (item_id, category_id) DO NOTHING""",
+            item_id,
+            [category_id for category_id, _ in assigned],
+            [confidence for _, confidence in assigned],
+            result.labeler,
+        )
+    return bool(result.summary)
+
+
+async def apply_categories(
+    conn: asyncpg.Connection, assignments: Sequence[tuple[str, str, float | None]], labeler: str
+) -> None:
+    """Assign categories as (item_id, category_id, confidence), in one statement. Existing assignments are kept."""
+    if not assignments:
+        return
+    await conn.execute(
+        """INSERT INTO item_categories (item_id, category_id, is_auto, confidence, labeler)
+           SELECT i, c, true, conf, $4 FROM unnest($1::uuid[], $2::uuid[], $3::real[]) AS a(i, c, conf)
+           ON CONFLICT (item_id, category_id) DO NOTHING""",
+        [item_id for item_id, _, _ in assignments],
+        [category_id for _, category_id, _ in assignments],
+        [confidence for _, _, confidence in assignments],
+        labeler,
+    )
+
+
+async def apply_results(
+    conn: asyncpg.Connection,
+    batch: Sequence[PendingSummary],
+    results: Iterable[Mapping[str, Any]],
+    category_ids: Mapping[str, str],
+    version: str,
+    engine: str = "llm",
+) -> int:
+    """Apply the ``results`` of ``engine`` for ``batch`` (indexed by position) and cache them.
+
+    Results with an index outside the batch are ignored. Returns the number of items summarized.
+    """
+    summarized = 0
+    fresh: dict[str, SummaryResult] = {}
+    for raw in results:
+        idx = raw.get("index", 0)
+        if not isinstance(idx, int) or not 0 <= idx < len(batch):
+            continue
+        result = parse_result(raw)
+        if batch[idx].local_categories:
+            # Not categorized by the LLM: cache the classifier's categories, so duplicates served
+            # from the cache are categorized too, still labeled as the classifier's so it never learns them
+            slugs, confidences = zip(*batch[idx].local_categories, strict=True)
+            result = replace(result, categories=slugs, confidences=confidences, labeler="classifier")
+        fresh[batch[idx].content_hash] = result
+        for item_id in batch[idx].item_ids:
+            if await apply_summary(conn, item_id, result, category_ids, engine):
+                summarized += 1
+    await store_cached(conn, fresh, version)
+    return summarized
+
+
+async def store_previews(conn: asyncpg.Connection, previews: Mapping[str, str]) -> None:
+    """Show extractive ``previews`` (by item id) on items that have no summary yet.
+
+    ``summarized_at`` stays unset, so the items are still summarized properly.
+    """
+    previews = {item_id: summary for item_id, summary in previews.items() if summary}
+    if not previews:
+        return
+    await conn.execute(
+        """UPDATE items AS i SET summary = p.summary, summary_engine = 'extractive', updated_at = now()
+           FROM unnest($1::uuid[], $2::text[]) AS p(id, summary)
+           WHERE i.id = p.id AND i.summary IS NULL""",
+        list(previews),
+        list(previews.values()),
+    )
@@ -1,51 +1,178 @@
+import asyncio
+import functools
 import json
 import logging
-
-from openai import AsyncOpenAI
+import random
+import time
+from typing import TYPE_CHECKING, Any
 
 from signal_app.config import get_settings
-from signal_app.db import get_pool
+from signal_app.llm import Category, get_categories, get_llm_client
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+    from signal_app.pipeline.batching import TokenBatcher
 
 logger = logging.getLogger(__name__)
 
+MAX_TRANSIENT_RETRIES = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+
+# Fixed instructions first and the category list last: the prompt prefix stays identical
+# across batches (and category changes), which is what provider-side prompt caching matches on
 SYSTEM_PROMPT_TEMPLATE = """You are a news summarizer for an intelligence tool called Signal.
 
 For each item, produce:
 1. A concise 2-3 sentence summary focused on why this matters.
-2. Assign 1-3 categories from this list (use slugs):
-{categories}
+2. Assign 1-3 categories from the category list below (use slugs).
 
 If no categories are configured, skip the categories field.
+For items marked "Categorize: no", return an empty categories list.
 
 Respond with valid JSON only. Format:
 {{
   "results": [
     {{"index": 0, "summary": "...", "categories": ["slug1"], "confidence": [0.95]}}
   ]
-}}"""
+}}
+
+Categories:
+{categories}"""
+
+
+# Title-only categorization, for re-categorizing existing items in bulk
+CATEGORIZE_PROMPT_TEMPLATE = """You categorize news items for an intelligence tool called Signal.
+
+For each item title, assign 0-3 categories from the category list below (use slugs).
+Assign none when no category fits.
+
+Respond with valid JSON only. Format:
+{{
+  "results": [
+    {{"index": 0, "categories": ["slug1"], "confidence": [0.95]}}
+  ]
+}}
+
+Categories:
+{categories}"""
+
+
+def _category_lines(categories: tuple[Category, ...]) -> str:
+    if categories:
+        return "\n".join(f"   - {category.slug}: {category.name}" for category in categories)
+    return "   (no categories configured)"
+
+
+@functools.lru_cache(maxsize=8)
+def build_system_prompt(categories: tuple[Category, ...]) -> str:
+    """The system prompt for a set of categories."""
+    return SYSTEM_PROMPT_TEMPLATE.format(categories=_category_lines(categories))
+
+
+def request_params(system_prompt: str, items: list[dict[str, str | int]]) -> dict[str, Any]:
+    """Chat completion parameters for a batch of items (also the body of a Batch API request)."""
+    settings = get_settings()
+    user_message = "\n---\n".join(
+        f"[Item {item['index']}]\nTitle: {item['title']}\nContent: {item['content']}\n"
+        + ("" if item.get("categorize", True) else "Categorize: no\n")
+        for item in items
+    )
+    return {
+        "model": settings.openai_model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ],
+        "temperature": 0.3,
+        "max_tokens": settings.summarize_completion_tokens,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def parse_results(content: str | None) -> list[dict[str, Any]]:
+    """The ``results`` list of a response. Raises ``json.JSONDecodeError`` for invalid (e.g. truncated) JSON."""
+    data = json.loads(content or "{}")
+    results = data.get("results", []) if isinstance(data, dict) else []
+    return results if isinstance(results, list) else []
 
 
-async def _build_system_prompt() -> str:
-    """Build the system prompt with categories from the database."""
-    pool = get_pool()
-    async with pool.acquire() as conn:
-        rows = await conn.fetch("SELECT name, slug FROM categories ORDER BY sort_order")
+def valid_results(results: list[Any], indices: set[int]) -> dict[int, dict[str, Any]]:
+    """Usable results by index: an expected index, a non-empty summary and a list (if any) of categories.
 
-    if rows:
-        cat_lines = "\n".join(f"   - {row['slug']}: {row['name']}" for row in rows)
-    else:
-        cat_lines = "   (no categories configured)"
+    The first usable result for an index wins; anything else the model sent is dropped.
+    """
+    valid: dict[int, dict[str, Any]] = {}
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        idx = result.get("index")
+        summary = result.get("summary")
+        if (
+            isinstance(idx, int)
+            and idx in indices
+            and idx not in valid
+            and isinstance(summary, str)
+            and summary.strip()
+            and isinstance(result.get("categories", []), list)
+        ):
+            valid[idx] = result
+    return valid
+
+
+def _retry_delay(attempt: int) -> float:
+    # Equal jitter, as for failing sources: at least half the backoff, at most all of it
+    backoff: float = min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+    return backoff * random.uniform(0.5, 1.0)
+
+
+async def _request(
+    client: "AsyncOpenAI",
+    system_prompt: str,
+    items: list[dict[str, str | int]],
+    batcher: "TokenBatcher | None",
+) -> list[Any] | None:
+    """One chat completion for ``items``. None if the response was unusable (invalid or truncated JSON)."""
+    started = time.monotonic()
+    response = await client.chat.completions.create(**request_params(system_prompt, items))
 
-    return SYSTEM_PROMPT_TEMPLATE.format(categories=cat_lines)
+    choice = response.choices[0]
+    truncated = choice.finish_reason == "length"
+    results: list[Any] | None
+    try:
+        results = parse_results(choice.message.content)
+    except json.JSONDecodeError:
+        logger.warning("LLM returned invalid JSON for %d items (finish reason %s)", len(items), choice.finish_reason)
+        truncated, results = True, None
+
+    if batcher is not None:
+        usage = getattr(response, "usage", None)
+        batcher.observe(
+            len(items),
+            time.monotonic() - started,
+            getattr(usage, "completion_tokens", None),
+            truncated,
+        )
+    return results
 
 
 async def summarize_items(
     items: list[dict[str, str | int]],
+    batcher: "TokenBatcher | None" = None,
 ) -> list[dict[str, str | list[str] | list[float]]]:
     """Summarize and categorize a batch of items using OpenAI.
 
+    Only valid results are returned. Items the model skipped or answered
+    badly are sent again on their own, keeping their indices. A request that
+    yields nothing usable (invalid JSON, a rejected request) is split in two
+    and each half retried. An item that still fails alone is left for the next
+    run. Rate limits, timeouts and server errors are retried with backoff up to
+    ``MAX_TRANSIENT_RETRIES`` times.
+
     Args:
         items: List of dicts with "index", "title", and "content" keys.
+        batcher: Told how each request went (latency, output tokens, truncation) to size later batches.
 
     Returns:
         List of dicts with "index", "summary", "categories", and "confidence" keys.
@@ -55,31 +182,113 @@ async def summarize_items(
         logger.warning("No OpenAI API key configured, skipping summarization")
         return []
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    system_prompt = await _build_system_prompt()
+    from openai import (
+        APIConnectionError,
+        AuthenticationError,
+        InternalServerError,
+        PermissionDeniedError,
+        RateLimitError,
+    )
 
-    # Build the user message
-    user_parts = []
-    for item in items:
-        user_parts.append(f"[Item {item['index']}]\nTitle: {item['title']}\nContent: {item['content']}\n")
+    client = get_llm_client()
+    system_prompt = build_system_prompt(await get_categories())
 
-    user_message = "\n---\n".join(user_parts)
+    done: dict[int, dict[str, Any]] = {}
+    queue = [items]
+    transient_failures = 0
+    while queue:
+        batch = queue.pop(0)
+        try:
+            results = await _request(client, system_prompt, batch, batcher)
+        except (APIConnectionError, RateLimitError, InternalServerError) as exc:
+            if transient_failures >= MAX_TRANSIENT_RETRIES:
+                logger.error("LLM summarization failed after %d retries: %s", transient_failures, exc)
+                break
+            delay = _retry_delay(transient_failures)
+            transient_failures += 1
+            logger.warning("LLM request failed (%s), retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+            queue.insert(0, batch)
+            continue
+        except (AuthenticationError, PermissionDeniedError):
+            logger.exception("LLM summarization failed")
+            break
+        except Exception:
+            # Something in this batch was rejected (e.g. too long); smaller batches isolate it
+            logger.exception("LLM summarization failed for %d items", len(batch))
+            results = None
 
-    try:
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"},
-        )
+        valid = valid_results(results or [], {int(item["index"]) for item in batch})
+        done.update(valid)
+        missing = [item for item in batch if item["index"] not in valid]
+        if not missing:
+            continue
+        if valid:
+            queue.insert(0, missing)
+        elif len(batch) > 1:
+            half = len(batch) // 2
+            queue[:0] = [batch[:half], batch[half:]]
+        else:
+            logger.warning("No usable summary for item %s, leaving it for the next run", batch[0]["index"])
 
-        content = response.choices[0].message.content or "{}"
-        data = json.loads(content)
-        return data.get("results", [])
+    if len(done) < len(items):
+        logger.info("Summarized %d of %d items", len(done), len(items))
+    return [done[idx] for idx in sorted(done)]
 
-    except Exception:
-        logger.exception("LLM summarization failed")
+
+async def categorize_titles(items: list[dict[str, str | int]]) -> list[dict[str, Any]]:
+    """Categorize a batch of items by title alone, in one request.
+
+    Rate limits, timeouts and server errors are retried with backoff up to
+    ``MAX_TRANSIENT_RETRIES`` times; any other failure returns no results.
+
+    Args:
+        items: List of dicts with "index" and "title" keys.
+
+    Returns:
+        List of dicts with "index", "categories", and "confidence" keys, for the items answered.
+    """
+    settings = get_settings()
+    if not settings.openai_api_key:
         return []
+
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+
+    system_prompt = CATEGORIZE_PROMPT_TEMPLATE.format(categories=_category_lines(await get_categories()))
+    params: dict[str, Any] = {
+        "model": settings.openai_model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "\n".join(f"[{item['index']}] {item['title']}" for item in items)},
+        ],
+        "temperature": 0.3,
+        "max_tokens": settings.summarize_completion_tokens,
+        "response_format": {"type": "json_object"},
+    }
+    indices = {int(item["index"]) for item in items}
+    for attempt in range(MAX_TRANSIENT_RETRIES + 1):
+        try:
+            response = await get_llm_client().chat.completions.create(**params)
+            results = parse_results(response.choices[0].message.content)
+        except (APIConnectionError, RateLimitError, InternalServerError) as exc:
+            if attempt == MAX_TRANSIENT_RETRIES:
+                logger.error("LLM categorization failed after %d retries: %s", attempt, exc)
+                return []
+            delay = _retry_delay(attempt)
+            logger.warning("LLM request failed (%s), retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+            continue
+        except Exception:
+            logger.exception("LLM categorization failed for %d items", len(items))
+            return []
+        valid: dict[int, dict[str, Any]] = {}
+        for result in results:
+            if (
+                isinstance(result, dict)
+                and isinstance(result.get("index"), int)
+                and result["index"] in indices
+                and isinstance(result.get("categories", []), list)
+            ):
+                valid.setdefault(result["index"], result)
+        return [valid[idx] for idx in sorted(valid)]
+    return []
@@ -1,11 +1,19 @@
 from fastapi import APIRouter, HTTPException
 
 from signal_app.db import get_pool
-from signal_app.models import CategoryCreate, CategoryOut
+from signal_app.llm import invalidate_categories
+from signal_app.models import CategoryCreate, CategoryOut, RecategorizeStatus
 
 router = APIRouter()
 
 
+async def _recategorize() -> None:
+    # Imported on first use: the job pulls in the classifier (and NumPy), which startup doesn't need
+    from signal_app.pipeline.recategorize import start_recategorization
+
+    await start_recategorization(get_pool())
+
+
 @router.get("", response_model=list[CategoryOut])
 async def list_categories() -> list[CategoryOut]:
     pool = get_pool()
@@ -32,6 +40,8 @@ async def create_category(data: CategoryCreate) -> CategoryOut:
         )
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create category")
+    invalidate_categories()
+    await _recategorize()
     return CategoryOut(
         id=str(row["id"]),
         name=row["name"],
@@ -45,8 +55,25 @@ async def create_category(data: CategoryCreate) -> CategoryOut:
 async def delete_category(category_id: str) -> dict[str, str]:
     pool = get_pool()
     async with pool.acquire() as conn:
-        await conn.execute("DELETE FROM item_categories WHERE category_id = $1::uuid", category_id)
+        # item_categories rows go with it (ON DELETE CASCADE)
         result = await conn.execute("DELETE FROM categories WHERE id = $1::uuid", category_id)
         if result == "DELETE 0":
             raise HTTPException(status_code=404, detail="Category not found")
+    invalidate_categories()
+    await _recategorize()
     return {"status": "deleted"}
+
+
+@router.post("/recategorize")
+async def recategorize_items() -> dict[str, str]:
+    """Re-categorize every item in the background (restarting a job already running)."""
+    await _recategorize()
+    return {"status": "started"}
+
+
+@router.get("/recategorize", response_model=RecategorizeStatus)
+async def recategorize_status() -> RecategorizeStatus:
+    from signal_app.pipeline.recategorize import get_recategorize_state
+
+    state = await get_recategorize_state()
+    return RecategorizeStatus(**{key: value for key, value in state.items() if key != "after"})
@@ -18,6 +18,7 @@ def _row_to_item(row: dict, categories: list[dict]) -> ItemOut:  # type: ignore[
         url=row["url"],
         author=row.get("author"),
         summary=row.get("summary"),
+        summary_engine=row.get("summary_engine"),
         thumbnail_url=row.get("thumbnail_url"),
         published_at=row["published_at"].isoformat() if row.get("published_at") else None,
         fetched_at=row["fetched_at"].isoformat() if row.get("fetched_at") else "",
@@ -218,8 +219,8 @@ async def update_item(item_id: str, data: ItemUpdate) -> ItemOut:
             await conn.execute("DELETE FROM item_categories WHERE item_id = $1::uuid", item_id)
             for cat_id in data.category_ids:
                 await conn.execute(
-                    "INSERT INTO item_categories (item_id, category_id, is_auto)"
-                    " VALUES ($1::uuid, $2::uuid, false) ON CONFLICT DO NOTHING",
+                    "INSERT INTO item_categories (item_id, category_id, is_auto, labeler)"
+                    " VALUES ($1::uuid, $2::uuid, false, 'manual') ON CONFLICT DO NOTHING",
                     item_id,
                     cat_id,
                 )
@@ -1,15 +1,21 @@
 import asyncio
 import json
+import logging
 
 from fastapi import APIRouter
 
+from signal_app.config import get_settings
 from signal_app.db import get_pool
-from signal_app.models import PipelineRunOut, PipelineStatus
+from signal_app.fetchers.youtube_quota import get_ledger
+from signal_app.models import PipelineRunOut, PipelineStatus, SummaryBatchOut, YouTubeQuotaOut
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 _running = False
 _background_task: asyncio.Task[None] | None = None
+_batch_task: asyncio.Task[None] | None = None
 
 
 @router.post("/run")
@@ -37,6 +43,63 @@ async def _run_and_reset(fn):  # type: ignore[no-untyped-def]
         _running = False
 
 
+@router.post("/summary-batches")
+async def submit_summary_batches() -> dict[str, str]:
+    """Summarize the unsummarized backlog through the Batch API, applying results as jobs finish."""
+    global _running, _batch_task
+    if _running or (_batch_task is not None and not _batch_task.done()):
+        return {"status": "already_running"}
+
+    # Submitting competes with a pipeline run for the same unsummarized items
+    _running = True
+    try:
+        _batch_task = asyncio.create_task(_submit_and_wait())
+    except Exception:
+        _running = False
+        raise
+    return {"status": "started"}
+
+
+async def _submit_and_wait() -> None:
+    global _running
+    from signal_app.pipeline.batch_api import wait_for_summary_batches
+    from signal_app.pipeline.orchestrator import summarize_backlog
+
+    try:
+        pool = get_pool()
+        try:
+            await summarize_backlog(pool, offline=True)
+        finally:
+            # Waiting only polls, and concurrent polls apply each job once, so runs may start again
+            _running = False
+        await wait_for_summary_batches(pool, get_settings().summary_batch_poll_interval)
+    except Exception:
+        logger.exception("Batch summarization failed")
+
+
+@router.get("/summary-batches", response_model=list[SummaryBatchOut])
+async def list_summary_batches() -> list[SummaryBatchOut]:
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """SELECT id, batch_id, status, item_count, items_summarized, error, created_at, applied_at
+               FROM summary_batches ORDER BY created_at DESC LIMIT 20"""
+        )
+    return [
+        SummaryBatchOut(
+            id=str(r["id"]),
+            batch_id=r["batch_id"],
+            status=r["status"],
+            item_count=r["item_count"],
+            items_summarized=r["items_summarized"],
+            error=r["error"],
+            created_at=r["created_at"].isoformat(),
+            applied_at=r["applied_at"].isoformat() if r["applied_at"] else None,
+        )
+        for r in rows
+    ]
+
+
 @router.get("/status", response_model=PipelineStatus)
 async def pipeline_status() -> PipelineStatus:
     pool = get_pool()
@@ -51,6 +114,12 @@ async def pipeline_status() -> PipelineStatus:
     )
 
 
+@router.get("/quota", response_model=YouTubeQuotaOut)
+async def youtube_quota() -> YouTubeQuotaOut:
+    """Today's YouTube Data API spend against the configured daily budget."""
+    return YouTubeQuotaOut(**get_ledger().snapshot())
+
+
 @router.get("/runs", response_model=list[PipelineRunOut])
 async def list_runs() -> list[PipelineRunOut]:
     pool = get_pool()
@@ -1,14 +1,24 @@
 import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from signal_app.db import get_pool
+from signal_app.importers.opml import OpmlError, import_feeds, parse_opml
 from signal_app.models import SourceCreate, SourceOut, SourceUpdate
+from signal_app.pipeline.breaker import circuit_state
 
 router = APIRouter()
 
 
-def _source_health(error_count: int, last_fetched_at: object) -> str:
+def _source_health(error_count: int, last_fetched_at: object, next_retry_at: datetime | None = None) -> str:
+    state = circuit_state(error_count, next_retry_at, datetime.now(tz=UTC))
+    if state == "open":
+        return "paused"
+    if state == "half_open":
+        return "probing"
     if error_count >= 3:
         return "error"
     if error_count >= 1:
@@ -29,9 +39,10 @@ def _row_to_source(row: dict, items_today: int = 0, total_items: int = 0) -> Sou
         last_fetched_at=row["last_fetched_at"].isoformat() if row.get("last_fetched_at") else None,
         last_error=row.get("last_error"),
         error_count=row.get("error_count", 0),
+        next_retry_at=row["next_retry_at"].isoformat() if row.get("next_retry_at") else None,
         items_today=items_today,
         total_items=total_items,
-        health=_source_health(row.get("error_count", 0), row.get("last_fetched_at")),
+        health=_source_health(row.get("error_count", 0), row.get("last_fetched_at"), row.get("next_retry_at")),
     )
 
 
@@ -71,6 +82,27 @@ async def create_source(data: SourceCreate) -> SourceOut:
     return _row_to_source(dict(row))  # type: ignore[arg-type]
 
 
+@router.post("/import/opml")
+async def import_opml(request: Request, fetch_interval: str = "12 hours", enabled: bool = True) -> StreamingResponse:
+    """Import the RSS/Atom feeds of an OPML file sent as the raw request body.
+
+    Streams newline-delimited JSON progress events: ``start``, one ``probe`` per
+    feed as it is validated, and ``done`` once valid feeds have been inserted.
+    """
+    try:
+        feeds = await parse_opml(request.stream())
+    except OpmlError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if not feeds:
+        raise HTTPException(status_code=400, detail="No feeds found in OPML")
+
+    async def events() -> AsyncIterator[str]:
+        async for event in import_feeds(feeds, fetch_interval, enabled):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/{source_id}", response_model=SourceOut)
 async def get_source(source_id: str) -> SourceOut:
     pool = get_pool()
@@ -116,6 +148,10 @@ async def update_source(source_id: str, data: SourceUpdate) -> SourceOut:
     if not sets:
         return await get_source(source_id)
 
+    # A reconfigured or re-enabled source gets fetched on the next run instead of waiting out its backoff
+    if data.config is not None or data.enabled is not None:
+        sets.append("next_retry_at = NULL")
+
     sets.append("updated_at = now()")
     async with pool.acquire() as conn:
         await conn.execute(
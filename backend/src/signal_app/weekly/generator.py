@@ -1,8 +1,7 @@
 import logging
 
-from openai import AsyncOpenAI
-
 from signal_app.config import get_settings
+from signal_app.llm import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +54,7 @@ async def generate_weekly_review(
             user_content += f"- Curator note: {item['star_note']}\n"
         user_content += "\n"
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_llm_client()
 
     try:
         response = await client.chat.completions.create(
@@ -1,7 +1,19 @@
 """Shared test fixtures for Signal backend tests."""
 
+from unittest.mock import patch
+
 import pytest
 
+from signal_app.fetchers.ratelimit import UNLIMITED, HostLimiter
+
+
+@pytest.fixture(autouse=True)
+def unlimited_hosts():
+    """Tests don't wait on per-host politeness limits (each test gets a fresh limiter)."""
+    limiter = HostLimiter({}, default=UNLIMITED)
+    with patch("signal_app.fetchers.ratelimit._limiter", limiter):
+        yield limiter
+
 
 @pytest.fixture
 def rss_feed_xml() -> str:
@@ -72,3 +84,46 @@ def hn_story_details() -> dict[int, dict]:
             "type": "story",
         },
     }
+
+
+@pytest.fixture
+def youtube_channel_feed_xml() -> str:
+    """Sample YouTube channel Atom feed (``/feeds/videos.xml``)."""
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+      xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+  <yt:channelId>UCtest</yt:channelId>
+  <title>Test Channel</title>
+  <author><name>Test Channel</name><uri>https://www.youtube.com/channel/UCtest</uri></author>
+  <entry>
+    <id>yt:video:vid1</id>
+    <yt:videoId>vid1</yt:videoId>
+    <yt:channelId>UCtest</yt:channelId>
+    <title>Video One</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v=vid1"/>
+    <author><name>Test Channel</name><uri>https://www.youtube.com/channel/UCtest</uri></author>
+    <published>2026-02-25T15:00:00+00:00</published>
+    <media:group>
+      <media:title>Video One</media:title>
+      <media:thumbnail url="https://i1.ytimg.com/vi/vid1/hqdefault.jpg" width="480" height="360"/>
+      <media:description>First video description</media:description>
+      <media:community>
+        <media:statistics views="1234"/>
+      </media:community>
+    </media:group>
+  </entry>
+  <entry>
+    <id>yt:video:vid2</id>
+    <yt:videoId>vid2</yt:videoId>
+    <yt:channelId>UCtest</yt:channelId>
+    <title>Video Two</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v=vid2"/>
+    <author><name>Test Channel</name><uri>https://www.youtube.com/channel/UCtest</uri></author>
+    <published>2026-02-24T15:00:00+00:00</published>
+    <media:group>
+      <media:title>Video Two</media:title>
+      <media:thumbnail url="https://i1.ytimg.com/vi/vid2/hqdefault.jpg" width="480" height="360"/>
+      <media:description>Second video description</media:description>
+    </media:group>
+  </entry>
+</feed>"""
@@ -0,0 +1,226 @@
+"""Tests for Batch API summarization, against a local stand-in for the OpenAI API."""
+
+import asyncio
+import json
+import re
+import socket
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from openai import AsyncOpenAI
+
+from signal_app.pipeline.batch_api import poll_summary_batches, submit_summary_batch
+from signal_app.pipeline.summaries import PendingSummary
+from signal_app.routes import pipeline as routes
+
+
+def _stand_in_app(state: SimpleNamespace) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/files")
+    async def upload(request: Request):
+        body = (await request.body()).decode()
+        # Multipart upload: the file part is the JSONL lines
+        state.files["file-in"] = "\n".join(line for line in body.splitlines() if line.startswith('{"custom_id"'))
+        return {
+            "id": "file-in",
+            "object": "file",
+            "bytes": len(body),
+            "created_at": 0,
+            "filename": "summaries.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    @app.post("/v1/batches")
+    async def create(payload: dict):
+        state.batch = {
+            "id": "batch-1",
+            "object": "batch",
+            "endpoint": payload["endpoint"],
+            "input_file_id": payload["input_file_id"],
+            "completion_window": payload["completion_window"],
+            "status": "validating",
+            "created_at": 0,
+        }
+        return state.batch
+
+    @app.get("/v1/batches/{batch_id}")
+    async def retrieve(batch_id: str):
+        return state.batch
+
+    @app.get("/v1/files/{file_id}/content")
+    async def content(file_id: str):
+        return PlainTextResponse(state.files[file_id])
+
+    return app
+
+
+def _complete(state: SimpleNamespace, failed: set[str]) -> None:
+    """Finish the job: summarize every request in the input file except ``failed`` ones."""
+    output = []
+    for line in state.files["file-in"].splitlines():
+        request = json.loads(line)
+        if request["custom_id"] in failed:
+            output.append({"custom_id": request["custom_id"], "response": {"status_code": 500, "body": {}}})
+            continue
+        user_message = request["body"]["messages"][1]["content"]
+        results = [
+            {"index": int(index), "summary": f"About {title}", "categories": ["ai-ml"], "confidence": [0.9]}
+            for index, title in re.findall(r"\[Item (\d+)\]\nTitle: (.*)", user_message)
+        ]
+        body = {"choices": [{"message": {"content": json.dumps({"results": results})}, "finish_reason": "stop"}]}
+        output.append({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}})
+    state.files["file-out"] = "\n".join(json.dumps(line) for line in output)
+    state.batch |= {"status": "completed", "output_file_id": "file-out"}
+
+
+@pytest.fixture
+async def stand_in():
+    state = SimpleNamespace(files={}, batch=None)
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(_stand_in_app(state), log_level="warning"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+    client = AsyncOpenAI(api_key="test-key", base_url=f"http://127.0.0.1:{sock.getsockname()[1]}/v1", max_retries=0)
+    yield state, client
+    await client.close()
+    server.should_exit = True
+    await task
+
+
+class FakeConn:
+    """``summary_batches`` in memory, plus the writes of the summary path."""
+
+    def __init__(self) -> None:
+        self.batches: list[dict] = []
+        self.executed: list[tuple] = []
+
+    async def fetch(self, query: str, *args):
+        if "FROM categories" in query:
+            return [{"id": "c-ai", "slug": "ai-ml"}]
+        if "FROM summary_batches" in query:
+            return [row for row in self.batches if row["applied_at"] is None]
+        raise AssertionError(query)
+
+    async def fetchval(self, query: str, *args):
+        row = next(row for row in self.batches if row["id"] == args[0])
+        if row["applied_at"] is not None:
+            return None
+        row.update(status=args[1], error=args[2], applied_at="now")
+        return row["id"]
+
+    async def execute(self, query: str, *args):
+        query = " ".join(query.split())
+        if query.startswith("INSERT INTO summary_batches"):
+            batch_id, _file_id, status, version, requests, item_ids, count = args
+            self.batches.append(
+                {"id": "row-1", "batch_id": batch_id, "prompt_version": version, "requests": requests}
+                | {"status": status, "item_ids": item_ids, "item_count": count, "applied_at": None}
+            )
+        self.executed.append((query, args))
+
+    def transaction(self) -> MagicMock:
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock(return_value=None)
+        transaction.__aexit__ = AsyncMock(return_value=False)
+        return transaction
+
+    def statements(self, prefix: str) -> list[tuple]:
+        return [args for query, args in self.executed if query.startswith(prefix)]
+
+
+def _pool(conn: FakeConn) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+class TestBatchSummaries:
+    async def test_submit_poll_and_apply_once(self, stand_in):
+        state, client = stand_in
+        pending = [
+            PendingSummary("h1", ("i1", "i2"), "First story", "Body one"),
+            PendingSummary("h2", ("i3",), "Second story", "Body two"),
+            PendingSummary("h3", ("i4",), "Third story", "Body three"),
+        ]
+        conn = FakeConn()
+
+        with (
+            patch("signal_app.pipeline.batch_api.get_llm_client", return_value=client),
+            patch("signal_app.pipeline.batch_api.get_settings") as mock_settings,
+            patch("signal_app.pipeline.summarizer.get_settings") as summarizer_settings,
+        ):
+            settings = mock_settings.return_value
+            settings.openai_api_key = "test-key"
+            settings.openai_model = "gpt-test"
+            settings.summarize_prompt_tokens = 12000
+            settings.summarize_completion_tokens = 150  # room for one item's output per request
+            settings.summarize_target_latency = 30.0
+            summarizer_settings.return_value = settings
+
+            batch_id = await submit_summary_batch(_pool(conn), pending, "System prompt", "v1")
+
+            # One request per item, with the live summarizer's parameters
+            requests = [json.loads(line) for line in state.files["file-in"].splitlines()]
+            assert batch_id == "batch-1"
+            assert [r["custom_id"] for r in requests] == ["summaries-0", "summaries-1", "summaries-2"]
+            assert requests[0]["url"] == "/v1/chat/completions"
+            assert requests[0]["body"]["model"] == "gpt-test"
+            assert requests[0]["body"]["max_tokens"] == 150
+            assert "Title: First story" in requests[0]["body"]["messages"][1]["content"]
+            assert conn.batches[0]["item_ids"] == ["i1", "i2", "i3", "i4"]
+
+            # Still running: nothing applied
+            state.batch["status"] = "in_progress"
+            assert await poll_summary_batches(_pool(conn)) == 0
+            assert conn.statements("UPDATE summary_batches SET status")[-1] == ("row-1", "in_progress")
+            assert conn.batches[0]["applied_at"] is None
+
+            _complete(state, failed={"summaries-2"})
+            assert await poll_summary_batches(_pool(conn)) == 3
+            # Applied once; later polls find nothing left to do
+            assert await poll_summary_batches(_pool(conn)) == 0
+
+        updates = {args[1]: args[0] for args in conn.statements("UPDATE items SET summary")}
+        assert updates == {"i1": "About First story", "i2": "About First story", "i3": "About Second story"}
+        assert conn.batches[0]["status"] == "completed"
+        (hashes, _summaries, _categories, version) = conn.statements("INSERT INTO summary_cache")[0]
+        assert (hashes, version) == (["h1"], "v1")
+        assert conn.statements("UPDATE summary_batches SET items_summarized")[-1] == ("row-1", 3)
+
+    async def test_no_api_key_submits_nothing(self):
+        with patch("signal_app.pipeline.batch_api.get_settings") as mock_settings:
+            mock_settings.return_value.openai_api_key = ""
+            assert await submit_summary_batch(MagicMock(), [PendingSummary("h", ("i",), "T", "")], "S", "v") is None
+
+    async def test_submission_holds_off_pipeline_runs(self, monkeypatch):
+        monkeypatch.setattr(routes, "_running", False)
+        monkeypatch.setattr(routes, "_batch_task", None)
+        submitting, release = asyncio.Event(), asyncio.Event()
+
+        async def summarize_backlog(pool, offline):
+            submitting.set()
+            await release.wait()
+            return 0
+
+        with (
+            patch("signal_app.routes.pipeline.get_pool"),
+            patch("signal_app.pipeline.orchestrator.summarize_backlog", summarize_backlog),
+            patch("signal_app.pipeline.batch_api.wait_for_summary_batches", AsyncMock(return_value=0)) as wait,
+        ):
+            assert await routes.submit_summary_batches() == {"status": "started"}
+            await submitting.wait()
+            assert await routes.trigger_pipeline() == {"status": "already_running"}
+
+            release.set()
+            await routes._batch_task
+            assert not routes._running
+            wait.assert_awaited_once()
@@ -0,0 +1,114 @@
+"""Tests for token-budget batching of summarizer requests."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from signal_app.pipeline import batching
+from signal_app.pipeline.batching import MAX_BATCH_ITEMS, TokenBatcher, count_tokens, truncate_tokens
+from signal_app.pipeline.summarizer import summarize_items
+
+
+def _batcher(**kwargs) -> TokenBatcher:
+    options = {"system_tokens": 100, "prompt_budget": 1000, "completion_budget": 4000, "target_latency": 30.0}
+    return TokenBatcher(**(options | kwargs), count=len)
+
+
+class TestTokenCounting:
+    def test_estimates_without_an_encoding(self):
+        with patch.object(batching, "_encoding", return_value=None):
+            assert count_tokens("a" * 35) == 10
+            assert truncate_tokens("a" * 100, 10) == "a" * 35
+            assert truncate_tokens("short", 10) == "short"
+
+    def test_uses_the_encoding_when_loaded(self):
+        encoding = MagicMock()
+        encoding.encode.side_effect = lambda text, **_: text.split()
+        encoding.decode.side_effect = " ".join
+        with patch.object(batching, "_encoding", return_value=encoding):
+            assert count_tokens("one two three") == 3
+            assert truncate_tokens("one two three", 2) == "one two"
+            assert truncate_tokens("one two", 2) == "one two"
+
+
+class TestTokenBatcher:
+    def test_packs_to_the_prompt_budget(self):
+        batcher = _batcher(completion_budget=100_000)
+        # 100 system tokens + 300 per item: three items fit in 1000
+        assert list(batcher.batches([300] * 7)) == [[0, 1, 2], [3, 4, 5], [6]]
+        # Short items fill a request up to the item cap
+        assert list(batcher.batches([1] * 60)) == [list(range(MAX_BATCH_ITEMS)), list(range(50, 60))]
+
+    def test_oversized_item_gets_its_own_batch(self):
+        assert list(_batcher().batches([50, 5000, 50])) == [[0], [1], [2]]
+
+    def test_reserves_completion_tokens_for_the_output(self):
+        batcher = _batcher(prompt_budget=100_000, completion_budget=1500)
+        # 1500 / (120 * 1.25) = 10 items' worth of output
+        assert batcher.capacity() == 10
+        assert [len(batch) for batch in batcher.batches([10] * 25)] == [10, 10, 5]
+
+    def test_output_estimate_follows_usage(self):
+        batcher = _batcher(completion_budget=1500)
+        batcher.observe(10, 1.0, completion_tokens=2000, truncated=False)  # 200 per item, not 120
+        assert batcher.output_per_item == 0.7 * 120 + 0.3 * 200
+        assert batcher.capacity() == 8
+
+    def test_truncation_halves_later_batches(self):
+        batcher = _batcher(prompt_budget=100_000)
+        batches = batcher.batches([10] * 40)
+        first = next(batches)
+        assert len(first) == 26  # 4000 / (120 * 1.25)
+        batcher.observe(len(first), 5.0, completion_tokens=4000, truncated=True)
+        assert len(next(batches)) == 13
+        assert batcher.output_per_item == 120  # truncated usage doesn't count as a per-item rate
+
+    def test_latency_shrinks_and_grows_batches(self):
+        batcher = _batcher()
+        batcher.observe(20, 45.0, completion_tokens=None, truncated=False)
+        assert batcher.max_items == 15
+        batcher.observe(15, 10.0, completion_tokens=None, truncated=False)
+        assert batcher.max_items == 16
+        batcher.observe(3, 10.0, completion_tokens=None, truncated=False)  # small batch says nothing about size
+        assert batcher.max_items == 16
+
+
+def _response(content: str, finish_reason: str = "stop", completion_tokens: int = 250) -> MagicMock:
+    choice = MagicMock()
+    choice.message.content = content
+    choice.finish_reason = finish_reason
+    response = MagicMock()
+    response.choices = [choice]
+    response.usage.completion_tokens = completion_tokens
+    return response
+
+
+class TestSummarizeItems:
+    async def _summarize(self, response: MagicMock, batcher: TokenBatcher) -> tuple[list, AsyncMock]:
+        client = AsyncMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        items = [{"index": 0, "title": "A", "content": "a"}, {"index": 1, "title": "B", "content": "b"}]
+        with (
+            patch("signal_app.pipeline.summarizer.get_settings") as mock_settings,
+            patch("signal_app.pipeline.summarizer.get_categories", AsyncMock(return_value=())),
+            patch("signal_app.pipeline.summarizer.get_llm_client", return_value=client),
+        ):
+            mock_settings.return_value.openai_api_key = "test-key"
+            mock_settings.return_value.summarize_completion_tokens = 4000
+            results = await summarize_items(items, batcher)
+        return results, client
+
+    async def test_reports_usage_and_caps_output(self):
+        batcher = _batcher()
+        content = '{"results": [{"index": 0, "summary": "S"}, {"index": 1, "summary": "T"}]}'
+        results, client = await self._summarize(_response(content), batcher)
+
+        assert results == [{"index": 0, "summary": "S"}, {"index": 1, "summary": "T"}]
+        assert client.chat.completions.create.await_args.kwargs["max_tokens"] == 4000
+        assert batcher.output_per_item == 0.7 * 120 + 0.3 * 125
+        assert batcher.max_items == MAX_BATCH_ITEMS
+
+    async def test_truncated_json_shrinks_batches(self):
+        batcher = _batcher()
+        results, _ = await self._summarize(_response('{"results": [{"index": 0, "summ', "length", 4000), batcher)
+
+        assert results == []
+        assert batcher.max_items == 1  # a 2-item request was cut off
@@ -0,0 +1,41 @@
+"""Tests for the source circuit breaker."""
+
+from datetime import UTC, datetime, timedelta
+
+from signal_app.pipeline.breaker import BASE_BACKOFF, MAX_BACKOFF, circuit_state, next_retry_at
+from signal_app.routes.sources import _source_health
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+class TestNextRetryAt:
+    def test_closed_below_threshold(self):
+        assert next_retry_at(1, NOW) is None
+        assert next_retry_at(2, NOW) is None
+
+    def test_backoff_doubles_with_jitter(self):
+        for failures, full in [(3, BASE_BACKOFF), (4, BASE_BACKOFF * 2), (6, BASE_BACKOFF * 8)]:
+            retry = next_retry_at(failures, NOW)
+            assert retry is not None
+            assert NOW + full / 2 <= retry <= NOW + full
+
+    def test_backoff_is_capped(self):
+        retry = next_retry_at(500, NOW)
+        assert retry is not None
+        assert retry - NOW <= MAX_BACKOFF
+
+
+class TestCircuitState:
+    def test_states(self):
+        assert circuit_state(0, None, NOW) == "closed"
+        assert circuit_state(5, None, NOW) == "closed"  # reset by a config change
+        assert circuit_state(5, NOW + timedelta(hours=1), NOW) == "open"
+        assert circuit_state(5, NOW - timedelta(minutes=1), NOW) == "half_open"
+
+    def test_source_health_exposes_breaker(self):
+        future = datetime.now(tz=UTC) + timedelta(hours=1)
+        past = datetime.now(tz=UTC) - timedelta(hours=1)
+        assert _source_health(5, None, future) == "paused"
+        assert _source_health(5, None, past) == "probing"
+        assert _source_health(5, None) == "error"
+        assert _source_health(1, NOW) == "warning"
@@ -0,0 +1,188 @@
+"""Tests for the local category classifier and its use in the summarize step."""
+
+import json
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from signal_app.pipeline import classifier as classifier_module
+from signal_app.pipeline.classifier import (
+    MANUAL_WEIGHT,
+    MIN_EXAMPLES,
+    CentroidClassifier,
+    features,
+    refresh_classifier,
+    reset_classifier,
+    sampled_for_llm,
+)
+from signal_app.pipeline.orchestrator import _classify
+from signal_app.pipeline.summaries import PendingSummary, content_hash
+from signal_app.pipeline.summarizer import request_params
+
+AI = "A new language model beats the reasoning benchmark after more training on GPU clusters"
+SECURITY = "Attackers exploit an unpatched vulnerability; the vendor ships a security patch for the CVE"
+WEB = "The browser release adds CSS nesting and faster JavaScript rendering for frontend developers"
+
+
+def _trained(examples: int = MIN_EXAMPLES) -> CentroidClassifier:
+    classifier = CentroidClassifier()
+    for n in range(examples):
+        classifier.learn(f"{AI} {n}", ["c-ai"])
+        classifier.learn(f"{SECURITY} {n}", ["c-sec"])
+    return classifier
+
+
+def _pool(conn) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+class TestFeatures:
+    def test_hashed_words_and_pairs(self):
+        indices, values = features("<p>The model</p> and the model weights")
+        # "model", "weights", "model model", "model weights"; stopwords dropped
+        assert len(indices) == 4
+        assert np.linalg.norm(values) == pytest.approx(1.0)
+        assert len(features("the and of")[0]) == 0
+
+
+class TestCentroidClassifier:
+    def test_confident_on_clear_items(self):
+        classifier = _trained()
+        ai, security, unrelated = classifier.predict(
+            ["New language model tops the reasoning benchmark", "Vendor patch for exploited CVE", "Gardening tips"],
+            threshold=0.7,
+        )
+        assert ai.confident
+        assert ai.categories[0][0] == "c-ai"
+        assert security.categories[0][0] == "c-sec"
+        assert not unrelated.confident
+
+    def test_categories_with_few_examples_are_never_predicted(self):
+        classifier = _trained()
+        classifier.learn(WEB, ["c-web"])
+        (prediction,) = classifier.predict([WEB], threshold=0.7)
+        assert "c-web" not in dict(prediction.categories)
+        assert CentroidClassifier().predict([AI], threshold=0.7)[0].categories == ()
+
+    def test_round_trip_and_deleted_categories(self):
+        classifier = _trained()
+        restored = CentroidClassifier.from_bytes(classifier.to_bytes())
+        assert restored.predict([AI, SECURITY], 0.7) == classifier.predict([AI, SECURITY], 0.7)
+
+        restored.keep_categories(["c-ai"])
+        assert restored.category_ids == ["c-ai"]
+        # One category left: nothing to tell apart
+        assert not restored.predict([AI], 0.7)[0].confident
+
+
+class RefreshConn:
+    """Just enough of an asyncpg connection for training."""
+
+    def __init__(self, state: dict | None, labels: list[dict]) -> None:
+        self.state = state
+        self.labels = labels
+        self.label_queries: list[tuple] = []
+        self.stored: tuple | None = None
+
+    async def fetchrow(self, query: str, *args):
+        assert "FROM classifier_state" in query
+        return self.state
+
+    async def fetch(self, query: str, *args):
+        if "FROM categories" in query:
+            return [{"id": "c-ai"}, {"id": "c-sec"}]
+        assert "FROM item_categories" in query
+        self.label_queries.append(args)
+        # Watermark at the start: the whole table; afterwards nothing new
+        return self.labels if args[0] == "-infinity" else []
+
+    async def execute(self, query: str, *args):
+        self.stored = args
+
+
+class TestRefresh:
+    @pytest.fixture(autouse=True)
+    def _no_loaded_model(self, monkeypatch):
+        monkeypatch.setattr(classifier_module, "_classifier", None)
+
+    async def test_trains_from_scratch_then_incrementally(self):
+        labeled_at = datetime(2026, 1, 1, tzinfo=UTC)
+        labels = [
+            {
+                "item_id": f"i{n}",
+                "category_id": category,
+                "is_auto": n != 0,
+                "labeled_at": labeled_at + timedelta(seconds=n),
+                "title": text,
+                "content": None,
+            }
+            for n in range(MIN_EXAMPLES)
+            for category, text in (("c-ai", AI), ("c-sec", SECURITY))
+        ]
+        conn = RefreshConn(None, labels)
+        classifier = await refresh_classifier(_pool(conn))
+
+        assert classifier_module.get_classifier() is classifier
+        # The manual label (i0) counts MANUAL_WEIGHT times
+        assert classifier.weights.tolist() == [MIN_EXAMPLES - 1 + MANUAL_WEIGHT] * 2
+        model, watermark, trained_at = conn.stored
+        assert json.loads(watermark)["item_id"] == labels[-1]["item_id"]
+
+        # Next run: resumes from the stored watermark and keeps the model in memory
+        conn = RefreshConn({"model": model, "watermark": watermark, "trained_at": trained_at}, labels)
+        assert await refresh_classifier(_pool(conn)) is classifier
+        assert conn.label_queries[0][1] == labels[-1]["item_id"]
+        assert conn.stored is None  # nothing new to store
+
+    async def test_reset_drops_the_model(self, monkeypatch):
+        monkeypatch.setattr(classifier_module, "_classifier", _trained())
+        conn = RefreshConn(None, [])
+        await reset_classifier(_pool(conn))
+
+        assert classifier_module.get_classifier() is None
+        assert conn.stored == ()  # DELETE FROM classifier_state
+
+    async def test_stale_model_is_rebuilt(self):
+        stale = {
+            "model": CentroidClassifier().to_bytes(),
+            "watermark": {"labeled_at": "2026-01-01T00:00:00+00:00", "item_id": "i9", "category_id": "c-ai"},
+            "trained_at": datetime.now(UTC) - timedelta(days=30),
+        }
+        conn = RefreshConn(stale, [])
+        await refresh_classifier(_pool(conn))
+        assert conn.label_queries[0][0] == "-infinity"
+
+
+class TestClassify:
+    async def test_confident_groups_are_categorized_locally(self):
+        title = next(f"{AI} {n}" for n in range(100) if not sampled_for_llm(content_hash(f"{AI} {n}", "")))
+        groups = [
+            PendingSummary(content_hash(title, ""), ("i1", "i2"), title, ""),
+            PendingSummary(content_hash("Gardening", ""), ("i3",), "Gardening tips for spring", ""),
+        ]
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        with (
+            patch("signal_app.pipeline.orchestrator.get_settings") as mock_settings,
+            patch("signal_app.pipeline.orchestrator.get_classifier", return_value=_trained()),
+        ):
+            mock_settings.return_value.classifier = True
+            mock_settings.return_value.classifier_threshold = 0.7
+            classified = await _classify(_pool(conn), groups, {"ai-ml": "c-ai", "security": "c-sec"})
+
+        assert list(classified) == [groups[0].content_hash]
+        assert [slug for slug, _ in classified[groups[0].content_hash]] == ["ai-ml"]
+        item_ids, category_ids, _confidences, labeler = conn.execute.await_args.args[1:]
+        assert (item_ids, category_ids, labeler) == (["i1", "i2"], ["c-ai", "c-ai"], "classifier")
+
+        # The LLM is told not to categorize them
+        params = request_params(
+            "system", [replace(groups[0], local_categories=(("ai-ml", 0.9),)).as_item(0), groups[1].as_item(1)]
+        )
+        assert params["messages"][1]["content"].count("Categorize: no") == 1
@@ -0,0 +1,96 @@
+"""Tests for extractive (TextRank) summaries and the summarizer engines."""
+
+from unittest.mock import patch
+
+import pytest
+
+from signal_app.pipeline.engines import ExtractiveEngine, LLMEngine, get_summary_engine
+from signal_app.pipeline.extractive import (
+    MAX_CHARS,
+    MAX_INPUT_CHARS,
+    extractive_summary,
+    plain_text,
+    rank_sentences,
+    split_sentences,
+)
+
+ARTICLE = (
+    "<p>OpenAI released a new reasoning model on Tuesday.</p>"
+    "<p>The reasoning model improves math benchmark scores by a wide margin. "
+    "Pricing is unchanged from the previous generation. "
+    "Critics say math benchmark scores do not reflect real reasoning work. "
+    "The weather in San Francisco was pleasant all week. "
+    "The reasoning model is available in the API today.</p>"
+)
+
+
+class TestText:
+    def test_plain_text_strips_markup_and_entities(self):
+        assert plain_text("<p>Fish &amp; chips</p>\n<br/>  today") == "Fish & chips today"
+
+    def test_split_sentences(self):
+        assert split_sentences('He said "Go." Then left! Version 2.5 is out? Yes.') == [
+            'He said "Go."',
+            "Then left!",
+            "Version 2.5 is out?",
+            "Yes.",
+        ]
+
+
+class TestTextRank:
+    def test_central_sentences_rank_highest(self):
+        sentences = split_sentences(plain_text(ARTICLE))
+        scores = rank_sentences(sentences)
+
+        assert scores.sum() == pytest.approx(1.0)
+        assert scores.argmax() == 1  # shares the most words with the rest
+        assert scores[4] == scores.min()  # the weather is off-topic
+
+    def test_summary_keeps_reading_order(self):
+        summary = extractive_summary(ARTICLE)
+        assert summary == (
+            "The reasoning model improves math benchmark scores by a wide margin. "
+            "Critics say math benchmark scores do not reflect real reasoning work."
+        )
+
+    def test_short_and_long_texts(self):
+        assert extractive_summary("") == ""
+        assert extractive_summary("<b>Just a teaser</b>") == "Just a teaser"
+        long = extractive_summary(" ".join(["word"] * 500))
+        assert len(long) <= MAX_CHARS + 1
+        assert long.endswith("…")
+
+    def test_only_the_lead_of_a_long_text_is_read(self):
+        lead = (
+            "The reasoning model improves math benchmark scores by a wide margin. "
+            "Critics say math benchmark scores do not reflect real reasoning work."
+        )
+        # The sentence cut off at MAX_INPUT_CHARS is dropped rather than ranked half-read
+        text = f"{lead} The math benchmark {'scores ' * MAX_INPUT_CHARS}end."
+        assert extractive_summary(text) == lead
+
+
+class TestEngines:
+    def test_auto_picks_the_llm_only_with_a_key(self):
+        with patch("signal_app.pipeline.engines.get_settings") as mock_settings:
+            mock_settings.return_value.summary_engine = "auto"
+            mock_settings.return_value.openai_api_key = ""
+            assert isinstance(get_summary_engine(), ExtractiveEngine)
+
+            mock_settings.return_value.openai_api_key = "test-key"
+            mock_settings.return_value.openai_model = "gpt-test"
+            engine = get_summary_engine()
+            assert isinstance(engine, LLMEngine)
+            assert engine.model == "gpt-test"
+            assert isinstance(get_summary_engine("extractive"), ExtractiveEngine)
+            with pytest.raises(ValueError):
+                get_summary_engine("nope")
+
+    async def test_extractive_engine_results(self):
+        items = [{"index": 0, "title": "A", "content": ARTICLE}, {"index": 1, "title": "B", "content": ""}]
+        results = await ExtractiveEngine().summarize(items)
+
+        # Nothing to extract from an empty item
+        assert [result["index"] for result in results] == [0]
+        assert results[0]["summary"].startswith("The reasoning model improves")
+        assert results[0]["categories"] == []
@@ -0,0 +1,131 @@
+"""Tests for full-article extraction."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import respx
+from httpx import Response
+
+from signal_app.pipeline.extractor import canonical_url, extract_articles, extract_main_text, needs_extraction
+
+ARTICLE = """<!DOCTYPE html>
+<html><head><title>Post</title><script>var tracking = 1;</script></head>
+<body>
+  <header><nav><a href="/">Home</a> <a href="/about">About us and our long list of sections</a></nav></header>
+  <div class="layout">
+    <article>
+      <h1>The headline</h1>
+      <p>The first paragraph explains, in some detail, what the model does and why it matters to anyone.</p>
+      <p>A second paragraph adds context, numbers, and a quote from the team that built the thing.</p>
+      <p>Short.</p>
+    </article>
+    <div class="sidebar"><p>Subscribe to our newsletter for more posts like this one, every single week.</p></div>
+    <div class="comments"><p>Great post, thanks for writing it, I learned a lot from reading this today!</p></div>
+  </div>
+  <footer><p>Copyright 2026 Example Inc, all rights reserved, no part may be reproduced.</p></footer>
+</body></html>"""
+
+
+def _mock_pool(cached: list[dict]) -> tuple[MagicMock, AsyncMock]:
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=cached)
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return mock_pool, mock_conn
+
+
+class TestCanonicalUrl:
+    def test_strips_tracking_fragment_and_trailing_slash(self):
+        assert (
+            canonical_url("https://Example.com/post/?utm_source=hn&id=3&fbclid=x#comments")
+            == "https://example.com/post?id=3"
+        )
+        assert canonical_url("https://example.com") == "https://example.com/"
+
+
+class TestNeedsExtraction:
+    def test_short_content_on_article_hosts_only(self):
+        assert needs_extraction("https://blog.example.com/post", None)
+        assert needs_extraction("https://blog.example.com/post", "A teaser.")
+        assert not needs_extraction("https://blog.example.com/post", "x" * 600)
+        assert not needs_extraction("https://www.youtube.com/watch?v=abc", None)
+        assert not needs_extraction("https://old.reddit.com/r/x/comments/1", None)
+        assert not needs_extraction("mailto:someone@example.com", None)
+
+
+class TestExtractMainText:
+    def test_keeps_article_body_and_drops_boilerplate(self):
+        text = extract_main_text(ARTICLE)
+
+        assert text is not None
+        assert "The first paragraph explains" in text
+        assert "A second paragraph adds context" in text
+        assert "newsletter" not in text
+        assert "Great post" not in text
+        assert "Copyright" not in text
+        assert "tracking" not in text
+
+    def test_page_without_prose(self):
+        assert extract_main_text("<html><body><a href='/'>Home</a></body></html>") is None
+
+
+class TestExtractArticles:
+    @respx.mock
+    async def test_uses_cache_downloads_misses_and_caches_results(self):
+        fresh = respx.get("https://fresh.example.com/post").mock(
+            return_value=Response(200, text=ARTICLE, headers={"content-type": "text/html; charset=utf-8"})
+        )
+        broken = respx.get("https://broken.example.com/post").mock(return_value=Response(404))
+        cached = respx.get("https://cached.example.com/post")
+        items = [
+            ("1", "https://fresh.example.com/post?utm_source=rss", None),
+            ("2", "https://cached.example.com/post", ""),
+            ("3", "https://broken.example.com/post", None),
+            ("4", "https://long.example.com/post", "x" * 600),
+            ("5", "https://fresh.example.com/post/", "Teaser"),  # same article as item 1
+        ]
+        mock_pool, mock_conn = _mock_pool([{"canonical_url": "https://cached.example.com/post", "content": "Cached"}])
+
+        with (
+            patch("signal_app.pipeline.extractor.get_pool", return_value=mock_pool),
+            patch("signal_app.pipeline.extractor.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.extract_concurrency = 2
+            mock_settings.return_value.article_max_bytes = 1_000_000
+            articles = await extract_articles(items)
+
+        assert set(articles) == {"1", "2", "5"}
+        assert "The first paragraph explains" in articles["1"]
+        assert articles["5"] == articles["1"]
+        assert articles["2"] == "Cached"
+        assert fresh.call_count == 1
+        assert broken.call_count == 1
+        assert not cached.called
+
+        # Both downloads are cached in one statement, the failure with its error
+        urls, contents, errors = mock_conn.execute.call_args.args[1:]
+        cache = dict(zip(urls, zip(contents, errors, strict=True), strict=True))
+        assert cache["https://broken.example.com/post"] == (None, "HTTP 404")
+        assert cache["https://fresh.example.com/post"][1] is None
+
+    @respx.mock
+    async def test_unexpected_error_is_cached_like_a_failed_download(self):
+        respx.get("https://fresh.example.com/post").mock(
+            return_value=Response(200, text=ARTICLE, headers={"content-type": "text/html"})
+        )
+        respx.get("https://odd.example.com/post").mock(side_effect=RuntimeError("boom"))
+        items = [("1", "https://fresh.example.com/post", None), ("2", "https://odd.example.com/post", None)]
+        mock_pool, mock_conn = _mock_pool([])
+
+        with (
+            patch("signal_app.pipeline.extractor.get_pool", return_value=mock_pool),
+            patch("signal_app.pipeline.extractor.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.extract_concurrency = 2
+            mock_settings.return_value.article_max_bytes = 1_000_000
+            articles = await extract_articles(items)
+
+        assert set(articles) == {"1"}
+        urls, contents, errors = mock_conn.execute.call_args.args[1:]
+        cache = dict(zip(urls, zip(contents, errors, strict=True), strict=True))
+        assert cache["https://odd.example.com/post"] == (None, "RuntimeError")
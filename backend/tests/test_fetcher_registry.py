@@ -1,5 +1,8 @@
 """Tests for the fetcher registry."""
 
+import subprocess
+import sys
+
 from signal_app.fetchers import FETCHER_REGISTRY, get_fetcher
 from signal_app.fetchers.arxiv import ArxivFetcher
 from signal_app.fetchers.bluesky import BlueskyFetcher
@@ -53,3 +56,21 @@ class TestFetcherRegistry:
         # 'manual' is not in the registry — items added via API
         fetcher = get_fetcher("manual", "source-1", {})
         assert fetcher is None
+
+    def test_package_reexports_fetcher_classes(self):
+        from signal_app.fetchers import RawItem as ReexportedRawItem
+        from signal_app.fetchers import RSSFetcher as ReexportedRSSFetcher
+        from signal_app.fetchers.base import RawItem
+
+        assert ReexportedRSSFetcher is RSSFetcher
+        assert ReexportedRawItem is RawItem
+
+    def test_startup_does_not_import_fetchers_or_llm_client(self):
+        # A fresh interpreter: this one has long since imported everything
+        code = (
+            "import sys, signal_app.main, signal_app.fetchers.youtube_quota\n"
+            "heavy = ('feedparser', 'openai', 'numpy', 'signal_app.fetchers.rss')\n"
+            "print(','.join(m for m in heavy if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ""
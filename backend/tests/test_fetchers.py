@@ -1,14 +1,26 @@
 """Tests for fetcher implementations using respx to mock HTTP calls."""
 
+import asyncio
+import dataclasses
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import pytest
 import respx
 from httpx import Response
 
+from signal_app.fetchers.arxiv import ArxivFetcher
 from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.bluesky import BlueskyFetcher
+from signal_app.fetchers.github import GitHubReleasesFetcher
 from signal_app.fetchers.hackernews import HackerNewsFetcher
+from signal_app.fetchers.ratelimit import HOST_LIMITS, UNLIMITED, HostLimit, HostLimiter, HostPausedError, http_client
+from signal_app.fetchers.reddit import RedditFetcher
 from signal_app.fetchers.rss import RSSFetcher
-from signal_app.fetchers.youtube import _NON_LATIN_RE
+from signal_app.fetchers.youtube import _NON_LATIN_RE, YouTubeChannelFetcher, YouTubeSearchFetcher
+from signal_app.fetchers.youtube_quota import QuotaLedger
+from signal_app.llm import Category
 
 
 class TestBaseFetcher:
@@ -18,7 +30,13 @@ class TestBaseFetcher:
         assert item.content_raw is None
         assert item.thumbnail_url is None
         assert item.published_at is None
-        assert item.extra == {}
+        assert item.extra is None
+
+    def test_raw_item_is_frozen_and_slotted(self):
+        item = RawItem(external_id="1", title="Test", url="https://example.com")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            item.title = "Changed"  # type: ignore[misc]
+        assert not hasattr(item, "__dict__")
 
     def test_raw_item_full(self):
         item = RawItem(
@@ -44,6 +62,52 @@ class TestBaseFetcher:
             pass
 
 
+def _dated(external_id: str, published: str | None) -> RawItem:
+    return RawItem(
+        external_id=external_id,
+        title=external_id,
+        url=f"https://example.com/{external_id}",
+        published_at=datetime.fromisoformat(published) if published else None,
+    )
+
+
+class TestWatermark:
+    def test_first_run_keeps_everything_and_sets_watermark(self):
+        fetcher = RSSFetcher("source-1", {})
+        items = [_dated("a", "2026-03-01T10:00:00+00:00"), _dated("b", "2026-03-02T10:00:00+00:00")]
+
+        assert fetcher.filter_seen(items) == items
+        assert fetcher.state["watermark"] == {"published_at": "2026-03-02T10:00:00+00:00", "ids": ["b"]}
+
+    def test_drops_older_and_same_instant_seen_entries(self):
+        fetcher = RSSFetcher("source-1", {}, {"watermark": {"published_at": "2026-03-02T10:00:00+00:00", "ids": ["b"]}})
+        items = [
+            _dated("a", "2026-03-01T10:00:00+00:00"),
+            _dated("b", "2026-03-02T10:00:00+00:00"),
+            _dated("c", "2026-03-02T10:00:00+00:00"),
+            _dated("undated", None),
+        ]
+
+        assert [i.external_id for i in fetcher.filter_seen(items)] == ["c", "undated"]
+        assert fetcher.state["watermark"]["ids"] == ["b", "c"]
+
+    def test_naive_dates_are_treated_as_utc(self):
+        fetcher = RSSFetcher("source-1", {}, {"watermark": {"published_at": "2026-03-02T10:00:00+00:00", "ids": []}})
+        assert fetcher.filter_seen([_dated("a", "2026-03-02T09:00:00")]) == []
+
+    def test_future_dates_do_not_move_the_watermark(self):
+        fetcher = RSSFetcher("source-1", {})
+        fetcher.filter_seen([_dated("a", "2026-03-01T10:00:00+00:00"), _dated("typo", "2099-01-01T00:00:00+00:00")])
+        assert fetcher.state["watermark"]["ids"] == ["a"]
+
+    def test_disabled_for_unordered_sources_and_by_config(self):
+        state = {"watermark": {"published_at": "2026-03-02T10:00:00+00:00", "ids": []}}
+        old = [_dated("a", "2026-03-01T10:00:00+00:00")]
+
+        assert HackerNewsFetcher("source-1", {}, state).filter_seen(old) == old
+        assert RSSFetcher("source-1", {"watermark": False}, state).filter_seen(old) == old
+
+
 class TestRSSFetcher:
     @respx.mock
     async def test_fetch_rss(self, rss_feed_xml: str):
@@ -91,14 +155,7 @@ class TestHackerNewsFetcher:
                 return_value=Response(200, json=detail)
             )
 
-        # Mock DB pool returning categories
-        mock_conn = AsyncMock()
-        mock_conn.fetch = AsyncMock(
-            return_value=[{"name": "AI & ML", "slug": "ai-ml"}]
-        )
-        mock_pool = MagicMock()
-        mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        categories = (Category(slug="ai-ml", name="AI & ML"),)
 
         # Mock OpenAI response: only stories 0 and 1 are relevant
         mock_choice = MagicMock()
@@ -112,9 +169,9 @@ class TestHackerNewsFetcher:
         mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         with (
-            patch("signal_app.fetchers.hackernews.get_pool", return_value=mock_pool),
+            patch("signal_app.fetchers.hackernews.get_categories", AsyncMock(return_value=categories)),
             patch("signal_app.fetchers.hackernews.get_settings") as mock_settings,
-            patch("signal_app.fetchers.hackernews.AsyncOpenAI", return_value=mock_client),
+            patch("signal_app.fetchers.hackernews.get_llm_client", return_value=mock_client),
         ):
             mock_settings.return_value.openai_api_key = "test-key"
             mock_settings.return_value.openai_model = "gpt-4.1-nano"
@@ -123,6 +180,9 @@ class TestHackerNewsFetcher:
             items = await fetcher.fetch()
 
         assert len(items) == 2
+        messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[0]["content"].endswith("  - ai-ml: AI & ML")
+        assert "Show HN: AI Coding Agent" in messages[1]["content"]
         assert items[0].title == "Show HN: AI Coding Agent"
         assert items[0].external_id == "12345"
         assert items[0].extra["score"] == 150
@@ -142,14 +202,7 @@ class TestHackerNewsFetcher:
                 return_value=Response(200, json=detail)
             )
 
-        # Mock DB pool returning no categories
-        mock_conn = AsyncMock()
-        mock_conn.fetch = AsyncMock(return_value=[])
-        mock_pool = MagicMock()
-        mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("signal_app.fetchers.hackernews.get_pool", return_value=mock_pool):
+        with patch("signal_app.fetchers.hackernews.get_categories", AsyncMock(return_value=())):
             fetcher = HackerNewsFetcher("source-1", {})
             items = await fetcher.fetch()
 
@@ -158,6 +211,649 @@ class TestHackerNewsFetcher:
         assert items[2].title == "New React Framework Launched"
 
 
+class TestYouTubeChannelFetcher:
+    @respx.mock
+    async def test_fetch_feed_without_api_key(self, youtube_channel_feed_xml: str):
+        route = respx.get("https://www.youtube.com/feeds/videos.xml", params={"channel_id": "UCtest"}).mock(
+            return_value=Response(200, text=youtube_channel_feed_xml)
+        )
+
+        with patch("signal_app.fetchers.youtube.get_settings") as mock_settings:
+            mock_settings.return_value.google_api_key = ""
+            fetcher = YouTubeChannelFetcher("source-1", {"channel_id": "UCtest"})
+            items = await fetcher.fetch()
+
+        assert route.called
+        assert len(items) == 2
+        assert items[0].external_id == "vid1"
+        assert items[0].url == "https://www.youtube.com/watch?v=vid1"
+        assert items[0].author == "Test Channel"
+        assert items[0].content_raw == "First video description"
+        assert items[0].thumbnail_url == "https://i1.ytimg.com/vi/vid1/hqdefault.jpg"
+        assert items[0].published_at is not None
+        assert items[0].extra == {
+            "channel_id": "UCtest",
+            "channel_title": "Test Channel",
+            "video_id": "vid1",
+            "view_count": 1234,
+        }
+        assert "view_count" not in items[1].extra
+
+    async def test_fetch_feed_handle_without_api_key(self):
+        with patch("signal_app.fetchers.youtube.get_settings") as mock_settings:
+            mock_settings.return_value.google_api_key = ""
+            fetcher = YouTubeChannelFetcher("source-1", {"channel_handle": "@test"})
+            items = await fetcher.fetch()
+        assert items == []
+
+    @respx.mock
+    async def test_resolved_handle_is_kept_in_fetch_state(self, youtube_channel_feed_xml: str):
+        resolve = respx.get("https://www.googleapis.com/youtube/v3/channels").mock(
+            return_value=Response(200, json={"items": [{"id": "UCtest"}]})
+        )
+        feed = respx.get("https://www.youtube.com/feeds/videos.xml", params={"channel_id": "UCtest"}).mock(
+            return_value=Response(200, text=youtube_channel_feed_xml)
+        )
+        config = {"channel_handle": "@test"}
+
+        with patch("signal_app.fetchers.youtube.get_settings") as mock_settings:
+            mock_settings.return_value.google_api_key = "key"
+            fetcher = YouTubeChannelFetcher("source-1", config)
+            assert fetcher.quota_estimate() == 1
+            assert len(await fetcher.fetch()) == 2
+            assert fetcher.state["channel_id"] == "UCtest"
+
+            # Next run: no lookup, no quota, and no API key needed
+            mock_settings.return_value.google_api_key = ""
+            fetcher = YouTubeChannelFetcher("source-1", config, fetcher.state)
+            assert fetcher.quota_estimate() == 0
+            assert len(await fetcher.fetch()) == 2
+
+        assert resolve.call_count == 1
+        assert feed.call_count == 2
+
+    @respx.mock
+    async def test_api_method_skipped_without_key(self):
+        with patch("signal_app.fetchers.youtube.get_settings") as mock_settings:
+            mock_settings.return_value.google_api_key = ""
+            fetcher = YouTubeChannelFetcher("source-1", {"channel_id": "UCtest", "method": "api"})
+            items = await fetcher.fetch()
+        assert items == []
+        assert not respx.calls
+
+
+class TestYouTubeSearchFetcher:
+    @staticmethod
+    def _search_page(keyword: str) -> dict:
+        return {
+            "items": [
+                {
+                    "id": {"videoId": f"{keyword}-{n}"},
+                    "snippet": {"title": f"{keyword} video {n}", "channelId": "UC1", "channelTitle": "Chan"},
+                }
+                for n in range(2)
+            ]
+        }
+
+    @respx.mock
+    async def test_concurrent_search_with_view_filter(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def search(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            keyword = request.url.params["q"]
+            if keyword == "broken":
+                return Response(500)
+            return Response(200, json=self._search_page(keyword))
+
+        def videos(request):
+            ids = request.url.params["id"].split(",")
+            return Response(
+                200,
+                json={"items": [{"id": vid, "statistics": {"viewCount": "5000" if vid.endswith("0") else "10"}}
+                                for vid in ids]},
+            )
+
+        respx.get("https://www.googleapis.com/youtube/v3/search").mock(side_effect=search)
+        videos_route = respx.get("https://www.googleapis.com/youtube/v3/videos").mock(side_effect=videos)
+
+        keywords = ["a", "b", "broken", "c"]
+        with (
+            patch("signal_app.fetchers.youtube.get_ledger", return_value=QuotaLedger(daily_budget=10000)),
+            patch("signal_app.fetchers.youtube.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.google_api_key = "test-key"
+            fetcher = YouTubeSearchFetcher("source-1", {"keywords": keywords, "search_concurrency": 2})
+            items = await fetcher.fetch()
+
+        assert max_in_flight == 2
+        # One view-count lookup per successful search page
+        assert videos_route.call_count == 3
+        assert [item.external_id for item in items] == ["a-0", "b-0", "c-0"]
+        assert items[0].extra["search_keyword"] == "a"
+
+    @respx.mock
+    async def test_all_keywords_failing_raises(self):
+        respx.get("https://www.googleapis.com/youtube/v3/search").mock(return_value=Response(500))
+        with (
+            patch("signal_app.fetchers.youtube.get_ledger", return_value=QuotaLedger(daily_budget=10000)),
+            patch("signal_app.fetchers.youtube.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.google_api_key = "test-key"
+            fetcher = YouTubeSearchFetcher("source-1", {"keywords": ["a", "b"]})
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetcher.fetch()
+
+
+def _gh_release_node(database_id: int, tag: str) -> dict:
+    return {
+        "databaseId": database_id,
+        "name": None,
+        "tagName": tag,
+        "url": f"https://github.com/o/r/releases/tag/{tag}",
+        "publishedAt": "2026-03-01T10:00:00Z",
+        "createdAt": "2026-03-01T09:00:00Z",
+        "description": "Notes",
+        "isPrerelease": False,
+        "isDraft": False,
+        "author": {"login": "octocat"},
+    }
+
+
+class TestGitHubReleasesFetcher:
+    @respx.mock
+    async def test_uses_rest_without_token(self):
+        route = respx.get("https://api.github.com/repos/octo/app/releases").mock(
+            return_value=Response(
+                200,
+                json=[{"id": 7, "tag_name": "v1.0", "html_url": "https://x", "published_at": "2026-03-01T10:00:00Z"}],
+            )
+        )
+        with patch("signal_app.fetchers.github.get_settings") as mock_settings:
+            mock_settings.return_value.github_token = ""
+            fetcher = GitHubReleasesFetcher("source-1", {"owner": "octo", "repo": "app"})
+            assert fetcher.batch_key() is None
+            items = await fetcher.fetch()
+
+        assert route.called
+        assert items[0].external_id == "7"
+        assert items[0].title == "octo/app: v1.0"
+
+    @respx.mock
+    async def test_batches_repos_into_one_graphql_query(self):
+        route = respx.post("https://api.github.com/graphql").mock(
+            return_value=Response(
+                200,
+                json={
+                    "data": {
+                        "r0": {"releases": {"nodes": [_gh_release_node(7, "v1.0")]}},
+                        "r1": None,
+                    },
+                    "errors": [{"path": ["r1"], "message": "Could not resolve to a Repository"}],
+                },
+            )
+        )
+        with patch("signal_app.fetchers.github.get_settings") as mock_settings:
+            mock_settings.return_value.github_token = "token"
+            fetchers = [
+                GitHubReleasesFetcher("source-1", {"owner": "octo", "repo": "app"}),
+                GitHubReleasesFetcher("source-2", {"owner": "gone", "repo": "missing"}),
+                GitHubReleasesFetcher("source-3", {"owner": "Octo", "repo": "App"}),
+            ]
+            assert {f.batch_key() for f in fetchers} == {"graphql"}
+            results = await GitHubReleasesFetcher.fetch_batch(fetchers)
+
+        assert route.call_count == 1
+        body = route.calls[0].request.read().decode()
+        assert '"o0":"octo"' in body.replace(" ", "")
+        assert route.calls[0].request.headers["Authorization"] == "Bearer token"
+
+        assert [item.external_id for item in results[0]] == ["7"]
+        assert results[0][0].author == "octocat"
+        assert isinstance(results[1], RuntimeError)
+        assert "Could not resolve" in str(results[1])
+        assert results[2][0].title == "Octo/App: v1.0"
+
+    @respx.mock
+    async def test_failed_query_falls_back_to_rest_per_repo(self):
+        respx.post("https://api.github.com/graphql").mock(return_value=Response(502))
+        app = respx.get("https://api.github.com/repos/octo/app/releases").mock(
+            return_value=Response(200, json=[{"id": 7, "tag_name": "v1.0", "html_url": "https://x"}])
+        )
+        respx.get("https://api.github.com/repos/octo/lib/releases").mock(return_value=Response(404))
+        with patch("signal_app.fetchers.github.get_settings") as mock_settings:
+            mock_settings.return_value.github_token = "token"
+            fetchers = [
+                GitHubReleasesFetcher("source-1", {"owner": "octo", "repo": "app"}),
+                GitHubReleasesFetcher("source-2", {"owner": "octo", "repo": "lib"}),
+                GitHubReleasesFetcher("source-3", {"owner": "Octo", "repo": "App"}),
+            ]
+            results = await GitHubReleasesFetcher.fetch_batch(fetchers)
+
+        # One REST call per repository, shared by the sources that follow it
+        assert app.call_count == 1
+        assert [item.external_id for item in results[0]] == ["7"]
+        assert results[2][0].title == "Octo/App: v1.0"
+        assert isinstance(results[1], httpx.HTTPStatusError)
+
+
+def _arxiv_feed(papers: list[tuple[str, str]]) -> str:
+    entries = "".join(
+        f"""<entry>
+      <id>http://arxiv.org/abs/{paper_id}</id>
+      <title>Paper {paper_id}</title>
+      <summary>Abstract of {paper_id}</summary>
+      <published>{published}</published>
+      <author><name>A. Author</name></author>
+    </entry>"""
+        for paper_id, published in papers
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+
+class TestArxivFetcher:
+    @respx.mock
+    async def test_first_harvest_run_reads_one_page_and_sets_watermark(self):
+        route = respx.get("https://export.arxiv.org/api/query").mock(
+            return_value=Response(
+                200,
+                text=_arxiv_feed([("2602.00002v1", "2026-02-26T10:00:00Z"), ("2602.00001v1", "2026-02-25T10:00:00Z")]),
+            )
+        )
+        fetcher = ArxivFetcher("source-1", {"categories": ["cs.AI"], "max_results": 2, "harvest": True})
+        items = await fetcher.fetch()
+
+        assert route.call_count == 1
+        assert [item.external_id for item in items] == ["2602.00002v1", "2602.00001v1"]
+        assert fetcher.state["last_submitted"] == "2026-02-26T10:00:00+00:00"
+
+    @respx.mock
+    async def test_harvest_pages_back_to_watermark(self):
+        route = respx.get("https://export.arxiv.org/api/query").mock(
+            side_effect=[
+                Response(
+                    200,
+                    text=_arxiv_feed([("p4", "2026-02-27T12:00:00Z"), ("p3", "2026-02-27T11:00:00Z")]),
+                ),
+                Response(
+                    200,
+                    text=_arxiv_feed([("p2", "2026-02-27T10:00:00Z"), ("p1", "2026-02-26T10:00:00Z")]),
+                ),
+            ]
+        )
+        fetcher = ArxivFetcher(
+            "source-1",
+            {"categories": ["cs.AI", "cs.CL"], "harvest": True, "page_size": 2},
+            {"last_submitted": "2026-02-26T10:00:00+00:00"},
+        )
+        items = await fetcher.fetch()
+
+        assert route.call_count == 2
+        assert [item.external_id for item in items] == ["p4", "p3", "p2"]
+        first, second = route.calls
+        assert "submittedDate:[202602261000 TO" in first.request.url.params["search_query"]
+        assert first.request.url.params["start"] == "0"
+        assert second.request.url.params["start"] == "2"
+        assert fetcher.state["last_submitted"] == "2026-02-27T12:00:00+00:00"
+        assert "harvest_pending" not in fetcher.state
+
+    @respx.mock
+    async def test_harvest_resumes_after_max_pages(self):
+        route = respx.get("https://export.arxiv.org/api/query").mock(
+            side_effect=[
+                Response(
+                    200,
+                    text=_arxiv_feed([("p4", "2026-02-27T12:00:00Z"), ("p3", "2026-02-27T11:00:00Z")]),
+                ),
+                Response(
+                    200,
+                    text=_arxiv_feed([("p2", "2026-02-27T10:00:00Z"), ("p1", "2026-02-26T10:00:00Z")]),
+                ),
+            ]
+        )
+        config = {"categories": ["cs.AI"], "harvest": True, "page_size": 2, "max_pages": 1}
+        fetcher = ArxivFetcher("source-1", config, {"last_submitted": "2026-02-26T10:00:00+00:00"})
+        assert not fetcher.watermark_enabled()
+        assert [item.external_id for item in await fetcher.fetch()] == ["p4", "p3"]
+
+        # Paging stopped short of the watermark: it stays, and the next run picks up at page 2
+        assert fetcher.state["last_submitted"] == "2026-02-26T10:00:00+00:00"
+        pending = fetcher.state["harvest_pending"]
+        assert (pending["offset"], pending["newest"]) == (2, "2026-02-27T12:00:00+00:00")
+
+        fetcher = ArxivFetcher("source-1", config, fetcher.state)
+        assert [item.external_id for item in await fetcher.fetch()] == ["p2"]
+        first, second = route.calls
+        assert second.request.url.params["start"] == "2"
+        assert second.request.url.params["search_query"] == first.request.url.params["search_query"]
+        assert fetcher.state["last_submitted"] == "2026-02-27T12:00:00+00:00"
+        assert "harvest_pending" not in fetcher.state
+
+
+class TestHostLimiter:
+    async def test_token_bucket_spaces_requests_after_burst(self):
+        limiter = HostLimiter({"slow.example.com": HostLimit(rate=20, burst=1)}, default=UNLIMITED)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await limiter.wait("https://slow.example.com/api")
+        assert loop.time() - start >= 0.09
+
+    async def test_subdomains_share_the_most_specific_bucket(self):
+        limiter = HostLimiter(
+            {"example.com": HostLimit(rate=1, burst=2), "api.example.com": HostLimit(rate=1, burst=5)},
+            default=UNLIMITED,
+        )
+        assert limiter._bucket("https://a.example.com/") is limiter._bucket("https://b.example.com/")
+        assert limiter._bucket("https://api.example.com/").limit.burst == 5
+        assert limiter._bucket("https://other.org/").limit is UNLIMITED
+
+    async def test_unlisted_hosts_are_not_delayed(self):
+        limiter = HostLimiter({"slow.example.com": HostLimit(rate=0.1)}, default=UNLIMITED)
+        await asyncio.wait_for(limiter.wait("https://fast.example.com/"), timeout=0.5)
+        await asyncio.wait_for(limiter.wait("https://fast.example.com/"), timeout=0.5)
+
+    async def test_exhausted_rate_limit_headers_pause_the_host(self):
+        limiter = HostLimiter({}, default=UNLIMITED)
+        response = Response(200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.1"})
+        assert limiter.observe("https://api.example.com/x", response) is None
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.wait("https://api.example.com/y")
+        assert loop.time() - start >= 0.09
+
+    async def test_hacker_news_fan_out_is_not_queued(self):
+        limiter = HostLimiter(HOST_LIMITS)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(limiter.wait(f"https://hacker-news.firebaseio.com/v0/item/{n}.json") for n in range(31)))
+        assert loop.time() - start < 0.05
+
+    @respx.mock
+    async def test_transport_retries_after_retry_after(self, unlimited_hosts):
+        route = respx.get("https://api.example.com/data").mock(
+            side_effect=[Response(429, headers={"Retry-After": "0.05"}), Response(200, json={"ok": True})]
+        )
+        async with http_client() as client:
+            response = await client.get("https://api.example.com/data")
+
+        assert response.status_code == 200
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_transport_gives_up_on_long_retry_after(self, unlimited_hosts):
+        route = respx.get("https://api.example.com/data").mock(
+            return_value=Response(429, headers={"Retry-After": "3600"})
+        )
+        async with http_client() as client:
+            with pytest.raises(HostPausedError):
+                await client.get("https://api.example.com/data")
+        assert route.call_count == 1
+
+        # The host stays paused, so further requests fail fast instead of hanging
+        async with http_client() as client:
+            with pytest.raises(HostPausedError):
+                await client.get("https://api.example.com/other")
+        assert route.call_count == 1
+
+
+def _reddit_listing(posts: list[tuple[str, str, int]], after: str | None = None) -> dict:
+    return {
+        "data": {
+            "after": after,
+            "children": [
+                {
+                    "data": {
+                        "id": post_id,
+                        "name": f"t3_{post_id}",
+                        "subreddit": subreddit,
+                        "title": f"Post {post_id}",
+                        "url": f"https://example.com/{post_id}",
+                        "permalink": f"/r/{subreddit}/comments/{post_id}/",
+                        "created_utc": created,
+                    }
+                }
+                for post_id, subreddit, created in posts
+            ],
+        }
+    }
+
+
+class TestRedditFetcher:
+    @respx.mock
+    async def test_batch_routes_posts_by_subreddit(self):
+        route = respx.get("https://old.reddit.com/r/machinelearning+localllama/hot.json").mock(
+            return_value=Response(
+                200,
+                json=_reddit_listing(
+                    [("a1", "MachineLearning", 100), ("b1", "LocalLLaMA", 90), ("a2", "MachineLearning", 80)]
+                ),
+            )
+        )
+        fetchers = [
+            RedditFetcher("s1", {"subreddit": "MachineLearning", "sort": "hot"}),
+            RedditFetcher("s2", {"subreddit": "LocalLLaMA", "sort": "hot"}),
+        ]
+        assert fetchers[0].batch_key() == fetchers[1].batch_key()
+
+        results = await RedditFetcher.fetch_batch(fetchers)
+
+        assert route.call_count == 1
+        assert [item.external_id for item in results[0]] == ["a1", "a2"]
+        assert [item.external_id for item in results[1]] == ["b1"]
+        assert results[1][0].extra["subreddit"] == "LocalLLaMA"
+
+    @respx.mock
+    async def test_combined_subreddit_source_gets_its_own_listing(self):
+        combined = respx.get("https://old.reddit.com/r/rust+golang/hot.json").mock(
+            return_value=Response(200, json=_reddit_listing([("r1", "rust", 100), ("g1", "golang", 90)]))
+        )
+        respx.get("https://old.reddit.com/r/python/hot.json").mock(
+            return_value=Response(200, json=_reddit_listing([("p1", "Python", 95)]))
+        )
+        fetchers = [RedditFetcher("s1", {"subreddit": "rust+golang"}), RedditFetcher("s2", {"subreddit": "Python"})]
+        results = await RedditFetcher.fetch_batch(fetchers)
+
+        assert combined.call_count == 1
+        assert [(item.external_id, item.extra["subreddit"]) for item in results[0]] == [
+            ("r1", "rust"),
+            ("g1", "golang"),
+        ]
+        assert [item.external_id for item in results[1]] == ["p1"]
+
+    @respx.mock
+    async def test_crowded_out_subreddit_is_fetched_on_its_own(self):
+        respx.get("https://old.reddit.com/r/busy+quiet/hot.json").mock(
+            return_value=Response(200, json=_reddit_listing([("b1", "busy", 100), ("b2", "busy", 90)], after="t3_b2"))
+        )
+        own = respx.get("https://old.reddit.com/r/quiet/hot.json").mock(
+            return_value=Response(200, json=_reddit_listing([("q1", "quiet", 10)]))
+        )
+        fetchers = [
+            RedditFetcher("s1", {"subreddit": "busy", "limit": 2}),
+            RedditFetcher("s2", {"subreddit": "quiet", "limit": 2}),
+        ]
+        with patch("signal_app.fetchers.reddit.MAX_PAGES", 1):
+            results = await RedditFetcher.fetch_batch(fetchers)
+
+        assert own.call_count == 1
+        assert [item.external_id for item in results[0]] == ["b1", "b2"]
+        assert [item.external_id for item in results[1]] == ["q1"]
+
+    @respx.mock
+    async def test_failed_combined_listing_falls_back_to_each_subreddit(self):
+        respx.get("https://old.reddit.com/r/rust+golang/hot.json").mock(return_value=Response(502))
+        respx.get("https://old.reddit.com/r/rust/hot.json").mock(
+            return_value=Response(200, json=_reddit_listing([("r1", "rust", 100)]))
+        )
+        respx.get("https://old.reddit.com/r/golang/hot.json").mock(return_value=Response(404))
+        fetchers = [RedditFetcher("s1", {"subreddit": "rust"}), RedditFetcher("s2", {"subreddit": "golang"})]
+        results = await RedditFetcher.fetch_batch(fetchers)
+
+        # Only the source whose own listing failed too is marked as failed
+        assert [item.external_id for item in results[0]] == ["r1"]
+        assert isinstance(results[1], httpx.HTTPStatusError)
+        assert results[1].response.status_code == 404
+
+    @respx.mock
+    async def test_new_listing_only_returns_posts_after_cursor(self):
+        route = respx.get("https://old.reddit.com/r/localllama/new.json").mock(
+            side_effect=[
+                Response(
+                    200, json=_reddit_listing([("p3", "LocalLLaMA", 300), ("p2", "LocalLLaMA", 200)], after="t3_p2")
+                ),
+                Response(200, json=_reddit_listing([("p1", "LocalLLaMA", 100)])),
+            ]
+        )
+        fetcher = RedditFetcher(
+            "s1", {"subreddit": "LocalLLaMA", "sort": "new"}, {"last_created_utc": 200, "last_name": "t3_p2"}
+        )
+        items = await fetcher.fetch()
+
+        # The first page already reaches the cursor, so no second page is requested
+        assert route.call_count == 1
+        assert [item.external_id for item in items] == ["p3"]
+        assert fetcher.state == {"last_created_utc": 300, "last_name": "t3_p3"}
+
+    @respx.mock
+    async def test_failed_request_is_reported_per_source(self):
+        route = respx.get("https://old.reddit.com/r/a/hot.json").mock(
+            return_value=Response(429, headers={"Retry-After": "0"})
+        )
+        results = await RedditFetcher.fetch_batch([RedditFetcher("s1", {"subreddit": "a"})])
+        assert isinstance(results[0], httpx.HTTPStatusError)
+        # Throttled requests are retried by the transport before the source fails
+        assert route.call_count == 3
+
+
+def _bsky_post(rkey: str, indexed_at: str) -> dict:
+    return {
+        "post": {
+            "uri": f"at://did:plc:test/app.bsky.feed.post/{rkey}",
+            "author": {"handle": "user.bsky.social", "displayName": "User"},
+            "record": {"text": f"Post {rkey}", "createdAt": indexed_at},
+            "indexedAt": indexed_at,
+        }
+    }
+
+
+class TestBlueskyFetcher:
+    @respx.mock
+    async def test_first_run_resolves_did_and_records_cursor(self):
+        resolve = respx.get("https://public.api.bsky.app/xrpc/com.atproto.identity.resolveHandle").mock(
+            return_value=Response(200, json={"did": "did:plc:test"})
+        )
+        respx.get("https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed").mock(
+            return_value=Response(
+                200,
+                json={
+                    "feed": [_bsky_post("b", "2026-02-26T10:00:00Z"), _bsky_post("a", "2026-02-26T09:00:00Z")],
+                    "cursor": "next",
+                },
+            )
+        )
+
+        fetcher = BlueskyFetcher("source-1", {"handle": "user.bsky.social"})
+        items = await fetcher.fetch()
+
+        assert resolve.call_count == 1
+        assert [item.title for item in items] == ["Post b", "Post a"]
+        assert fetcher.state["did"] == "did:plc:test"
+        assert fetcher.state["last_uri"] == "at://did:plc:test/app.bsky.feed.post/b"
+        assert fetcher.state["last_indexed_at"].startswith("2026-02-26T10:00:00")
+
+    @respx.mock
+    async def test_incremental_run_uses_cached_did_and_stops_at_watermark(self):
+        resolve = respx.get("https://public.api.bsky.app/xrpc/com.atproto.identity.resolveHandle")
+        feed = respx.get("https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed").mock(
+            return_value=Response(
+                200,
+                json={
+                    "feed": [_bsky_post("c", "2026-02-26T11:00:00Z"), _bsky_post("b", "2026-02-26T10:00:00Z")],
+                    "cursor": "next",
+                },
+            )
+        )
+
+        state = {
+            "handle": "user.bsky.social",
+            "did": "did:plc:test",
+            "did_resolved_at": datetime.now(tz=UTC).isoformat(),
+            "last_indexed_at": "2026-02-26T10:00:00+00:00",
+            "last_uri": "at://did:plc:test/app.bsky.feed.post/b",
+        }
+        fetcher = BlueskyFetcher("source-1", {"handle": "user.bsky.social"}, state)
+        items = await fetcher.fetch()
+
+        assert not resolve.called
+        assert feed.call_count == 1
+        assert [item.title for item in items] == ["Post c"]
+        assert fetcher.state["last_uri"] == "at://did:plc:test/app.bsky.feed.post/c"
+
+    @respx.mock
+    async def test_watermark_waits_until_paging_reaches_it(self):
+        feed = respx.get("https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed").mock(
+            side_effect=[
+                Response(
+                    200,
+                    json={
+                        "feed": [_bsky_post("d", "2026-02-26T13:00:00Z"), _bsky_post("c", "2026-02-26T12:00:00Z")],
+                        "cursor": "page-2",
+                    },
+                ),
+                Response(
+                    200,
+                    json={
+                        "feed": [_bsky_post("b2", "2026-02-26T11:00:00Z"), _bsky_post("b", "2026-02-26T10:00:00Z")],
+                        "cursor": "page-3",
+                    },
+                ),
+            ]
+        )
+        state = {
+            "handle": "user.bsky.social",
+            "did": "did:plc:test",
+            "did_resolved_at": datetime.now(tz=UTC).isoformat(),
+            "last_indexed_at": "2026-02-26T10:00:00+00:00",
+            "last_uri": "at://did:plc:test/app.bsky.feed.post/b",
+        }
+        config = {"handle": "user.bsky.social", "max_pages": 1}
+        fetcher = BlueskyFetcher("source-1", config, state)
+        assert [item.title for item in await fetcher.fetch()] == ["Post d", "Post c"]
+
+        # Paging stopped short of the watermark: it stays, and the next run continues from the cursor
+        assert fetcher.state["last_uri"] == "at://did:plc:test/app.bsky.feed.post/b"
+        assert fetcher.state["pending"]["cursor"] == "page-2"
+
+        fetcher = BlueskyFetcher("source-1", config, fetcher.state)
+        assert [item.title for item in await fetcher.fetch()] == ["Post b2"]
+        assert feed.calls[1].request.url.params["cursor"] == "page-2"
+        assert fetcher.state["last_uri"] == "at://did:plc:test/app.bsky.feed.post/d"
+        assert "pending" not in fetcher.state
+
+    @respx.mock
+    async def test_expired_did_is_resolved_again(self):
+        resolve = respx.get("https://public.api.bsky.app/xrpc/com.atproto.identity.resolveHandle").mock(
+            return_value=Response(200, json={"did": "did:plc:new"})
+        )
+        respx.get("https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed").mock(
+            return_value=Response(200, json={"feed": []})
+        )
+
+        state = {"handle": "user.bsky.social", "did": "did:plc:old", "did_resolved_at": "2020-01-01T00:00:00+00:00"}
+        fetcher = BlueskyFetcher("source-1", {"handle": "user.bsky.social"}, state)
+        await fetcher.fetch()
+
+        assert resolve.call_count == 1
+        assert fetcher.state["did"] == "did:plc:new"
+
+
 class TestNonLatinFilter:
     def test_allows_english(self):
         assert not _NON_LATIN_RE.search("How GPT-4 Changes Everything")
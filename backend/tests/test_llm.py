@@ -0,0 +1,78 @@
+"""Tests for the shared LLM client and the category cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from signal_app import llm
+from signal_app.llm import Category, close_llm_client, get_categories, get_llm_client, invalidate_categories
+from signal_app.pipeline.summarizer import build_system_prompt
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    invalidate_categories()
+    yield
+    invalidate_categories()
+
+
+def _mock_pool(rows: list[dict]) -> tuple[MagicMock, AsyncMock]:
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=rows)
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return mock_pool, mock_conn
+
+
+class TestCategoryCache:
+    async def test_queries_once_until_invalidated(self):
+        mock_pool, mock_conn = _mock_pool([{"slug": "ai-ml", "name": "AI & ML"}])
+
+        with patch("signal_app.llm.get_pool", return_value=mock_pool):
+            first = await get_categories()
+            second = await get_categories()
+            assert mock_conn.fetch.await_count == 1
+
+            mock_conn.fetch.return_value = [{"slug": "ai-ml", "name": "AI & ML"}, {"slug": "web", "name": "Web"}]
+            invalidate_categories()
+            third = await get_categories()
+
+        assert first == second == (Category(slug="ai-ml", name="AI & ML"),)
+        assert [category.slug for category in third] == ["ai-ml", "web"]
+        assert mock_conn.fetch.await_count == 2
+
+    async def test_reloads_after_ttl(self):
+        mock_pool, mock_conn = _mock_pool([])
+
+        with patch("signal_app.llm.get_pool", return_value=mock_pool):
+            await get_categories()
+            with patch.object(llm, "CATEGORIES_TTL", -1):
+                await get_categories()
+
+        assert mock_conn.fetch.await_count == 2
+
+
+class TestSystemPrompt:
+    def test_prefix_is_stable_across_category_sets(self):
+        one = build_system_prompt((Category("ai-ml", "AI & ML"),))
+        two = build_system_prompt((Category("ai-ml", "AI & ML"), Category("web", "Web")))
+
+        prefix = one.split("Categories:")[0]
+        assert two.startswith(prefix)
+        assert one.endswith("   - ai-ml: AI & ML")
+        assert build_system_prompt((Category("ai-ml", "AI & ML"),)) is one  # cached
+
+    def test_no_categories(self):
+        assert build_system_prompt(()).endswith("(no categories configured)")
+
+
+class TestLlmClient:
+    async def test_client_is_shared_until_closed(self):
+        with patch("signal_app.llm.get_settings") as mock_settings:
+            mock_settings.return_value.openai_api_key = "test-key"
+            client = get_llm_client()
+            assert get_llm_client() is client
+            await close_llm_client()
+            assert get_llm_client() is not client
+            await close_llm_client()
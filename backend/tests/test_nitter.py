@@ -0,0 +1,117 @@
+"""Tests for Nitter instance health scoring and hedged requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from signal_app.fetchers.nitter_health import NitterHealth
+from signal_app.fetchers.twitter import NITTER_INSTANCES, TwitterFetcher
+
+RSS = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>@svpino</title>'
+    "<item><title>Hello from Nitter</title><link>{instance}/svpino/status/1</link>"
+    "<pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate><description>Hello</description></item>"
+    "</channel></rss>"
+)
+
+
+@pytest.fixture
+def health():
+    health = NitterHealth()
+    with patch("signal_app.fetchers.twitter.get_nitter_health", return_value=health):
+        yield health
+
+
+class TestNitterHealth:
+    def test_failures_lower_the_score(self):
+        health = NitterHealth()
+        health.record("https://a", ok=True, latency=0.5)
+        health.record("https://b", ok=True, latency=0.5)
+        health.record("https://b", ok=False, latency=15)
+        assert health.score("https://a") > health.score("https://b")
+
+    def test_ranked_prefers_healthy_and_keeps_order_for_ties(self):
+        health = NitterHealth()
+        health.record("https://a", ok=False, latency=15)
+        assert health.ranked(["https://a", "https://b", "https://c"]) == ["https://b", "https://c", "https://a"]
+
+    def test_unanswered_requests_only_count_latency(self):
+        health = NitterHealth()
+        health.record("https://a", ok=False, latency=1.0)
+        health.record("https://a", ok=None, latency=11.0)
+        assert health.stats["https://a"] == {"success": 0.0, "latency": 4.0}
+
+    def test_round_trips_through_dict(self):
+        health = NitterHealth()
+        health.record("https://a", ok=True, latency=1.0)
+        restored = NitterHealth()
+        restored.load(health.to_dict())
+        assert restored.score("https://a") == health.score("https://a")
+
+
+class TestTwitterFetcher:
+    @respx.mock
+    async def test_skips_unhealthy_instances(self, health):
+        dead, alive = NITTER_INSTANCES[0], NITTER_INSTANCES[1]
+        health.record(dead, ok=False, latency=15)
+        dead_route = respx.get(f"{dead}/svpino/rss").mock(side_effect=httpx.ConnectTimeout("timeout"))
+        respx.get(f"{alive}/svpino/rss").mock(return_value=Response(200, text=RSS.format(instance=alive)))
+
+        fetcher = TwitterFetcher("source-1", {"username": "svpino", "hedge_delay": 5})
+        items = await fetcher.fetch()
+
+        assert [item.url for item in items] == ["https://twitter.com/svpino/status/1"]
+        assert not dead_route.called
+
+    @respx.mock
+    async def test_hedges_a_slow_instance(self, health):
+        slow, fast = NITTER_INSTANCES[0], NITTER_INSTANCES[1]
+        cancelled = asyncio.Event()
+
+        async def hang(request):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return Response(200, text=RSS.format(instance=slow))
+
+        respx.get(f"{slow}/svpino/rss").mock(side_effect=hang)
+        respx.get(f"{fast}/svpino/rss").mock(return_value=Response(200, text=RSS.format(instance=fast)))
+
+        fetcher = TwitterFetcher("source-1", {"username": "svpino", "hedge_delay": 0.05})
+        items = await asyncio.wait_for(fetcher.fetch(), timeout=2)
+
+        assert len(items) == 1
+        assert cancelled.is_set()
+        assert health.score(fast) > 0
+        # The cancelled request isn't a failure, but its wait counts: the slow instance drops behind
+        assert health.stats[slow]["success"] == 1.0
+        assert health.stats[slow]["latency"] >= 0.05
+        assert health.ranked([slow, fast]) == [fast, slow]
+
+    @respx.mock
+    async def test_failure_starts_next_instance_immediately(self, health):
+        respx.get(f"{NITTER_INSTANCES[0]}/svpino/rss").mock(return_value=Response(503))
+        respx.get(f"{NITTER_INSTANCES[1]}/svpino/rss").mock(
+            return_value=Response(200, text=RSS.format(instance=NITTER_INSTANCES[1]))
+        )
+
+        fetcher = TwitterFetcher("source-1", {"username": "svpino", "hedge_delay": 10})
+        items = await asyncio.wait_for(fetcher.fetch(), timeout=2)
+
+        assert len(items) == 1
+        assert health.stats[NITTER_INSTANCES[0]]["success"] == 0.0
+
+    @respx.mock
+    async def test_all_instances_failing_returns_empty(self, health):
+        for instance in NITTER_INSTANCES:
+            respx.get(f"{instance}/svpino/rss").mock(return_value=Response(404))
+
+        fetcher = TwitterFetcher("source-1", {"username": "svpino", "hedge_delay": 0.01})
+        assert await fetcher.fetch() == []
+        assert set(health.stats) == set(NITTER_INSTANCES)
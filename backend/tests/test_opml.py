@@ -0,0 +1,134 @@
+"""Tests for OPML bulk import."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from xml.etree.ElementTree import Element, XMLPullParser
+
+import pytest
+import respx
+from httpx import Response
+
+from signal_app.importers.opml import OpmlError, OpmlFeed, detect_feed_type, import_feeds, parse_opml
+
+OPML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Subscriptions</title></head>
+  <body>
+    <outline text="Tech">
+      <outline type="rss" text="Blog A" title="Blog A" xmlUrl="https://a.example.com/feed"/>
+      <outline type="rss" text="Blog B" xmlUrl="https://b.example.com/atom.xml"/>
+    </outline>
+    <outline type="rss" text="Blog A again" xmlUrl="https://a.example.com/feed"/>
+    <outline type="rss" xmlUrl="https://c.example.com/rss"/>
+    <outline type="link" text="Not a feed" url="https://example.com"/>
+  </body>
+</opml>"""
+
+RSS = b'<?xml version="1.0"?><rss version="2.0"><channel><title>A</title><item><title>1</title></item></channel></rss>'
+ATOM = b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>B</title><entry><title>1</title></entry></feed>'
+
+
+async def _chunks(data: bytes, size: int = 64):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _mock_pool(existing: list[str]) -> tuple[MagicMock, AsyncMock]:
+    mock_conn = AsyncMock()
+
+    async def fetch(query, *args):
+        if query.lstrip().startswith("INSERT"):
+            return [{"id": i} for i in range(len(args[0]))]
+        return [{"feed_url": url} for url in existing]
+
+    mock_conn.fetch = AsyncMock(side_effect=fetch)
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return mock_pool, mock_conn
+
+
+class TestParseOpml:
+    async def test_collects_nested_feeds_in_order_without_duplicates(self):
+        feeds = await parse_opml(_chunks(OPML))
+
+        assert feeds == [
+            OpmlFeed(url="https://a.example.com/feed", title="Blog A"),
+            OpmlFeed(url="https://b.example.com/atom.xml", title="Blog B"),
+            OpmlFeed(url="https://c.example.com/rss", title="c.example.com"),
+        ]
+
+    async def test_read_outlines_are_dropped_from_the_tree(self):
+        elements: list[Element] = []
+
+        class RecordingParser(XMLPullParser):
+            def read_events(self):
+                for event in super().read_events():
+                    elements.append(event[1])
+                    yield event
+
+        with patch("signal_app.importers.opml.XMLPullParser", RecordingParser):
+            feeds = await parse_opml(_chunks(OPML))
+
+        assert len(feeds) == 3
+        body = next(element for element in elements if element.tag == "body")
+        assert len(body) == 0
+        assert not any(element.attrib for element in elements if element.tag == "outline")
+
+    async def test_invalid_xml_raises(self):
+        with pytest.raises(OpmlError):
+            await parse_opml(_chunks(b"<opml><body><outline xmlUrl='https://x.com/feed'></body>"))
+
+
+class TestDetectFeedType:
+    def test_feed_roots(self):
+        assert detect_feed_type(RSS) == "rss"
+        assert detect_feed_type(ATOM) == "atom"
+        assert detect_feed_type(b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>') == "rss"
+
+    def test_root_is_enough_even_if_the_body_is_malformed(self):
+        assert detect_feed_type(b'<rss version="2.0"><channel><title>a &nbsp; b</title>') == "rss"
+
+    def test_not_a_feed(self):
+        assert detect_feed_type(b"<!DOCTYPE html><html><body>Hi</body></html>") is None
+        assert detect_feed_type(b"not xml at all") is None
+
+
+class TestImportFeeds:
+    @respx.mock
+    async def test_probes_new_feeds_and_bulk_inserts_valid_ones(self):
+        respx.get("https://a.example.com/feed").mock(return_value=Response(200, content=RSS))
+        respx.get("https://b.example.com/atom.xml").mock(return_value=Response(200, content=ATOM))
+        respx.get("https://c.example.com/rss").mock(return_value=Response(404))
+        respx.get("https://d.example.com/feed").mock(return_value=Response(200, text="<html><body/></html>"))
+        feeds = [
+            OpmlFeed("https://a.example.com/feed", "A"),
+            OpmlFeed("https://b.example.com/atom.xml", "B"),
+            OpmlFeed("https://c.example.com/rss", "C"),
+            OpmlFeed("https://d.example.com/feed", "D"),
+            OpmlFeed("https://known.example.com/feed", "Known"),
+        ]
+        mock_pool, mock_conn = _mock_pool(existing=["https://known.example.com/feed"])
+
+        with (
+            patch("signal_app.importers.opml.get_pool", return_value=mock_pool),
+            patch("signal_app.importers.opml.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.opml_probe_concurrency = 2
+            mock_settings.return_value.opml_probe_timeout = 5.0
+            events = [event async for event in import_feeds(feeds, "12 hours")]
+
+        assert events[0] == {"event": "start", "total": 5, "duplicates": 1, "to_probe": 4}
+        probes = {event["url"]: event for event in events[1:-1]}
+        assert probes["https://a.example.com/feed"]["source_type"] == "rss"
+        assert probes["https://b.example.com/atom.xml"]["source_type"] == "atom"
+        assert probes["https://c.example.com/rss"]["error"] == "HTTP 404"
+        assert probes["https://d.example.com/feed"]["error"] == "Not an RSS or Atom feed"
+        assert sorted(event["done"] for event in events[1:-1]) == [1, 2, 3, 4]
+        assert events[-1] == {"event": "done", "imported": 2, "invalid": 2, "duplicates": 1}
+
+        # One INSERT for every accepted feed
+        insert_calls = [c for c in mock_conn.fetch.call_args_list if c.args[0].lstrip().startswith("INSERT")]
+        assert len(insert_calls) == 1
+        names, types, configs = insert_calls[0].args[1:4]
+        assert sorted(zip(names, types, strict=True)) == [("A", "rss"), ("B", "atom")]
+        assert '{"feed_url": "https://a.example.com/feed"}' in configs
@@ -0,0 +1,130 @@
+"""Tests for pipeline orchestration helpers that don't touch the database."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Hashable, Sequence
+from typing import ClassVar, Self
+from unittest.mock import patch
+
+import httpx
+
+from signal_app.fetchers.base import BaseFetcher, RawItem
+from signal_app.fetchers.ratelimit import HostLimit, HostLimiter, RateLimitedTransport
+from signal_app.pipeline.orchestrator import _fetch_all
+
+
+class _BatchedFetcher(BaseFetcher):
+    batch_calls: ClassVar[list[list[str]]] = []
+
+    async def fetch(self) -> list[RawItem]:
+        raise AssertionError("batched sources should not be fetched one by one")
+
+    def batch_key(self) -> Hashable | None:
+        return self.config.get("group")
+
+    @classmethod
+    async def fetch_batch(cls, fetchers: Sequence[Self]) -> list[list[RawItem] | BaseException]:
+        cls.batch_calls.append([f.source_id for f in fetchers])
+        return [[RawItem(external_id=f.source_id, title=f.source_id, url=f"https://x/{f.source_id}")] for f in fetchers]
+
+
+class _SingleFetcher(BaseFetcher):
+    async def fetch(self) -> list[RawItem]:
+        if self.config.get("fail"):
+            raise RuntimeError("boom")
+        return [RawItem(external_id=self.source_id, title=self.source_id, url=f"https://y/{self.source_id}")]
+
+
+class _PagedFetcher(BaseFetcher):
+    def __init__(self, source_id: str, config: dict) -> None:  # type: ignore[type-arg]
+        super().__init__(source_id, config)
+        self.pages_served = 0
+        self.closed = False
+
+    async def fetch(self) -> list[RawItem]:
+        return [item async for page in self.aiter_items() for item in page]
+
+    async def aiter_items(self) -> AsyncGenerator[list[RawItem], None]:
+        try:
+            for page in range(5):
+                self.pages_served += 1
+                yield [RawItem(external_id=f"p{page}", title=f"p{page}", url=f"https://z/{page}")]
+        finally:
+            self.closed = True
+
+
+class _Collector:
+    def __init__(self, stop_after: dict[int, int] | None = None) -> None:
+        self.pages: dict[int, list[list[RawItem]]] = {}
+        self.stop_after = stop_after or {}
+
+    async def __call__(self, idx: int, items: list[RawItem]) -> bool:
+        self.pages.setdefault(idx, []).append(items)
+        return len(self.pages[idx]) < self.stop_after.get(idx, 1_000)
+
+
+class TestFetchAll:
+    async def test_groups_by_batch_key_and_keeps_order(self):
+        _BatchedFetcher.batch_calls = []
+        fetchers: list[BaseFetcher] = [
+            _BatchedFetcher("b1", {"group": "hot"}),
+            _SingleFetcher("s1", {}),
+            _BatchedFetcher("b2", {"group": "new"}),
+            _BatchedFetcher("b3", {"group": "hot"}),
+            _SingleFetcher("s2", {"fail": True}),
+        ]
+        sources = [{"name": f.source_id} for f in fetchers]
+        collector = _Collector()
+
+        errors = await _fetch_all(fetchers, sources, collector)
+
+        assert sorted(_BatchedFetcher.batch_calls) == [["b1", "b3"], ["b2"]]
+        assert [collector.pages[i][0][0].external_id for i in range(4)] == ["b1", "s1", "b2", "b3"]
+        assert errors[:4] == [None] * 4
+        assert isinstance(errors[4], RuntimeError)
+        assert 4 not in collector.pages
+
+    async def test_streams_pages_and_stops_when_ingest_says_so(self):
+        paged = _PagedFetcher("p", {})
+        full = _PagedFetcher("q", {})
+        collector = _Collector(stop_after={0: 2})
+
+        errors = await _fetch_all([paged, full], [{"name": "p"}, {"name": "q"}], collector)
+
+        assert errors == [None, None]
+        assert len(collector.pages[0]) == 2
+        assert paged.pages_served == 2
+        assert paged.closed
+        assert len(collector.pages[1]) == 5
+
+    async def test_ingest_failure_is_recorded_per_source(self):
+        async def failing_ingest(idx: int, items: list[RawItem]) -> bool:
+            raise RuntimeError("db down")
+
+        errors = await _fetch_all([_SingleFetcher("s1", {})], [{"name": "s1"}], failing_ingest)
+
+        assert isinstance(errors[0], RuntimeError)
+
+    async def test_queueing_for_a_shared_host_does_not_time_out(self):
+        # Burst of 1 at 20 rps: the eighth source queues ~0.35s, longer than the whole timeout
+        limiter = HostLimiter({"feeds.example.com": HostLimit(rate=20.0, burst=1)})
+
+        class _PoliteFetcher(BaseFetcher):
+            async def fetch(self) -> list[RawItem]:
+                transport = RateLimitedTransport(httpx.MockTransport(self._respond), limiter=limiter)
+                async with httpx.AsyncClient(transport=transport) as client:
+                    await client.get(f"https://feeds.example.com/{self.source_id}")
+                    if self.config.get("slow"):
+                        await asyncio.sleep(0.5)
+                return [RawItem(external_id=self.source_id, title=self.source_id, url=f"https://w/{self.source_id}")]
+
+            def _respond(self, request: httpx.Request) -> httpx.Response:
+                return httpx.Response(200)
+
+        fetchers: list[BaseFetcher] = [_PoliteFetcher(f"f{n}", {}) for n in range(8)]
+        fetchers.append(_PoliteFetcher("slow", {"slow": True}))
+        with patch("signal_app.pipeline.orchestrator.FETCH_TIMEOUT", 0.25):
+            errors = await _fetch_all(fetchers, [{"name": f.source_id} for f in fetchers], _Collector())
+
+        assert errors[:8] == [None] * 8
+        # Time spent actually fetching still counts
+        assert isinstance(errors[8], TimeoutError)
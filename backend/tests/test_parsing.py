@@ -0,0 +1,30 @@
+"""Tests for the feed parsing worker pool."""
+
+from unittest.mock import patch
+
+import pytest
+
+from signal_app.fetchers import parsing
+from signal_app.fetchers.rss import _parse_feed
+
+
+@pytest.fixture(params=["thread", "process"])
+def executor_kind(request):
+    parsing.shutdown_parse_executor()
+    with patch("signal_app.fetchers.parsing.get_settings") as mock_settings:
+        mock_settings.return_value.parse_executor = request.param
+        mock_settings.return_value.parse_workers = 1
+        yield request.param
+    parsing.shutdown_parse_executor()
+
+
+async def test_run_parser_parses_feed_off_the_loop(executor_kind, rss_feed_xml):
+    items = await parsing.run_parser(_parse_feed, rss_feed_xml)
+    assert len(items) == 2
+    assert items[0].published_at is not None
+
+
+async def test_executor_kind_follows_settings(executor_kind):
+    executor = parsing.get_parse_executor()
+    assert type(executor).__name__ == ("ThreadPoolExecutor" if executor_kind == "thread" else "ProcessPoolExecutor")
+    assert parsing.get_parse_executor() is executor
@@ -0,0 +1,155 @@
+"""Tests for the bulk re-categorization job."""
+
+import contextlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from signal_app.pipeline.classifier import Prediction
+from signal_app.pipeline.recategorize import recategorize
+
+ITEMS = [{"id": f"i{n}", "title": f"Story {n}"} for n in range(5)]
+
+
+class FakeConn:
+    """Items and categories, and a log of the writes."""
+
+    def __init__(self) -> None:
+        self.chunks: list[str | None] = []
+        self.executed: list[tuple] = []
+
+    async def fetchval(self, query: str, *args):
+        return len(ITEMS)
+
+    async def fetch(self, query: str, *args):
+        if "FROM categories" in query:
+            return [{"id": "c-ai", "slug": "ai-ml"}, {"id": "c-web", "slug": "web"}]
+        after, limit = args
+        self.chunks.append(after)
+        return [item for item in ITEMS if after is None or item["id"] > after][:limit]
+
+    async def execute(self, query: str, *args):
+        self.executed.append((" ".join(query.split()), args))
+
+    def transaction(self):
+        return contextlib.nullcontext()
+
+    def statements(self, prefix: str) -> list[tuple]:
+        return [args for query, args in self.executed if query.startswith(prefix)]
+
+
+def _pool(conn: FakeConn) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+def _classifier(covers: bool) -> MagicMock:
+    classifier = MagicMock()
+    classifier.covers.return_value = covers
+    # Confident about the even-numbered stories
+    classifier.predict.side_effect = lambda titles, threshold: [
+        Prediction((("c-web", 0.9),), True) if int(title.split()[1]) % 2 == 0 else Prediction() for title in titles
+    ]
+    return classifier
+
+
+async def _categorize(items):
+    return [{"index": item["index"], "categories": ["ai-ml", "gone"], "confidence": [0.8, 0.5]} for item in items]
+
+
+@pytest.fixture
+def job():
+    saved: list[dict] = []
+
+    async def _save(key, value):
+        saved.append(dict(value))
+
+    with (
+        patch("signal_app.pipeline.recategorize.get_settings") as mock_settings,
+        patch("signal_app.pipeline.recategorize.get_app_setting", AsyncMock(return_value=None)) as state,
+        patch("signal_app.pipeline.recategorize.set_app_setting", _save),
+        patch("signal_app.pipeline.recategorize.refresh_classifier", AsyncMock()) as refresh,
+        patch("signal_app.pipeline.recategorize.categorize_titles", AsyncMock(side_effect=_categorize)) as llm,
+        patch("signal_app.pipeline.recategorize.reset_classifier", AsyncMock()) as reset,
+        patch("signal_app.pipeline.recategorize.CHUNK_SIZE", 2),
+        patch("signal_app.pipeline.recategorize.TITLES_PER_REQUEST", 1),
+    ):
+        mock_settings.return_value.classifier = True
+        mock_settings.return_value.classifier_threshold = 0.7
+        mock_settings.return_value.openai_api_key = "test-key"
+        mock_settings.return_value.recategorize_concurrency = 2
+        yield {
+            "saved": saved,
+            "state": state,
+            "refresh": refresh,
+            "llm": llm,
+            "reset": reset,
+            "settings": mock_settings,
+        }
+
+
+class TestRecategorize:
+    async def test_classifier_first_then_llm_in_chunks(self, job):
+        job["refresh"].return_value = _classifier(covers=True)
+        conn = FakeConn()
+        state = await recategorize(_pool(conn))
+
+        assert conn.chunks == [None, "i1", "i3", "i4"]
+        assert (state["status"], state["processed"], state["categorized"], state["total"]) == ("completed", 5, 5, 5)
+        # Progress was stored after every chunk
+        assert [saved["after"] for saved in job["saved"]] == [None, "i1", "i3", "i4", "i4"]
+
+        # Only the titles the classifier wasn't sure of went to the LLM, one per request
+        sent = [call.args[0][0]["title"] for call in job["llm"].await_args_list]
+        assert sent == ["Story 1", "Story 3"]
+
+        # Automatic categories replaced for each chunk; unknown slugs dropped
+        assert [args[0] for args in conn.statements("DELETE FROM item_categories")] == [
+            ["i0", "i1"],
+            ["i2", "i3"],
+            ["i4"],
+        ]
+        inserts = conn.statements("INSERT INTO item_categories")
+        assert inserts[0] == (["i0"], ["c-web"], [0.9], "classifier")
+        assert inserts[1] == (["i1"], ["c-ai"], [0.8], "llm")
+
+        # The classifier is rebuilt from the rewritten labels instead of learning them twice
+        job["reset"].assert_awaited_once()
+
+    async def test_classifier_without_every_category_is_skipped(self, job):
+        classifier = _classifier(covers=False)
+        job["refresh"].return_value = classifier
+        await recategorize(_pool(FakeConn()))
+
+        classifier.predict.assert_not_called()
+        assert job["llm"].await_count == len(ITEMS)
+
+    async def test_resumes_after_the_last_chunk(self, job):
+        job["refresh"].return_value = _classifier(covers=True)
+        job["state"].return_value = {
+            "status": "running",
+            "after": "i3",
+            "processed": 4,
+            "categorized": 4,
+            "total": 5,
+            "started_at": "2026-01-01T00:00:00+00:00",
+            "finished_at": None,
+            "error": None,
+        }
+        conn = FakeConn()
+        state = await recategorize(_pool(conn), resume=True)
+
+        assert conn.chunks == ["i3", "i4"]
+        assert (state["status"], state["processed"]) == ("completed", 5)
+
+    async def test_fails_without_a_way_to_categorize(self, job):
+        job["settings"].return_value.openai_api_key = ""
+        job["refresh"].return_value = _classifier(covers=False)
+        conn = FakeConn()
+        state = await recategorize(_pool(conn))
+
+        assert state["status"] == "failed"
+        assert conn.chunks == []
+        job["reset"].assert_not_awaited()
@@ -0,0 +1,131 @@
+"""Tests for bounded, streaming feed downloads."""
+
+from unittest.mock import patch
+
+import feedparser
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from signal_app.fetchers.rss import RSSFetcher
+from signal_app.fetchers.streaming import download_feed
+
+URL = "https://example.com/feed.xml"
+
+
+def _rss_chunks(entries: int) -> list[bytes]:
+    """A feed split into one chunk per entry, plus header and footer."""
+    return [
+        b'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Big</title>',
+        *(
+            f"<item><title>Post {i} café</title><link>https://example.com/{i}</link></item>".encode()
+            for i in range(entries)
+        ),
+        b"</channel></rss>",
+    ]
+
+
+def _streamed(chunks: list[bytes], consumed: list[int]) -> Response:
+    async def body():
+        for chunk in chunks:
+            consumed.append(len(chunk))
+            yield chunk
+
+    return Response(200, content=body())
+
+
+@pytest.fixture(autouse=True)
+def default_cap():
+    with patch("signal_app.fetchers.streaming.get_settings") as mock_settings:
+        mock_settings.return_value.feed_max_bytes = 1_000_000
+        yield
+
+
+class TestDownloadFeed:
+    @respx.mock
+    async def test_stops_after_max_entries(self):
+        consumed: list[int] = []
+        respx.get(URL).mock(return_value=_streamed(_rss_chunks(100), consumed))
+
+        async with httpx.AsyncClient() as client:
+            body, _ = await download_feed(client, URL, max_entries=5)
+
+        # Header + five entries read; the remaining 95 never downloaded
+        assert len(consumed) == 6
+        titles = [e.title for e in feedparser.parse(body).entries]
+        assert titles == [f"Post {i} café" for i in range(5)]
+
+    @respx.mock
+    async def test_byte_cap_drops_partial_entry(self):
+        chunks = _rss_chunks(100)
+        cap = sum(len(c) for c in chunks[:4]) + 10  # three full entries and a bit of the fourth
+        consumed: list[int] = []
+        respx.get(URL).mock(return_value=_streamed(chunks, consumed))
+
+        async with httpx.AsyncClient() as client:
+            body, _ = await download_feed(client, URL, max_bytes=cap)
+
+        assert len(body) <= cap
+        assert body.endswith(b"</item>")
+        assert len(feedparser.parse(body).entries) == 3
+        assert len(consumed) == 5
+
+    @respx.mock
+    async def test_small_feed_is_returned_whole(self):
+        chunks = _rss_chunks(3)
+        respx.get(URL).mock(
+            return_value=Response(200, content=b"".join(chunks), headers={"Content-Type": "application/rss+xml"})
+        )
+
+        async with httpx.AsyncClient() as client:
+            body, headers = await download_feed(client, URL, max_entries=50)
+
+        assert body == b"".join(chunks)
+        assert headers == {"content-type": "application/rss+xml"}
+
+    @respx.mock
+    async def test_malformed_xml_falls_back_to_byte_cap(self):
+        chunks = [b"<rss><channel><item><title>&nbsp;A</title></item>", *_rss_chunks(20)[1:]]
+        consumed: list[int] = []
+        respx.get(URL).mock(return_value=_streamed(chunks, consumed))
+
+        async with httpx.AsyncClient() as client:
+            body, _ = await download_feed(client, URL, max_entries=2)
+
+        assert len(consumed) == len(chunks)
+        assert body == b"".join(chunks)
+
+    @respx.mock
+    async def test_raises_on_http_error(self):
+        respx.get(URL).mock(return_value=Response(404))
+
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_feed(client, URL)
+
+
+@respx.mock
+async def test_rss_fetcher_honours_source_limits():
+    consumed: list[int] = []
+    respx.get(URL).mock(return_value=_streamed(_rss_chunks(100), consumed))
+
+    fetcher = RSSFetcher("source-1", {"feed_url": URL, "max_entries": 10})
+    items = await fetcher.fetch()
+
+    assert len(items) == 10
+    assert len(consumed) == 11
+
+
+@respx.mock
+async def test_rss_fetcher_decodes_with_the_header_charset():
+    feed = '<?xml version="1.0"?><rss version="2.0"><channel><item><title>Привет</title></item></channel></rss>'
+    respx.get(URL).mock(
+        return_value=Response(
+            200, content=feed.encode("koi8-r"), headers={"Content-Type": "application/rss+xml; charset=koi8-r"}
+        )
+    )
+
+    items = await RSSFetcher("source-1", {"feed_url": URL}).fetch()
+
+    assert [item.title for item in items] == ["Привет"]
@@ -0,0 +1,189 @@
+"""Tests for the summary write path and the content-hash summary cache."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from signal_app.llm import Category
+from signal_app.pipeline.classifier import MIN_EXAMPLES, CentroidClassifier, sampled_for_llm
+from signal_app.pipeline.engines import ExtractiveEngine, LLMEngine
+from signal_app.pipeline.orchestrator import _preview, _summarize
+from signal_app.pipeline.summaries import SummaryResult, content_hash, parse_result, prompt_version
+from signal_app.pipeline.summarizer import build_system_prompt
+
+
+class FakeConn:
+    """Just enough of an asyncpg connection for the summary path."""
+
+    def __init__(self, cache: list[dict] | None = None) -> None:
+        self.cache = cache or []
+        self.executed: list[tuple] = []
+
+    async def fetch(self, query: str, *args):
+        if "FROM categories" in query:
+            return [{"id": "c-ai", "slug": "ai-ml"}, {"id": "c-web", "slug": "web"}]
+        if "FROM summary_cache" in query:
+            return [row for row in self.cache if row["content_hash"] in args[0]]
+        raise AssertionError(query)
+
+    async def execute(self, query: str, *args):
+        self.executed.append((" ".join(query.split()), args))
+
+    def statements(self, prefix: str) -> list[tuple]:
+        return [args for query, args in self.executed if query.startswith(prefix)]
+
+
+def _pool(conn: FakeConn) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+class TestParseResult:
+    def test_normalizes_confidence(self):
+        assert parse_result({"summary": "S", "categories": ["a", "b"], "confidence": 0.9}) == SummaryResult(
+            "S", ("a", "b"), (0.9, None)
+        )
+        assert parse_result({"summary": "S", "categories": ["a"], "confidence": "high"}).confidences == (None,)
+        assert parse_result({}) == SummaryResult("")
+
+
+class TestContentHash:
+    def test_ignores_markup_case_and_punctuation(self):
+        assert content_hash("OpenAI releases GPT-5!", "<p>The model is   out.</p>") == content_hash(
+            "openai releases gpt 5", "The model is out"
+        )
+        assert content_hash("A", "one") != content_hash("A", "two")
+
+    def test_prompt_version_tracks_model_and_prompt(self):
+        assert prompt_version("m", "p") == prompt_version("m", "p")
+        assert prompt_version("m", "p") != prompt_version("m2", "p")
+        assert prompt_version("m", "p") != prompt_version("m", "p2")
+
+
+class TestSummarize:
+    async def test_cache_hits_skip_the_llm_and_duplicates_are_sent_once(self):
+        categories = (Category("ai-ml", "AI"),)
+        version = prompt_version("gpt-test", build_system_prompt(categories))
+        rows = [
+            {"id": "i1", "title": "Cached story", "content_raw": "Seen before"},
+            {"id": "i2", "title": "New story", "content_raw": "Press release"},
+            {"id": "i3", "title": "New Story!", "content_raw": "<p>Press release</p>"},  # same content as i2
+            {"id": "i4", "title": "Other story", "content_raw": None},
+        ]
+        llm_results = [
+            {"index": 0, "summary": "New summary", "categories": ["ai-ml"], "confidence": [0.9]},
+            {"index": 1, "summary": "Other summary", "categories": ["gone"], "confidence": [0.5]},
+        ]
+
+        with (
+            patch("signal_app.pipeline.orchestrator.get_settings") as mock_settings,
+            patch("signal_app.pipeline.orchestrator.get_categories", AsyncMock(return_value=categories)),
+            patch("signal_app.pipeline.engines.summarize_items", AsyncMock(return_value=llm_results)) as llm,
+        ):
+            mock_settings.return_value.openai_model = "gpt-test"
+            mock_settings.return_value.summarize_item_tokens = 300
+            mock_settings.return_value.summarize_prompt_tokens = 12000
+            mock_settings.return_value.summarize_completion_tokens = 4000
+            mock_settings.return_value.summarize_target_latency = 30.0
+            conn = FakeConn(
+                cache=[
+                    {
+                        "content_hash": content_hash("Cached story", "Seen before"),
+                        "summary": "Cached summary",
+                        "categories": [["web", 0.8]],
+                    }
+                ]
+            )
+            summarized = await _summarize(_pool(conn), rows, {}, engine=LLMEngine("gpt-test"))
+
+        assert summarized == 4
+        # Only the two distinct uncached contents went to the LLM, in one batch
+        sent = llm.await_args.args[0]
+        assert [item["title"] for item in sent] == ["New story", "Other story"]
+
+        updates = {args[1]: args[0] for args in conn.statements("UPDATE items SET summary")}
+        assert updates == {
+            "i1": "Cached summary",
+            "i2": "New summary",
+            "i3": "New summary",
+            "i4": "Other summary",
+        }
+        assigned = {args[0]: args[1] for args in conn.statements("INSERT INTO item_categories")}
+        assert assigned == {"i1": ["c-web"], "i2": ["c-ai"], "i3": ["c-ai"]}  # unknown slug "gone" dropped
+
+        # Fresh results are cached under the current prompt version
+        (hashes, summaries, _categories, stored_version) = conn.statements("INSERT INTO summary_cache")[0]
+        assert stored_version == version
+        assert sorted(summaries) == ["New summary", "Other summary"]
+        assert content_hash("New story", "Press release") in hashes
+
+    async def test_locally_categorized_content_is_cached_with_its_categories(self):
+        classifier = CentroidClassifier()
+        for n in range(MIN_EXAMPLES):
+            classifier.learn(f"New language model tops the reasoning benchmark {n}", ["c-ai"])
+            classifier.learn(f"Browser release ships CSS nesting and faster rendering {n}", ["c-web"])
+        title = next(
+            f"Language model benchmark {n}"
+            for n in range(100)
+            if not sampled_for_llm(content_hash(f"Language model benchmark {n}", "Reasoning results"))
+        )
+        llm_results = [{"index": 0, "summary": "Model summary", "categories": []}]
+
+        async def run(conn: FakeConn, item_id: str, model: CentroidClassifier | None) -> None:
+            with (
+                patch("signal_app.pipeline.orchestrator.get_settings") as mock_settings,
+                patch("signal_app.pipeline.orchestrator.get_categories", AsyncMock(return_value=())),
+                patch("signal_app.pipeline.orchestrator.get_classifier", return_value=model),
+                patch("signal_app.pipeline.engines.summarize_items", AsyncMock(return_value=llm_results)),
+            ):
+                mock_settings.return_value.summarize_item_tokens = 300
+                mock_settings.return_value.summarize_prompt_tokens = 12000
+                mock_settings.return_value.summarize_completion_tokens = 4000
+                mock_settings.return_value.summarize_target_latency = 30.0
+                mock_settings.return_value.classifier = True
+                mock_settings.return_value.classifier_threshold = 0.7
+                rows = [{"id": item_id, "title": title, "content_raw": "Reasoning results"}]
+                await _summarize(_pool(conn), rows, {}, engine=LLMEngine("gpt-test"))
+
+        first = FakeConn()
+        await run(first, "i1", classifier)
+        (hashes, summaries, categories, _version) = first.statements("INSERT INTO summary_cache")[0]
+        cached = [{"content_hash": hashes[0], "summary": summaries[0], "categories": json.loads(categories[0])}]
+        assert [(slug, labeler) for slug, _, labeler in cached[0]["categories"]] == [("ai-ml", "classifier")]
+
+        # A duplicate in a later run is a cache hit, and gets the category from the cache alone,
+        # still labeled as the classifier's so it is never trained on
+        second = FakeConn(cache=cached)
+        await run(second, "i2", None)
+        (item_id, category_ids, _confidences, labeler) = second.statements("INSERT INTO item_categories")[0]
+        assert (item_id, category_ids, labeler) == ("i2", ["c-ai"], "classifier")
+
+    async def test_extractive_engine_needs_no_llm(self):
+        rows = [{"id": "i1", "title": "Story", "content_raw": "Short teaser about the new model release"}]
+        with (
+            patch("signal_app.pipeline.orchestrator.get_settings") as mock_settings,
+            patch("signal_app.pipeline.orchestrator.get_categories", AsyncMock(return_value=())),
+            patch("signal_app.pipeline.engines.summarize_items", AsyncMock()) as llm,
+        ):
+            mock_settings.return_value.summarize_item_tokens = 300
+            mock_settings.return_value.summarize_prompt_tokens = 12000
+            mock_settings.return_value.summarize_completion_tokens = 4000
+            mock_settings.return_value.summarize_target_latency = 30.0
+            conn = FakeConn()
+            summarized = await _summarize(_pool(conn), rows, {}, engine=ExtractiveEngine())
+
+        assert summarized == 1
+        llm.assert_not_awaited()
+        (summary, item_id, engine) = conn.statements("UPDATE items SET summary")[0]
+        assert (summary, item_id, engine) == ("Short teaser about the new model release", "i1", "extractive")
+        assert conn.statements("INSERT INTO summary_cache")[0][3] == ExtractiveEngine().version("")
+
+    async def test_previews_fill_only_empty_summaries(self):
+        rows = [{"id": "i1", "content_raw": "<p>Feed teaser for the item</p>"}, {"id": "i2", "content_raw": None}]
+        conn = FakeConn()
+        await _preview(_pool(conn), rows, {"i2": "Extracted article text of the second item"})
+
+        (ids, summaries) = conn.statements("UPDATE items AS i SET summary")[0]
+        assert ids == ["i1", "i2"]
+        assert summaries == ["Feed teaser for the item", "Extracted article text of the second item"]
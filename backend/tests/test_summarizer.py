@@ -0,0 +1,139 @@
+"""Tests for result validation and targeted retries in the summarizer."""
+
+import json
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import openai
+
+from signal_app.pipeline.summarizer import categorize_titles, summarize_items, valid_results
+
+
+def _items(n: int) -> list[dict[str, str | int]]:
+    return [{"index": i, "title": f"Story {i}", "content": f"Body {i}"} for i in range(n)]
+
+
+def _indices(kwargs: dict) -> list[int]:
+    """The item indices a chat completion request asked for."""
+    return [int(i) for i in re.findall(r"\[Item (\d+)\]", kwargs["messages"][1]["content"])]
+
+
+def _response(results: list[dict] | str) -> MagicMock:
+    choice = MagicMock()
+    choice.message.content = results if isinstance(results, str) else json.dumps({"results": results})
+    choice.finish_reason = "stop"
+    response = MagicMock()
+    response.choices = [choice]
+    return response
+
+
+def _summary(idx: int) -> dict:
+    return {"index": idx, "summary": f"Summary {idx}", "categories": [], "confidence": []}
+
+
+async def _summarize(items: list, create: AsyncMock) -> list:
+    client = MagicMock()
+    client.chat.completions.create = create
+    with (
+        patch("signal_app.pipeline.summarizer.get_settings") as mock_settings,
+        patch("signal_app.pipeline.summarizer.get_categories", AsyncMock(return_value=())),
+        patch("signal_app.pipeline.summarizer.get_llm_client", return_value=client),
+        patch("signal_app.pipeline.summarizer._retry_delay", return_value=0),
+    ):
+        mock_settings.return_value.openai_api_key = "test-key"
+        return await summarize_items(items)
+
+
+class TestValidResults:
+    def test_keeps_first_usable_result_per_expected_index(self):
+        results = [
+            {"index": 0, "summary": ""},  # empty
+            {"index": 0, "summary": "A", "categories": ["x"]},
+            {"index": 0, "summary": "dup"},
+            {"index": 1, "summary": "B", "categories": "x"},  # categories not a list
+            {"index": 2, "summary": "C"},
+            {"index": 7, "summary": "not asked for"},
+            "junk",
+        ]
+        valid = valid_results(results, {0, 1, 2})
+        assert valid == {0: {"index": 0, "summary": "A", "categories": ["x"]}, 2: {"index": 2, "summary": "C"}}
+
+
+class TestRetries:
+    async def test_only_skipped_items_are_sent_again(self):
+        async def create(**kwargs):
+            indices = _indices(kwargs)
+            # The model skips item 3 the first time round
+            return _response([_summary(i) for i in indices if len(indices) == 1 or i != 3])
+
+        create_mock = AsyncMock(side_effect=create)
+        results = await _summarize(_items(5), create_mock)
+
+        assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+        assert [_indices(call.kwargs) for call in create_mock.await_args_list] == [[0, 1, 2, 3, 4], [3]]
+
+    async def test_invalid_json_splits_until_the_bad_item_is_isolated(self):
+        async def create(**kwargs):
+            indices = _indices(kwargs)
+            # Item 2 makes the model produce broken JSON whenever it is in the request
+            return _response('{"results": [') if 2 in indices else _response([_summary(i) for i in indices])
+
+        create_mock = AsyncMock(side_effect=create)
+        results = await _summarize(_items(4), create_mock)
+
+        assert [r["index"] for r in results] == [0, 1, 3]
+        assert [_indices(call.kwargs) for call in create_mock.await_args_list] == [
+            [0, 1, 2, 3],
+            [0, 1],
+            [2, 3],
+            [2],
+            [3],
+        ]
+
+    async def test_transient_errors_are_retried_with_backoff(self):
+        error = openai.APIConnectionError(request=MagicMock())
+        create_mock = AsyncMock(side_effect=[error, error, _response([_summary(0), _summary(1)])])
+        results = await _summarize(_items(2), create_mock)
+
+        assert [r["index"] for r in results] == [0, 1]
+        assert create_mock.await_count == 3
+
+    async def test_transient_retries_are_bounded(self):
+        create_mock = AsyncMock(side_effect=openai.APIConnectionError(request=MagicMock()))
+        assert await _summarize(_items(2), create_mock) == []
+        assert create_mock.await_count == 4  # first attempt + MAX_TRANSIENT_RETRIES
+
+    async def test_auth_errors_are_not_retried(self):
+        error = openai.AuthenticationError("bad key", response=MagicMock(status_code=401), body=None)
+        create_mock = AsyncMock(side_effect=error)
+        assert await _summarize(_items(3), create_mock) == []
+        assert create_mock.await_count == 1
+
+
+class TestCategorizeTitles:
+    async def test_title_only_request_and_retry(self):
+        create = AsyncMock(
+            side_effect=[
+                openai.APIConnectionError(request=MagicMock()),
+                _response(
+                    [
+                        {"index": 0, "categories": ["ai-ml"], "confidence": [0.9]},
+                        {"index": 1, "categories": "ai-ml"},  # not a list
+                        {"index": 9, "categories": []},  # not asked for
+                    ]
+                ),
+            ]
+        )
+        client = MagicMock()
+        client.chat.completions.create = create
+        with (
+            patch("signal_app.pipeline.summarizer.get_settings") as mock_settings,
+            patch("signal_app.pipeline.summarizer.get_categories", AsyncMock(return_value=())),
+            patch("signal_app.pipeline.summarizer.get_llm_client", return_value=client),
+            patch("signal_app.pipeline.summarizer._retry_delay", return_value=0),
+        ):
+            mock_settings.return_value.openai_api_key = "test-key"
+            results = await categorize_titles([{"index": 0, "title": "Story 0"}, {"index": 1, "title": "Story 1"}])
+
+        assert results == [{"index": 0, "categories": ["ai-ml"], "confidence": [0.9]}]
+        assert create.await_args.kwargs["messages"][1]["content"] == "[0] Story 0\n[1] Story 1"
@@ -0,0 +1,93 @@
+"""Tests for the shared YouTube Data API quota ledger."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+import respx
+from httpx import Response
+
+from signal_app.fetchers.youtube import YouTubeChannelFetcher, YouTubeSearchFetcher, reserve_channel_quota
+from signal_app.fetchers.youtube_quota import QuotaExceededError, QuotaLedger
+
+
+@pytest.fixture
+def ledger():
+    ledger = QuotaLedger(daily_budget=250)
+    with (
+        patch("signal_app.fetchers.youtube.get_ledger", return_value=ledger),
+        patch("signal_app.fetchers.youtube.get_settings") as mock_settings,
+    ):
+        mock_settings.return_value.google_api_key = "test-key"
+        yield ledger
+
+
+class TestQuotaLedger:
+    def test_charge_tracks_units_and_calls(self):
+        ledger = QuotaLedger(daily_budget=1000)
+        ledger.charge("search.list")
+        ledger.charge("videos.list", 3)
+        assert ledger.used == 103
+        assert ledger.remaining == 897
+        assert ledger.calls == {"search.list": 1, "videos.list": 3}
+
+    def test_charge_over_budget_raises(self):
+        ledger = QuotaLedger(daily_budget=150)
+        ledger.charge("search.list")
+        with pytest.raises(QuotaExceededError):
+            ledger.charge("search.list")
+        assert ledger.used == 100
+
+    def test_reservation_only_available_to_priority(self):
+        ledger = QuotaLedger(daily_budget=105)
+        ledger.reserve(10)
+        assert not ledger.can_afford("search.list")
+        assert ledger.can_afford("channels.list", 10, priority=True)
+        ledger.charge("channels.list", 4, priority=True)
+        assert ledger.reserved == 6
+
+    def test_round_robin_keywords(self):
+        ledger = QuotaLedger(daily_budget=10000)
+        keywords = ["a", "b", "c"]
+        assert ledger.next_keywords("s1", keywords, 2) == ["a", "b"]
+        ledger.advance_keywords("s1", keywords, 2)
+        assert ledger.next_keywords("s1", keywords, 2) == ["c", "a"]
+        assert ledger.next_keywords("s2", keywords, 5) == ["a", "b", "c"]
+
+    def test_rolls_over_at_new_quota_day(self):
+        ledger = QuotaLedger(daily_budget=1000)
+        ledger.charge("search.list")
+        with patch("signal_app.fetchers.youtube_quota._quota_day", return_value=date(2099, 1, 1)):
+            assert ledger.remaining == 1000
+            assert ledger.calls == {}
+
+    def test_load_ignores_previous_day_spend(self):
+        ledger = QuotaLedger(daily_budget=1000)
+        ledger.load({"day": "2000-01-01", "used": 900, "keyword_cursors": {"s1": 2}})
+        assert ledger.used == 0
+        assert ledger.keyword_cursors == {"s1": 2}
+
+
+class TestYouTubeQuotaScheduling:
+    def test_reserve_channel_quota(self, ledger: QuotaLedger):
+        fetchers = [
+            YouTubeChannelFetcher("c1", {"channel_id": "UC1"}),
+            YouTubeChannelFetcher("c2", {"channel_id": "UC2", "method": "api"}),
+            YouTubeChannelFetcher("c3", {"channel_handle": "@c3", "method": "api"}),
+            YouTubeSearchFetcher("s1", {"keywords": ["x"]}),
+        ]
+        reserve_channel_quota(fetchers)
+        assert ledger.reserved == 0 + 2 + 3
+
+    @respx.mock
+    async def test_search_stops_at_budget(self, ledger: QuotaLedger):
+        search = respx.get("https://www.googleapis.com/youtube/v3/search").mock(
+            return_value=Response(200, json={"items": []})
+        )
+        fetcher = YouTubeSearchFetcher("s1", {"keywords": ["a", "b", "c"], "min_views": 0})
+        await fetcher.fetch()
+
+        assert search.call_count == 2
+        assert ledger.used == 200
+        # Next run picks up with the keyword that was skipped
+        assert ledger.next_keywords("s1", ["a", "b", "c"], 1) == ["c"]
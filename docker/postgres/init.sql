@@ -11,10 +11,16 @@ CREATE TABLE IF NOT EXISTS sources (
     last_fetched_at TIMESTAMPTZ,
     last_error      TEXT,
     error_count     INTEGER NOT NULL DEFAULT 0,
+    fetch_state     JSONB NOT NULL DEFAULT '{}'::jsonb,
+    next_retry_at   TIMESTAMPTZ,
     created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- Columns added after the initial schema (no-ops on a fresh database)
+ALTER TABLE sources ADD COLUMN IF NOT EXISTS fetch_state JSONB NOT NULL DEFAULT '{}'::jsonb;
+ALTER TABLE sources ADD COLUMN IF NOT EXISTS next_retry_at TIMESTAMPTZ;
+
 CREATE INDEX IF NOT EXISTS idx_sources_type ON sources (source_type);
 CREATE INDEX IF NOT EXISTS idx_sources_enabled ON sources (enabled) WHERE enabled = true;
 
@@ -55,6 +61,9 @@ CREATE TABLE IF NOT EXISTS items (
     updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- Engine that wrote the summary: 'llm' or 'extractive' (a preview while summarized_at is NULL)
+ALTER TABLE items ADD COLUMN IF NOT EXISTS summary_engine TEXT;
+
 CREATE UNIQUE INDEX IF NOT EXISTS idx_items_url ON items (url);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_items_source_external ON items (source_id, external_id) WHERE external_id IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_items_published ON items (published_at DESC);
@@ -72,7 +81,57 @@ CREATE TABLE IF NOT EXISTS item_categories (
     PRIMARY KEY (item_id, category_id)
 );
 
+-- Who assigned the category ('llm', 'classifier' or 'manual'), and when
+ALTER TABLE item_categories ADD COLUMN IF NOT EXISTS labeler TEXT NOT NULL DEFAULT 'llm';
+ALTER TABLE item_categories ADD COLUMN IF NOT EXISTS labeled_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
 CREATE INDEX IF NOT EXISTS idx_item_categories_category ON item_categories (category_id);
+CREATE INDEX IF NOT EXISTS idx_item_categories_labeled ON item_categories (labeled_at, item_id, category_id);
+
+-- ARTICLE CACHE (extracted article text by canonical URL; content is NULL when extraction failed)
+CREATE TABLE IF NOT EXISTS article_cache (
+    canonical_url   TEXT PRIMARY KEY,
+    content         TEXT,
+    error           TEXT,
+    extracted_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- SUMMARY CACHE (LLM results by normalized title+content hash and model/prompt version)
+CREATE TABLE IF NOT EXISTS summary_cache (
+    content_hash    TEXT NOT NULL,
+    prompt_version  TEXT NOT NULL,
+    summary         TEXT NOT NULL,
+    categories      JSONB NOT NULL DEFAULT '[]'::jsonb,  -- [[slug, confidence, labeler], ...]
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (content_hash, prompt_version)
+);
+
+-- SUMMARY BATCHES (Batch API jobs for large backlogs)
+CREATE TABLE IF NOT EXISTS summary_batches (
+    id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    batch_id        TEXT NOT NULL UNIQUE,
+    input_file_id   TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'validating',
+    prompt_version  TEXT NOT NULL,
+    requests        JSONB NOT NULL,  -- {custom_id: [[content_hash, [item_id, ...], [[slug, confidence], ...]], ...]}
+    item_ids        UUID[] NOT NULL,
+    item_count      INTEGER NOT NULL,
+    items_summarized INTEGER NOT NULL DEFAULT 0,
+    error           TEXT,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    applied_at      TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_batches_pending ON summary_batches (created_at) WHERE applied_at IS NULL;
+
+-- CLASSIFIER STATE (the local category classifier, and the last label it learned from)
+CREATE TABLE IF NOT EXISTS classifier_state (
+    id              BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    model           BYTEA NOT NULL,
+    watermark       JSONB NOT NULL,
+    trained_at      TIMESTAMPTZ NOT NULL,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
 
 -- PIPELINE RUNS
 CREATE TABLE IF NOT EXISTS pipeline_runs (
@@ -119,7 +119,10 @@ export default function ItemCard({ item, onUpdate }: ItemCardProps) {
 				</a>
 
 				{item.summary && (
-					<p className="text-[13px] leading-relaxed text-[#888888] line-clamp-2">
+					<p
+						className="text-[13px] leading-relaxed text-[#888888] line-clamp-2"
+						title={item.summary_engine === "extractive" ? "Extracted from the article" : undefined}
+					>
 						{item.summary}
 					</p>
 				)}
@@ -263,6 +263,9 @@ export async function updateSettings(
 // --- Utilities ---
 
 export function getSourceHealth(source: Source): HealthStatus {
+	if (source.error_count >= 3 && source.next_retry_at) {
+		return new Date(source.next_retry_at).getTime() > Date.now() ? "paused" : "probing";
+	}
 	if (source.error_count >= 3) return "error";
 	if (source.error_count > 0) return "warning";
 	if (!source.last_fetched_at) return "stale";
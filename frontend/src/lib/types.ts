@@ -16,6 +16,7 @@ export interface Source {
   last_fetched_at: string | null
   last_error: string | null
   error_count: number
+  next_retry_at?: string | null
   items_today: number
   total_items: number
 }
@@ -32,7 +33,7 @@ export type SourceType =
   | 'twitter'
   | 'manual'
 
-export type HealthStatus = 'healthy' | 'warning' | 'error' | 'stale'
+export type HealthStatus = 'healthy' | 'warning' | 'error' | 'stale' | 'paused' | 'probing'
 
 export interface DigestItem {
   id: string
@@ -43,6 +44,8 @@ export interface DigestItem {
   url: string
   author: string | null
   summary: string | null
+  // 'extractive': a quick local extract, shown until the AI summary arrives (or with no API key)
+  summary_engine?: 'llm' | 'extractive' | null
   thumbnail_url: string | null
   published_at: string
   fetched_at: string
@@ -61,6 +61,8 @@ function SourceDetailPage() {
     warning: { bg: '#D4A017', text: 'Warning' },
     error: { bg: '#B54A4A', text: 'Error' },
     stale: { bg: '#888888', text: 'Stale' },
+    paused: { bg: '#7A4A8C', text: 'Paused' },
+    probing: { bg: '#4A6A8C', text: 'Probing' },
   }
 
   return (
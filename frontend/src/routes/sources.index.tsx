@@ -55,6 +55,8 @@ const healthDotColors = {
 	warning: "#D4A017",
 	error: "#B54A4A",
 	stale: "#888888",
+	paused: "#7A4A8C",
+	probing: "#4A6A8C",
 };
 
 function getSourceValue(source: Source): string {
@@ -323,7 +325,7 @@ function SourcesPage() {
 							</button>
 							{healthDropdownOpen && (
 								<div className="absolute top-full left-0 mt-1 bg-[#F5F3EF] border border-[#D1CCC4] rounded-sm shadow-md z-10 min-w-[120px]">
-									{["all", "healthy", "warning", "error", "stale"].map(
+									{["all", "healthy", "warning", "error", "paused", "probing", "stale"].map(
 										(status) => (
 											<button
 												type="button"